@@ -1,126 +1,99 @@
+import argparse
 import os
 from dotenv import load_dotenv
-import requests
 import json
 import pandas as pd
 import numpy as np
 import sys
 
-# .env 파일에서 환경변수 불러오기
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# 5개 지표 통합 평가 엔진 (feature를 한 번만 읽어 5개 지표를 함께 산출)
+from absolute_grading.engine import evaluate_all, FEATURE_COLS, RAW_COLS
+from absolute_grading.session_io import read_sessions
+from absolute_grading.instrumentation import setup_trace, stage, count
+from llm.prompt import make_gemini_prompt, evaluation_result_of
+from llm.client import GeminiClient, DEFAULT_BASE_URL
+from llm.feedback import generate_feedback_batch, DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_MAX_RETRIES
+from llm.cache import FeedbackCache, generate_feedback_cached, DEFAULT_TTL
+from llm.packing import generate_feedback_packed
 
-# 1. new_data.csv 로드
 DATA_PATH = os.path.join('data', 'new_data.csv')
-df = pd.read_csv(DATA_PATH)
+# 평가/프롬프트에 필요한 컬럼만 읽음
+INPUT_COLS = ['session_id'] + FEATURE_COLS + RAW_COLS
 
-# 2. 각 지표별 평가 함수 import (외부 호출 evaluate_XXX 함수 사용)
-from absolute_grading.grade_politeness_auto import evaluate_politeness
-from absolute_grading.grade_empathy_auto import evaluate_empathy
-from absolute_grading.grade_problem_solving import evaluate_problem_solving
-from absolute_grading.grade_emotional_stability_auto import evaluate_emotional_stability
-from absolute_grading.grade_stability_auto import evaluate_stability
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='5개 지표 평가 + Gemini 코칭 피드백 생성')
+    parser.add_argument('--data', default=DATA_PATH, help='평가할 세션 파일 경로 (csv/parquet/arrow)')
+    parser.add_argument('--all', action='store_true', help='첫 번째 세션만이 아니라 모든 세션의 피드백 생성')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='동시 요청 수')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='초당 최대 요청 수 (0이면 제한 없음)')
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES, help='429/5xx 재시도 횟수')
+    parser.add_argument('--base-url', default=os.getenv('GEMINI_BASE_URL', DEFAULT_BASE_URL),
+                        help='Gemini API 주소 (로컬 stub: http://127.0.0.1:8765)')
+    parser.add_argument('--output', help='피드백 결과 JSONL 저장 경로')
+    parser.add_argument('--metrics', action='store_true', help='요청 지연 시간 통계 출력')
+    parser.add_argument('--no-cache', action='store_true', help='피드백 캐시(.cache/feedback.sqlite) 사용 안 함')
+    parser.add_argument('--pack', type=int, default=1,
+                        help='한 요청에 묶을 세션 수 (1이면 세션마다 요청, 응답을 나누지 못한 세션은 단일 요청으로 재시도)')
+    parser.add_argument('--cache-ttl-days', type=float, default=DEFAULT_TTL / 86400, help='캐시된 피드백 유효 기간(일)')
+    parser.add_argument('--trace', help='단계별 시간/LLM 토큰·지연 JSON-lines 기록 경로 (환경변수 EVAL_TRACE와 같음)')
+    args = parser.parse_args(argv)
+    setup_trace(args.trace)
 
-# 3. 점수/등급 산출 (여기서는 첫 번째 row만 예시)
-session_id = df['session_id'].iloc[0] if 'session_id' in df.columns else 'unknown_session'
-politeness_result = evaluate_politeness(df)
-empathy_result = evaluate_empathy(df)
-problem_solving_result = evaluate_problem_solving(df)
-emotional_stability_result = evaluate_emotional_stability(df)
-stability_result = evaluate_stability(df)
+    # .env 파일에서 환경변수 불러오기
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
 
-evaluation_result = {
-    "Politeness": {
-        "score": politeness_result['Politeness_score'].iloc[0],
-        "grade": politeness_result['Politeness_Grade'].iloc[0]
-    },
-    "Empathy": {
-        "score": empathy_result['Empathy_score'].iloc[0],
-        "grade": empathy_result['Empathy_Grade'].iloc[0]
-    },
-    "ProblemSolving": {
-        "score": problem_solving_result['ProblemSolving_score'].iloc[0],
-        "grade": problem_solving_result['ProblemSolving_Grade'].iloc[0]
-    },
-    "EmotionalStability": {
-        "score": emotional_stability_result['EmotionalStability_score'].iloc[0],
-        "grade": emotional_stability_result['EmotionalStability_Grade'].iloc[0]
-    },
-    "Stability": {
-        "score": stability_result['Stability_score'].iloc[0],
-        "grade": stability_result['Stability_Grade'].iloc[0]
-    }
-}
+    # 1. 세션 데이터 로드 및 점수/등급 산출
+    df = read_sessions(args.data, INPUT_COLS)
+    result_df = evaluate_all(df)
+    n = len(df) if args.all else 1
+    session_ids = df['session_id'].tolist() if 'session_id' in df.columns else ['unknown_session'] * len(df)
 
-# Gemini 지원 모델 자동 선택 함수
-def get_gemini_model():
-    model_list_url = f"https://generativelanguage.googleapis.com/v1/models?key={GEMINI_API_KEY}"
-    model_list_resp = requests.get(model_list_url)
-    model_name = None
-    if model_list_resp.status_code == 200:
-        models = model_list_resp.json().get('models', [])
-        preferred = ['gemini-1.5-pro', 'gemini-1.0-pro', 'gemini-pro', 'gemini-1.5-flash']
-        for p in preferred:
-            for m in models:
-                if m['name'].endswith(p):
-                    model_name = m['name'].split('/')[-1]
-                    break
-            if model_name:
-                break
-        if not model_name and models:
-            model_name = models[0]['name'].split('/')[-1]
-    else:
-        raise Exception('모델 리스트 조회 실패')
-    return model_name
+    # 2. 세션별 Gemini 프롬프트 생성
+    with stage('llm_batch.prompts', rows=n):
+        prompts = [(session_ids[i], make_gemini_prompt(evaluation_result_of(result_df, i), session_ids[i])) for i in range(n)]
 
-model_name = get_gemini_model()
-GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1/models/{model_name}:generateContent"
+    # 3. Gemini API 호출 (keep-alive 연결 풀 재사용, 동시 요청 수 / 초당 요청 수 제한, 429/5xx 재시도)
+    with GeminiClient(api_key, args.base_url, pool_size=args.concurrency) as client:
+        print(f"[INFO] Gemini 모델: {client.model_name}")
+        batch_kwargs = dict(concurrency=args.concurrency, rate=args.rate, max_retries=args.max_retries)
+        pack_stats = {}
+        if args.pack > 1:
+            generate = lambda prompts, send, **kw: generate_feedback_packed(prompts, send, args.pack, pack_stats, **kw)
+        else:
+            generate = generate_feedback_batch
+        with stage('llm_batch.feedback', rows=n):
+            if args.no_cache:
+                results = generate(prompts, client.generate, **batch_kwargs)
+            else:
+                # 점수(소수 2자리)/등급 구성이 같은 세션은 캐시된 피드백을 재사용 (세션 헤더만 교체)
+                with FeedbackCache(ttl=args.cache_ttl_days * 86400) as cache:
+                    results, stats = generate_feedback_cached(prompts, client.generate, cache, client.model_name,
+                                                              generate=generate, **batch_kwargs)
+        if not args.no_cache:
+            print(f"[INFO] 피드백 캐시: 적중 {stats['cache_hits']} / 미적중 {stats['cache_misses']}, "
+                  f"생성 요청 {stats['generated']}개 세션 (API 호출 절약 {stats['api_calls_saved']}회 / {stats['sessions']}개 세션)")
+            count('feedback_cache.hit', stats['cache_hits'])
+            count('feedback_cache.miss', stats['cache_misses'])
 
-# 4. Gemini 프롬프트 생성
-def make_gemini_prompt(evaluation_result, session_id):
-    prompt = (
-        f"아래는 상담사의 5가지 평가 지표별 점수와 등급입니다. "
-        "각 항목을 참고하여 상담사의 강점, 약점, 그리고 구체적인 개선점 및 코칭 멘트를 작성해 주세요.\n\n"
-        f"- 정중함 및 언어 품질 (Politeness): 점수 {evaluation_result['Politeness']['score']:.2f}, 등급 {evaluation_result['Politeness']['grade']}\n"
-        f"- 공감적 소통 (Empathy): 점수 {evaluation_result['Empathy']['score']:.2f}, 등급 {evaluation_result['Empathy']['grade']}\n"
-        f"- 문제 해결 역량 (Problem Solving): 점수 {evaluation_result['ProblemSolving']['score']:.2f}, 등급 {evaluation_result['ProblemSolving']['grade']}\n"
-        f"- 감정 안정성 (Emotional Stability): 점수 {evaluation_result['EmotionalStability']['score']:.2f}, 등급 {evaluation_result['EmotionalStability']['grade']}\n"
-        f"- 대화 흐름 및 응대 태도 (Stability): 점수 {evaluation_result['Stability']['score']:.2f}, 등급 {evaluation_result['Stability']['grade']}\n\n"
-        "[요청]\n"
-        "1. 상담사의 강점 2가지 이상\n"
-        "2. 상담사의 약점 2가지 이상\n"
-        "3. 상담사가 실제로 참고할 수 있는 구체적 개선점/코칭 멘트 2가지 이상\n\n"
-        "[출력 형식]\n"
-        f"## 상담사 평가 분석 (세션 ID: {session_id})\n"
-        "- 강점:\n"
-        "  - 예시1\n"
-        "  - 예시2\n"
-        "- 약점:\n"
-        "  - 예시1\n"
-        "  - 예시2\n"
-        "- 개선점/코칭 멘트:\n"
-        "  - 예시1\n"
-        "  - 예시2\n"
-    )
-    return prompt
+    for result in results:
+        if result['error'] is None:
+            print(result['feedback'])
+        else:
+            print(f"Gemini API 호출 실패 (세션 ID: {result['session_id']}):", result['error'])
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            for result in results:
+                f.write(json.dumps(result, ensure_ascii=False) + '\n')
+    if pack_stats.get('sessions'):
+        print(f"[INFO] 세션 묶음 요청: {pack_stats['sessions']}개 세션 → 묶음 요청 {pack_stats['packed_requests']}회 "
+              f"+ 단일 재요청 {pack_stats['fallback_sessions']}회, "
+              f"프롬프트 {pack_stats['prompt_chars']:,}자 (세션별 요청 시 {pack_stats['single_prompt_chars']:,}자)")
+    if args.metrics:
+        print(f"[INFO] generateContent 지연: {client.metrics.summary()}")
+    failed = sum(result['error'] is not None for result in results)
+    print(f"[INFO] {len(results)}개 세션 중 {len(results) - failed}개 피드백 생성 완료 (실패 {failed}개)")
+    return 0 if failed == 0 else 1
 
-# 5. Gemini API 호출
-headers = {"Content-Type": "application/json"}
-data = {
-    "contents": [
-        {"parts": [{"text": make_gemini_prompt(evaluation_result, session_id)}]}
-    ]
-}
-
-response = requests.post(
-    f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-    headers=headers,
-    json=data
-)
-
-if response.status_code == 200:
-    result = response.json()
-    print(result['candidates'][0]['content']['parts'][0]['text'])
-else:
-    print("Gemini API 호출 실패:", response.status_code)
-    print(response.text) 
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,5 @@
 import os
 from dotenv import load_dotenv
-import requests
 import json
 import pandas as pd
 import numpy as np
@@ -14,6 +13,9 @@ from problem_solving import evaluate_problem_solving
 from emotional_stability import evaluate_emotional_stability
 from stability import evaluate_stability
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from llm.client import GeminiClient, GeminiError
+
 # .env 파일에서 환경변수 불러오기
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -131,62 +133,31 @@ def run_integrated_evaluation():
     # 5. Gemini API 호출
     print("\n[5단계] Gemini API 호출...")
     
-    # 지원 모델 리스트 조회 및 자동 선택
-    model_list_url = f"https://generativelanguage.googleapis.com/v1/models?key={GEMINI_API_KEY}"
-    model_list_resp = requests.get(model_list_url)
-    model_name = None
-    
-    if model_list_resp.status_code == 200:
-        models = model_list_resp.json().get('models', [])
-        preferred = ['gemini-1.5-pro', 'gemini-1.0-pro', 'gemini-pro', 'gemini-1.5-flash']
-        for p in preferred:
-            for m in models:
-                if m['name'].endswith(p):
-                    model_name = m['name'].split('/')[-1]
-                    break
-            if model_name:
-                break
-        if not model_name and models:
-            model_name = models[0]['name'].split('/')[-1]
-    else:
-        print("모델 리스트 조회 실패")
-        return
-    
-    GEMINI_API_URL = f"https://generativelanguage.googleapis.com/v1/models/{model_name}:generateContent"
-    
-    headers = {"Content-Type": "application/json"}
-    data = {"contents": [{"parts": [{"text": prompt}]}]}
-    
-    response = requests.post(
-        f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
-        headers=headers,
-        data=json.dumps(data)
-    )
+    # 모델 자동 선택(디스크 캐시, TTL 내에는 목록 조회 생략) + keep-alive 연결 재사용 클라이언트
+    client = GeminiClient(GEMINI_API_KEY)
+    try:
+        feedback = client.generate(prompt)
+    except GeminiError as e:
+        feedback = None
+        error = e
+    finally:
+        client.close()
     
     # 6. 결과 출력
     print("\n[6단계] 최종 결과 출력...")
     print("=" * 60)
     
-    if response.status_code == 200:
-        result = response.json()
-        try:
-            feedback = result['candidates'][0]['content']['parts'][0]['text']
-            
-            print("[실제 산출된 평가 지표별 점수 및 등급]")
-            print("-" * 50)
-            for key, value in evaluation_result.items():
-                print(f"{key}: 점수 {value['score']:.3f}, 등급 {value['grade']}")
-            print("-" * 50)
-            
-            print("[Gemini AI 상담사 피드백 결과]")
-            print(feedback)
-            
-        except Exception as e:
-            print("Gemini 응답 파싱 오류:", e)
-            print(result)
+    if feedback is not None:
+        print("[실제 산출된 평가 지표별 점수 및 등급]")
+        print("-" * 50)
+        for key, value in evaluation_result.items():
+            print(f"{key}: 점수 {value['score']:.3f}, 등급 {value['grade']}")
+        print("-" * 50)
+        
+        print("[Gemini AI 상담사 피드백 결과]")
+        print(feedback)
     else:
-        print("Gemini API 호출 실패:", response.status_code)
-        print(response.text)
+        print(error)
     
     print("=" * 60)
     print("통합 평가 완료!")
@@ -0,0 +1,240 @@
+"""
+기간/상담 유형별 cut-off 기준선 병렬 산출.
+
+전체 기준선(calculate_cutoff.py가 레지스트리에 게시하는 cut-off/minmax/iqr)과 함께
+월별(date 컬럼이 있을 때)·mid_category별 기준선을 같은 방식으로 산출한다.
+- 파티션: 전체 1개 + 월(YYYY-MM)별 + mid_category별. 행 수가 min_rows 미만인 파티션은 건너뛴다 (전체 기준선 사용).
+- 파티션 × 5개 지표 계산을 프로세스 풀(ProcessPoolExecutor)에 나눠 맡긴다.
+  feature 배열(float64, (컬럼 수, 행 수))과 차원별 정렬 인덱스는 shared memory에 한 번만 올리고,
+  작업에는 (차원, 값, 정렬 인덱스 구간)만 넘기므로 행 데이터를 pickle 하지 않는다.
+- 지표별 계산은 calculate_cutoff.py와 같은 recalibration.exact_cutoffs + df_iqr_bounds (전체 파티션 결과 = 기존 전체 기준선).
+- publish_calibration: 전체 기준선을 레지스트리에 지표별 새 버전으로 게시한 뒤, 파티션 표를 게시한 버전 번호와 함께
+  cutoff/partition_cutoffs.json 한 파일에 임시 파일 → fsync → os.replace로 교체한다 (읽는 쪽은 이전 전체 또는 새 전체 표만 본다).
+  게시와 파일 교체 사이에 중단되었거나 이후 재산출로 전체 기준선이 바뀌면 버전이 맞지 않으므로,
+  load_partition_tables(snapshot=...)는 그 파티션 표를 쓰지 않는다 (None).
+
+사용법 (루트에서 실행):
+    python -m absolute_grading.calibration [데이터 경로] [--workers N] [--min-rows N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading import grade_politeness_auto as politeness
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import grade_emotional_stability_auto as emotional_stability
+from absolute_grading import grade_stability_auto as stability
+from absolute_grading.engine import INDICATORS, FEATURE_COLS
+from absolute_grading.recalibration import exact_cutoffs
+from absolute_grading.sketch import df_iqr_bounds
+from absolute_grading.rollup import DAY_COL
+from absolute_grading.cutoff_registry import CUTOFF_DIR, atomic_write, publish_cutoff
+from absolute_grading.session_io import read_sessions
+from absolute_grading.schema import with_float64
+from absolute_grading.instrumentation import laps
+
+def partition_path(cutoff_dir=CUTOFF_DIR):
+    return os.path.join(cutoff_dir, 'partition_cutoffs.json')
+
+PARTITION_PATH = partition_path()
+MIN_PARTITION_ROWS = 30
+# problem_solving은 이산형 점수에 대한 절대 등급 매핑 (데이터와 무관)
+PROBLEM_SOLVING_CUTOFF = {
+    "A": 1.0,
+    "B": 0.6,
+    "C": 0.2,
+    "D": 0.0
+}
+# cut-off json의 minmax/iqr 키 순서 (각 *_auto.py의 cols)
+CUTOFF_COLS = {
+    'politeness': politeness.cols,
+    'empathy': empathy.cols,
+    'emotional_stability': emotional_stability.cols,
+    'stability': stability.cols,
+}
+
+def baseline_tables(df):
+    """
+    DataFrame 전체를 기준선으로 한 지표별 cut-off json (publish_cutoff 형식)
+    problem_solving은 cut-off dict, 나머지는 {'cutoff', 'minmax', 'iqr'} (minmax/iqr는 클리핑 전 전체 기준)
+    """
+    tables = {}
+    for spec in INDICATORS:
+        if spec.name == 'problem_solving':
+            tables[spec.name] = dict(PROBLEM_SOLVING_CUTOFF)
+            continue
+        cols = CUTOFF_COLS[spec.name]
+        cutoff, minmax = exact_cutoffs(df, spec.kernel, cols, spec.cols)
+        tables[spec.name] = {'cutoff': cutoff, 'minmax': minmax, 'iqr': df_iqr_bounds(df, cols)}
+    return tables
+
+def partition_keys(df):
+    """차원별 파티션 값 Series {차원: 값} (date 컬럼이 없으면 month 제외, 값이 없는 행은 NaN/NaT)"""
+    keys = {}
+    if DAY_COL in df.columns:
+        # 월 Period (문자열 변환은 파티션 값에만: 100만 행 strftime ~6s → to_period ~0.07s)
+        keys['month'] = pd.to_datetime(df[DAY_COL], errors='coerce').dt.to_period('M')
+    if 'mid_category' in df.columns:
+        keys['mid_category'] = df['mid_category'].astype(object).where(df['mid_category'].notna())
+    return keys
+
+def partition_ranges(keys):
+    """
+    차원별 (정렬 인덱스, [(값, 시작, 끝)]) → 같은 값의 행은 정렬 인덱스의 연속 구간 [시작, 끝)
+    """
+    ranges = {}
+    for dimension, series in keys.items():
+        codes, uniques = pd.factorize(series, sort=True)
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        # 값이 없는 행(code -1)은 정렬 인덱스 앞쪽에 모이므로 건너뜀
+        ends = int((codes < 0).sum()) + np.cumsum(counts)
+        ranges[dimension] = (order, [(str(key), int(end - n), int(end)) for key, n, end in zip(uniques, counts, ends)])
+    return ranges
+
+# 작업 프로세스 공유 상태: feature 배열, 차원별 정렬 인덱스 (shared memory view 또는 프로세스 내 배열)
+_shared = {}
+
+def _init_arrays(features, orders, dimensions):
+    _shared.update(features=features, orders=orders, dimensions=dimensions)
+
+def _attach(feature_name, order_name, n_rows, dimensions):
+    # 풀 프로세스 initializer: 부모가 만든 shared memory에 연결 (복사 없이 view로 사용)
+    feature_shm = shared_memory.SharedMemory(name=feature_name)
+    features = np.ndarray((len(FEATURE_COLS), n_rows), dtype=np.float64, buffer=feature_shm.buf)
+    orders = None
+    if order_name is not None:
+        order_shm = shared_memory.SharedMemory(name=order_name)
+        orders = np.ndarray((len(dimensions), n_rows), dtype=np.int64, buffer=order_shm.buf)
+        _shared['order_shm'] = order_shm
+    _shared['feature_shm'] = feature_shm
+    _init_arrays(features, orders, dimensions)
+
+def _calibrate(task):
+    """(차원, 값, 시작, 끝) → (차원, 값, 행 수, 지표별 cut-off json). 차원이 None이면 전체."""
+    dimension, key, start, end = task
+    features = _shared['features']
+    if dimension is not None:
+        rows = _shared['orders'][_shared['dimensions'].index(dimension), start:end]
+        features = features[:, rows]
+    frame = pd.DataFrame(dict(zip(FEATURE_COLS, features)), copy=False)
+    return dimension, key, end - start, baseline_tables(frame)
+
+def _shared_array(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm
+
+def calibrate_partitions(df, workers=None, min_rows=MIN_PARTITION_ROWS):
+    """
+    전체 + 월별/mid_category별 지표 cut-off json 산출 (workers > 1이면 프로세스 풀)
+    반환: {'rows', 'min_rows', 'dimensions', 'global': {지표: json},
+           'partitions': {차원: {값: {'rows', 'tables': {지표: json}}}}, 'skipped': {차원: {값: 행 수}}}
+    """
+    if len(df) == 0:
+        raise ValueError("기준선 데이터가 비어 있습니다")
+    trace = laps('calibration', rows=len(df))
+    workers = workers or os.cpu_count() or 1
+    features = np.stack([df[col].to_numpy(dtype=np.float64) for col in FEATURE_COLS])
+    ranges = partition_ranges(partition_keys(df))
+    dimensions = list(ranges)
+    orders = np.stack([ranges[d][0] for d in dimensions]).astype(np.int64) if dimensions else None
+
+    tasks = [(None, None, 0, len(df))]
+    skipped = {}
+    for dimension in dimensions:
+        for key, start, end in ranges[dimension][1]:
+            if end - start >= min_rows:
+                tasks.append((dimension, key, start, end))
+            else:
+                skipped.setdefault(dimension, {})[key] = end - start
+    # 큰 파티션부터 맡겨 마지막에 큰 작업 하나만 남지 않도록
+    tasks.sort(key=lambda t: t[3] - t[2], reverse=True)
+    trace.lap('partition', tasks=len(tasks))
+
+    if workers <= 1 or len(tasks) == 1:
+        _init_arrays(features, orders, dimensions)
+        results = [_calibrate(task) for task in tasks]
+    else:
+        feature_shm = _shared_array(features)
+        order_shm = _shared_array(orders) if orders is not None else None
+        try:
+            initargs = (feature_shm.name, order_shm.name if order_shm else None, len(df), dimensions)
+            with ProcessPoolExecutor(min(workers, len(tasks)), initializer=_attach, initargs=initargs) as pool:
+                results = list(pool.map(_calibrate, tasks))
+        finally:
+            for shm in (feature_shm, order_shm):
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+    trace.lap('calibrate', workers=workers)
+
+    calibrated = {'rows': len(df), 'min_rows': min_rows, 'dimensions': dimensions,
+                  'global': None, 'partitions': {d: {} for d in dimensions}, 'skipped': skipped}
+    for dimension, key, n, tables in results:
+        if dimension is None:
+            calibrated['global'] = tables
+        else:
+            calibrated['partitions'][dimension][key] = {'rows': n, 'tables': tables}
+    for dimension in dimensions:
+        calibrated['partitions'][dimension] = dict(sorted(calibrated['partitions'][dimension].items()))
+    return calibrated
+
+def save_partition_tables(calibrated, versions, path=PARTITION_PATH):
+    """파티션 기준선을 함께 게시한 전체 기준선 버전({지표: 버전})과 한 파일로 원자적 교체"""
+    data = {key: calibrated[key] for key in ['rows', 'min_rows', 'dimensions']}
+    data['versions'] = versions
+    data.update({key: calibrated[key] for key in ['partitions', 'skipped']})
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+def publish_calibration(calibrated, cutoff_dir=CUTOFF_DIR):
+    """
+    전체 기준선을 레지스트리에 지표별 새 버전으로 게시한 뒤 파티션 표를 그 버전 번호와 함께 저장 → {지표: 버전}
+    (파티션 표는 게시 후에 쓰므로 게시되지 않은 버전을 가리키지 않는다)
+    """
+    versions = {name: publish_cutoff(name, table, cutoff_dir) for name, table in calibrated['global'].items()}
+    save_partition_tables(calibrated, versions, partition_path(cutoff_dir))
+    return versions
+
+def load_partition_tables(path=PARTITION_PATH, snapshot=None):
+    """
+    저장된 파티션 기준선 dict (없으면 None).
+    snapshot을 주면 파티션 표와 함께 게시한 전체 기준선 버전이 snapshot과 다를 때도 None (전체 기준선 사용).
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            tables = json.load(f)
+    except FileNotFoundError:
+        return None
+    if snapshot is not None:
+        versions = tables.get('versions')
+        if not versions or any(snapshot.version.get(name) != v for name, v in versions.items()):
+            return None
+    return tables
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='전체 + 기간/상담 유형별 cut-off 기준선 병렬 산출 및 게시')
+    parser.add_argument('data', nargs='?', default=os.path.join(os.path.dirname(__file__), '..', 'data', 'dummy_data.csv'),
+                        help='기준선 세션 파일 csv/parquet/arrow (기본: dummy_data.csv)')
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--min-rows', type=int, default=MIN_PARTITION_ROWS, help='파티션 최소 행 수')
+    args = parser.parse_args(argv)
+    df = with_float64(read_sessions(args.data), FEATURE_COLS)
+    t0 = time.perf_counter()
+    calibrated = calibrate_partitions(df, args.workers, args.min_rows)
+    versions = publish_calibration(calibrated)
+    counts = {d: len(p) for d, p in calibrated['partitions'].items()}
+    print(f"[INFO] {args.data}: {len(df)}행, 파티션 {counts}, 건너뜀 {calibrated['skipped']} "
+          f"({time.perf_counter() - t0:.2f}s) → 전체 기준선 버전 {versions}, {PARTITION_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+cut-off 기준선 저장/조회.
+
+cutoff/versions/<지표>/
+    000001.json, 000002.json, ...   버전별 cut-off json (한 번 쓰면 바뀌지 않음, 번호는 단조 증가)
+    CURRENT                         현재 버전 번호
+cutoff/grade_cutoff_<지표>.json      현재 버전 내용의 사본 (기존 경로로 직접 읽는 도구/스크립트 호환용)
+
+- publish_cutoff: 새 버전을 임시 파일에 쓰고 fsync → 이름 변경(os.link, 같은 번호가 있으면 다음 번호)으로 확정한 뒤
+  CURRENT와 사본을 같은 방식(임시 파일 → fsync → os.replace)으로 교체한다. 읽는 쪽은 항상 완전한 파일만 본다.
+- 동시에 여러 재산출이 게시하면 CURRENT는 더 큰 버전으로만 이동한다.
+- 읽기(CutoffRegistry)는 CURRENT → 해당 버전 파일 순으로 읽으므로 cut-off와 minmax/iqr 조합이 섞이지 않으며,
+  배치는 snapshot 하나(지표별 버전 고정)로 채점하므로 도중에 재산출이 게시되어도 기준이 바뀌지 않는다.
+- versions 디렉터리가 없으면 읽는 쪽은 grade_cutoff_<지표>.json을 그대로 읽는다 (버전 0, 파일을 만들지 않으므로
+  읽기 전용 배포에서도 동작). 첫 게시 때 쓰는 쪽이 그 내용을 1번 버전으로 가져온 뒤 새 버전을 게시한다.
+- 게시한 파일은 0644 권한으로 만든다 (평가 서비스가 다른 사용자로 실행되어도 읽을 수 있도록).
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 lock만 사용
+    fcntl = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.grader import compile_cutoff_json
+
+CUTOFF_DIR = os.path.join(os.path.dirname(__file__), '..', 'cutoff')
+INDICATOR_NAMES = ['politeness', 'empathy', 'problem_solving', 'emotional_stability', 'stability']
+
+VERSION_DIR = 'versions'
+LEGACY_VERSION = 0  # 첫 게시 전 grade_cutoff_<지표>.json (첫 게시 때 1번 버전으로 가져옴)
+KEEP_VERSIONS = 50  # 지표별로 보관할 최근 버전 수
+# snapshot()이 CURRENT(지표 5개)를 다시 확인하는 최소 간격(초). 같은 프로세스의 게시는 간격과 무관하게 바로 반영.
+DEFAULT_CHECK_INTERVAL = 1.0
+# CURRENT가 가리키는 버전 파일이 없을 때 CURRENT를 다시 읽는 최대 횟수 (정리와 겹친 경우만 재시도로 해결됨)
+CURRENT_RETRIES = 5
+
+# data: cut-off json 내용, table: 컴파일된 GradeTable, version: 버전 번호, digest: 파일 내용 sha256
+CutoffEntry = namedtuple('CutoffEntry', ['name', 'path', 'data', 'table', 'version', 'digest'])
+
+def cutoff_path(name, cutoff_dir=CUTOFF_DIR):
+    return os.path.join(cutoff_dir, f'grade_cutoff_{name}.json')
+
+def version_dir(name, cutoff_dir=CUTOFF_DIR):
+    return os.path.join(cutoff_dir, VERSION_DIR, name)
+
+def version_path(name, version, cutoff_dir=CUTOFF_DIR):
+    return os.path.join(version_dir(name, cutoff_dir), f'{version:06d}.json')
+
+def _fsync_dir(path):
+    # 이름 변경(rename/link)을 디스크에 반영 (디렉터리 fsync를 지원하지 않는 OS는 생략)
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+FILE_MODE = 0o644
+
+def _write_temp(directory, raw):
+    # 같은 디렉터리에 임시 파일로 쓰고 fsync → 경로 반환 (이후 rename/link로 확정)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    if hasattr(os, 'fchmod'):
+        # mkstemp는 0600으로 만들고 rename/link 후에도 유지되므로 일반 파일 권한으로 바꿈
+        os.fchmod(fd, FILE_MODE)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
+
+def atomic_write(path, raw):
+    """임시 파일 → fsync → os.replace (읽는 쪽은 이전 내용 또는 새 내용 전체만 본다)"""
+    directory = os.path.dirname(path) or '.'
+    os.replace(_write_temp(directory, raw), path)
+    _fsync_dir(directory)
+
+_publish_lock = threading.Lock()
+_publish_count = 0  # 이 프로세스에서 게시한 횟수 (레지스트리가 check_interval 안이어도 다시 확인하도록)
+
+@contextmanager
+def _locked(name, cutoff_dir):
+    # CURRENT 교체를 프로세스 내 lock + (지원되면) 프로세스 간 파일 잠금으로 직렬화
+    directory = version_dir(name, cutoff_dir)
+    os.makedirs(directory, exist_ok=True)
+    with _publish_lock, open(os.path.join(directory, 'lock'), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+def list_versions(name, cutoff_dir=CUTOFF_DIR):
+    directory = version_dir(name, cutoff_dir)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(int(f[:-5]) for f in os.listdir(directory) if f.endswith('.json') and f[:-5].isdigit())
+
+def current_version(name, cutoff_dir=CUTOFF_DIR):
+    """
+    CURRENT가 가리키는 버전 번호. 읽기만 하고 파일은 만들지 않는다.
+    CURRENT가 없으면 가장 큰 버전 파일(버전 확정 후 CURRENT 교체 전에 중단된 경우), 버전 파일도 없으면 LEGACY_VERSION.
+    """
+    try:
+        with open(os.path.join(version_dir(name, cutoff_dir), 'CURRENT')) as f:
+            return int(f.read())
+    except FileNotFoundError:
+        existing = list_versions(name, cutoff_dir)
+        return existing[-1] if existing else LEGACY_VERSION
+
+def source_path(name, version, cutoff_dir=CUTOFF_DIR):
+    """버전 내용을 읽을 파일 (LEGACY_VERSION은 가져온 1번 버전, 아직 게시 전이면 grade_cutoff_<지표>.json)"""
+    if version == LEGACY_VERSION:
+        migrated = version_path(name, 1, cutoff_dir)
+        return migrated if os.path.exists(migrated) else cutoff_path(name, cutoff_dir)
+    return version_path(name, version, cutoff_dir)
+
+def load_version(name, version, cutoff_dir=CUTOFF_DIR):
+    """버전 파일 원문 (bytes)"""
+    with open(source_path(name, version, cutoff_dir), 'rb') as f:
+        return f.read()
+
+def _dump(data):
+    return json.dumps(data, indent=2).encode('utf-8')
+
+def publish_cutoff(name, data, cutoff_dir=CUTOFF_DIR):
+    """
+    cut-off json(dict)을 새 버전으로 게시 → 버전 번호.
+    버전 파일 확정 후 CURRENT와 grade_cutoff_<지표>.json 사본을 원자적으로 교체한다.
+    """
+    return _publish_raw(name, _dump(data), cutoff_dir)
+
+def _link_version(name, tmp, version, cutoff_dir):
+    # link는 대상이 있으면 실패하므로 같은 번호를 두 번 확정하지 않는다 → 확정한 번호
+    while True:
+        try:
+            os.link(tmp, version_path(name, version, cutoff_dir))
+            return version
+        except FileExistsError:
+            version += 1
+
+def _publish_raw(name, raw, cutoff_dir):
+    global _publish_count
+    directory = version_dir(name, cutoff_dir)
+    os.makedirs(directory, exist_ok=True)
+    with _locked(name, cutoff_dir):
+        _publish_count += 1
+        existing = list_versions(name, cutoff_dir)
+        if not existing and os.path.exists(cutoff_path(name, cutoff_dir)):
+            # 첫 게시: 읽는 쪽이 LEGACY_VERSION으로 보던 grade_cutoff_<지표>.json을 1번 버전으로 가져옴
+            with open(cutoff_path(name, cutoff_dir), 'rb') as f:
+                legacy = _write_temp(directory, f.read())
+            try:
+                existing = [_link_version(name, legacy, 1, cutoff_dir)]
+            finally:
+                os.remove(legacy)
+        tmp = _write_temp(directory, raw)
+        try:
+            version = _link_version(name, tmp, (existing[-1] if existing else 0) + 1, cutoff_dir)
+        finally:
+            os.remove(tmp)
+        _fsync_dir(directory)
+        current = None
+        try:
+            with open(os.path.join(directory, 'CURRENT')) as f:
+                current = int(f.read())
+        except FileNotFoundError:
+            pass
+        if current is None or version > current:
+            atomic_write(os.path.join(directory, 'CURRENT'), str(version).encode())
+            atomic_write(cutoff_path(name, cutoff_dir), raw)
+        for old in list_versions(name, cutoff_dir)[:-KEEP_VERSIONS]:
+            os.remove(version_path(name, old, cutoff_dir))
+    return version
+
+class CutoffSnapshot:
+    """
+    한 시점의 5개 지표 cut-off/minmax/iqr 묶음 (읽기 전용).
+    배치 하나를 같은 snapshot으로 평가하면 도중에 파일이 갱신되어도 일관된 기준으로 채점된다.
+    cutoff_dir: 버전 파일을 읽은 디렉터리 (다른 버전과 비교할 때 같은 디렉터리에서 읽도록)
+    """
+
+    def __init__(self, entries, cutoff_dir=CUTOFF_DIR):
+        self._entries = dict(entries)
+        self.cutoff_dir = cutoff_dir
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def cutoff_json(self, name):
+        return self._entries[name].data
+
+    def cutoffs(self, name):
+        data = self._entries[name].data
+        return data['cutoff'] if 'cutoff' in data else data
+
+    def minmax(self, name):
+        return self._entries[name].data.get('minmax')
+
+    def iqr(self, name):
+        # 컬럼별 저장된 IQR 클리핑 기준 {col: {q1, q3, lower, upper}} (없으면 None → 배치 IQR 사용)
+        return self._entries[name].data.get('iqr')
+
+    def table(self, name):
+        return self._entries[name].table
+
+    @property
+    def version(self):
+        # 지표별 cut-off 버전 번호 (결과 캐시/로그에서 어떤 기준으로 채점했는지 식별, snapshot_at으로 같은 기준 재현)
+        return {name: entry.version for name, entry in self._entries.items()}
+
+    @property
+    def digest(self):
+        # 지표별 내용 해시 앞 12자리
+        return {name: entry.digest[:12] for name, entry in self._entries.items()}
+
+class CutoffRegistry:
+    """
+    지표별 현재 버전의 cut-off json을 한 번 읽어 컴파일한 상태로 보관하는 프로세스 단위 레지스트리.
+
+    snapshot() 호출 시 지표별 CURRENT(버전 번호)만 확인하고, 버전이 바뀐 경우에만 버전 파일을 읽는다.
+    (첫 게시 전 LEGACY_VERSION은 grade_cutoff_<지표>.json을 직접 고칠 수 있으므로 확인할 때마다 읽는다.)
+    다시 읽은 내용의 해시가 같으면 기존 컴파일 결과를 그대로 재사용한다.
+    check_interval(초) 안의 연속 호출은 CURRENT 확인도 생략한다 (평가/서비스 묶음마다 파일 5개를 열지 않도록).
+    다른 프로세스의 게시는 최대 check_interval 늦게 반영되고, 같은 프로세스의 게시는 다음 호출에 바로 반영된다.
+    """
+
+    def __init__(self, names=INDICATOR_NAMES, cutoff_dir=CUTOFF_DIR, check_interval=DEFAULT_CHECK_INTERVAL):
+        self.names = list(names)
+        self.cutoff_dir = cutoff_dir
+        self.check_interval = check_interval
+        self._entries = {}
+        self._snapshot = None
+        self._checked_at = None
+        self._seen_publishes = None
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def _load(self, name, version):
+        raw = load_version(name, version, self.cutoff_dir)
+        digest = hashlib.sha256(raw).hexdigest()
+        entry = self._entries.get(name)
+        if entry is not None and entry.digest == digest:
+            return entry._replace(version=version)
+        self.reloads += 1
+        data = json.loads(raw)
+        return CutoffEntry(name, source_path(name, version, self.cutoff_dir), data,
+                           compile_cutoff_json(data), version, digest)
+
+    def _load_current(self, name):
+        # CURRENT를 읽은 뒤 해당 버전이 정리(KEEP_VERSIONS 초과)되어 없으면 CURRENT부터 다시 읽음
+        for _ in range(CURRENT_RETRIES):
+            version = current_version(name, self.cutoff_dir)
+            entry = self._entries.get(name)
+            # 버전 파일은 바뀌지 않으므로 번호가 같으면 재사용. LEGACY_VERSION은 grade_cutoff_<지표>.json을
+            # 직접 고칠 수 있으므로 매번 읽어 해시를 비교한다 (같으면 _load가 컴파일 결과를 재사용).
+            if entry is not None and entry.version == version != LEGACY_VERSION:
+                return entry
+            try:
+                return self._load(name, version)
+            except FileNotFoundError:
+                if version == LEGACY_VERSION:
+                    raise  # 버전도 grade_cutoff_<지표>.json도 없음 (calculate_cutoff.py 필요)
+        raise FileNotFoundError(f"{name}: CURRENT가 가리키는 버전 {version} 파일이 없습니다 "
+                                f"({version_path(name, version, self.cutoff_dir)})")
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            if self._snapshot is not None and self._checked_at is not None \
+                    and now - self._checked_at < self.check_interval and self._seen_publishes == _publish_count:
+                return self._snapshot
+            seen = _publish_count
+            changed = False
+            for name in self.names:
+                entry = self._entries.get(name)
+                new_entry = self._load_current(name)
+                changed = changed or entry is None or new_entry.version != entry.version \
+                    or new_entry.digest != entry.digest
+                self._entries[name] = new_entry
+            if changed or self._snapshot is None:
+                self._snapshot = CutoffSnapshot(self._entries, self.cutoff_dir)
+            self._checked_at = now
+            self._seen_publishes = seen
+            return self._snapshot
+
+    def snapshot_at(self, versions):
+        """
+        지정한 버전으로 고정한 snapshot (versions: {지표: 버전 번호}, 없는 지표는 현재 버전).
+        이전 배치를 같은 기준으로 다시 채점할 때 사용 (버전 파일이 정리되었으면 FileNotFoundError).
+        """
+        current = self.snapshot()
+        entries = {}
+        for name in self.names:
+            version = versions.get(name)
+            if version is None or version == current.version[name]:
+                entries[name] = current._entries[name]
+                continue
+            raw = load_version(name, version, self.cutoff_dir)
+            data = json.loads(raw)
+            entries[name] = CutoffEntry(name, source_path(name, version, self.cutoff_dir), data,
+                                        compile_cutoff_json(data), version, hashlib.sha256(raw).hexdigest())
+        return CutoffSnapshot(entries, self.cutoff_dir)
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+def get_registry():
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = CutoffRegistry()
+        return _default_registry
+
+def current_snapshot():
+    """프로세스 기본 레지스트리의 최신 snapshot"""
+    return get_registry().snapshot()
@@ -0,0 +1,110 @@
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading import grade_politeness_auto as politeness
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import grade_problem_solving as problem_solving
+from absolute_grading import grade_emotional_stability_auto as emotional_stability
+from absolute_grading import grade_stability_auto as stability
+from absolute_grading.grader import grade_codes, INVALID_GRADE
+from absolute_grading.cutoff_registry import current_snapshot
+from absolute_grading.instrumentation import laps
+from absolute_grading.schema import as_float64
+
+# name: cut-off 레지스트리 키, prefix: 결과 컬럼 접두어, cols: 커널 인자 순서의 feature 컬럼
+IndicatorSpec = namedtuple('IndicatorSpec', ['name', 'prefix', 'cols', 'kernel'])
+
+INDICATORS = [
+    IndicatorSpec('politeness', 'Politeness', politeness.SCORE_ORDER, politeness.compute_politeness_scores),
+    IndicatorSpec('empathy', 'Empathy', empathy.cols, empathy.compute_empathy_scores),
+    IndicatorSpec('problem_solving', 'ProblemSolving', ['suggestions'], problem_solving.compute_problem_solving_scores),
+    IndicatorSpec('emotional_stability', 'EmotionalStability', emotional_stability.cols,
+                  emotional_stability.compute_emotional_stability_scores),
+    IndicatorSpec('stability', 'Stability', stability.cols, stability.compute_stability_scores),
+]
+
+# IQR 클리핑 + minmax 정규화 대상 feature (suggestions는 이산형 점수라 그대로 사용)
+NORMALIZED_INDICATORS = [spec for spec in INDICATORS if spec.name != 'problem_solving']
+FEATURE_COLS = [col for spec in NORMALIZED_INDICATORS for col in spec.cols]
+RAW_COLS = ['suggestions']
+
+def load_feature_buffer(df):
+    """
+    11개 feature + suggestions를 (컬럼 수, 행 수) float64 버퍼 하나에 한 번만 복사.
+    각 행(row)이 한 컬럼의 연속 메모리 view가 되도록 C-order로 둔다. float32 컬럼은 원래 십진값으로 복원한다.
+    """
+    cols = FEATURE_COLS + RAW_COLS
+    buf = np.empty((len(cols), len(df)), dtype=float)
+    for i, col in enumerate(cols):
+        buf[i] = as_float64(df[col])
+    return buf
+
+def clip_outliers_iqr_inplace(features, snapshot=None):
+    """
+    clip_outliers_iqr와 동일한 클리핑을 버퍼 위에서 수행.
+    snapshot에 지표별 저장된 기준(iqr)이 있으면 그 lower/upper로, 없으면 배치 기준 IQR로 클리핑한다
+    (quantile 임시 배열은 한 컬럼 크기).
+    """
+    for spec in NORMALIZED_INDICATORS:
+        bounds = snapshot.iqr(spec.name) if snapshot is not None else None
+        for col in spec.cols:
+            row = features[FEATURE_COLS.index(col)]
+            if bounds is not None:
+                np.clip(row, bounds[col]['lower'], bounds[col]['upper'], out=row)
+                continue
+            q1, q3 = np.nanquantile(row, [0.25, 0.75])
+            iqr = q3 - q1
+            lower = q1 - 1.5 * iqr
+            upper = q3 + 1.5 * iqr
+            if not np.isnan(iqr):
+                np.clip(row, lower, upper, out=row)
+    return features
+
+def minmax_normalize_inplace(features, snapshot):
+    # minmax_normalize와 동일: max > min이면 (x - min) / (max - min), 아니면 0.5
+    for spec in NORMALIZED_INDICATORS:
+        minmax = snapshot.minmax(spec.name)
+        for col in spec.cols:
+            row = features[FEATURE_COLS.index(col)]
+            min_val, max_val = minmax[col]['min'], minmax[col]['max']
+            if max_val > min_val:
+                row -= min_val
+                row /= (max_val - min_val)
+            else:
+                row[:] = 0.5
+    return features
+
+def evaluate_all(df, snapshot=None):
+    """
+    5개 지표를 한 번에 평가하여 점수/등급 DataFrame 반환.
+
+    evaluate_politeness ~ evaluate_stability를 각각 호출한 결과와 동일하지만,
+    입력 DataFrame에서 feature를 한 번만 읽고 클리핑/정규화/채점을 공유 버퍼 위에서 수행한다.
+    snapshot(CutoffSnapshot)을 주지 않으면 프로세스 레지스트리의 최신 snapshot을 사용한다.
+    """
+    trace = laps('evaluate_all', rows=len(df))
+    if snapshot is None:
+        snapshot = current_snapshot()
+    buf = load_feature_buffer(df)
+    features = buf[:len(FEATURE_COLS)]
+    clip_outliers_iqr_inplace(features, snapshot)
+    minmax_normalize_inplace(features, snapshot)
+    trace.lap('clip_normalize')
+    columns = {col: buf[i] for i, col in enumerate(FEATURE_COLS + RAW_COLS)}
+
+    result = {}
+    for spec in INDICATORS:
+        table = snapshot.table(spec.name)
+        scores = spec.kernel(*(columns[col] for col in spec.cols))
+        codes = grade_codes(scores, table)
+        if table.kind == 'lookup' and (codes == table.categories.index(INVALID_GRADE)).any():
+            raise ValueError("유효하지 않은 점수 발견")
+        result[f'{spec.prefix}_score'] = scores
+        result[f'{spec.prefix}_Grade'] = pd.Categorical.from_codes(codes, categories=table.categories)
+    trace.lap('score')
+    return pd.DataFrame(result, index=df.index, copy=False)
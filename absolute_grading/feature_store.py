@@ -0,0 +1,228 @@
+"""
+지표별 이력 feature 저장소 (append-only, memory-mapped).
+
+*_auto.py의 정확 재산출(--exact)이 매번 dummy_data.csv를 다시 읽고 텍스트를 파싱하지 않도록,
+지표 이력을 컬럼별 고정폭 float32 바이너리 파일로 보관하고 np.memmap 뷰(복사 없음)로 읽는다.
+
+data/history/<지표>/
+    meta.json        {"columns": [...], "rows": 확정된 행 수, "id_bytes": session_id.txt 확정 길이}
+                     - 쓰기 완료 후 원자적으로 교체 (커밋 지점)
+    <컬럼>.f32       컬럼별 little-endian float32 값 (행 순서 동일)
+    session_id.txt   행별 session_id (한 줄에 하나, 중복 추가 방지용 인덱스)
+
+- 저장소가 없으면 기준선 데이터(dummy_data.csv)로 초기화한다.
+- 배치는 session_id 기준으로 이미 저장된 세션을 제외하고 파일 끝에 이어 쓴다 (같은 배치를 다시 평가해도 중복 없음).
+- 읽기는 meta.json의 rows까지만 보므로, 이어 쓰는 도중 중단되어 남은 꼬리는 다음 추가 시 잘라낸다.
+- 한 프로세스 안의 동시 추가는 lock으로, 프로세스 간 동시 추가는 파일 잠금(fcntl, 지원되는 OS에서만)으로 직렬화한다.
+  *_auto.py는 pending_rows/commit_batch로 같은 잠금 안에서 sketch 누적·저장까지 마친 뒤 저장소에 확정한다.
+- float32는 유효숫자 7자리까지만 보존한다. 계산용 frame()은 저장값을 유효숫자 7자리 십진값의 float64로 복원하므로
+  (0.1 → 0.10000000149 → 0.1) 원본 CSV 값과 같고, 저장된 minmax와 새 배치 비교(check_minmax)가 어긋나지 않는다.
+"""
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 lock만 사용
+    fcntl = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.session_io import read_sessions
+from absolute_grading.schema import as_float64, with_float64
+
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'history')
+ID_COL = 'session_id'
+DTYPE = np.dtype('<f4')
+
+def history_dir(name, base_dir=HISTORY_DIR):
+    return os.path.join(base_dir, name)
+
+class FeatureStore:
+    def __init__(self, path, cols):
+        self.path = path
+        self.cols = list(cols)
+        self._lock = threading.RLock()
+        self._ids = None       # 저장된 session_id 집합 (append 시 지연 로드)
+        self._id_rows = 0      # _ids가 반영한 행 수
+
+    @property
+    def meta_path(self):
+        return os.path.join(self.path, 'meta.json')
+
+    def _col_path(self, col):
+        return os.path.join(self.path, f'{col}.f32')
+
+    @property
+    def _id_path(self):
+        return os.path.join(self.path, 'session_id.txt')
+
+    def exists(self):
+        return os.path.exists(self.meta_path)
+
+    def _meta(self):
+        with open(self.meta_path) as f:
+            return json.load(f)
+
+    def rows(self):
+        return self._meta()['rows']
+
+    def _write_meta(self, rows, id_bytes):
+        tmp = self.meta_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'columns': self.cols, 'rows': rows, 'id_bytes': id_bytes, 'dtype': DTYPE.str}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.meta_path)
+
+    def create(self):
+        """빈 저장소 생성 (기존 내용은 삭제)"""
+        os.makedirs(self.path, exist_ok=True)
+        for path in [self._col_path(col) for col in self.cols] + [self._id_path]:
+            open(path, 'wb').close()
+        self._write_meta(0, 0)
+        self._ids, self._id_rows = set(), 0
+
+    def columns(self, cols=None):
+        """컬럼별 읽기 전용 memmap 뷰 {col: float32 array} (확정된 rows까지, 복사 없음)"""
+        cols = self.cols if cols is None else cols
+        rows = self.rows()
+        if rows == 0:
+            return {col: np.empty(0, dtype=DTYPE) for col in cols}
+        return {col: np.memmap(self._col_path(col), dtype=DTYPE, mode='r', shape=(rows,)) for col in cols}
+
+    def frame(self, cols=None):
+        """재산출 계산용 DataFrame (memmap 뷰에서 텍스트 파싱 없이 한 번에 float64로 복원)"""
+        return pd.DataFrame({col: as_float64(values) for col, values in self.columns(cols).items()}, copy=False)
+
+    @contextmanager
+    def locked(self):
+        """프로세스 내 lock + (지원되면) 프로세스 간 파일 잠금. 같은 스레드에서 중첩 호출하지 않는다."""
+        os.makedirs(self.path, exist_ok=True)
+        with self._lock, open(os.path.join(self.path, 'lock'), 'w') as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    def append(self, df):
+        """
+        df(session_id + self.cols 컬럼)의 행 중 저장되지 않은 session_id만 이어 쓴다.
+        반환: 추가된 행 mask (bool 배열, df 행 순서)
+        """
+        with self.locked():
+            return self._append(df)
+
+    def new_rows(self, df):
+        """df 행 중 저장되지 않은 session_id mask (bool 배열, df 행 순서, 배치 안 중복은 첫 행만). 잠금은 호출하는 쪽에서."""
+        ids = self._load_ids(self.rows())
+        session_ids = df[ID_COL].astype(str).tolist()
+        new = np.fromiter((sid not in ids for sid in session_ids), dtype=bool, count=len(session_ids))
+        new &= ~pd.Series(session_ids).duplicated().to_numpy()
+        return new
+
+    def _append(self, df, new=None):
+        # new: 같은 잠금 안에서 new_rows(df)로 미리 구한 mask (없으면 여기서 구함)
+        if new is None:
+            new = self.new_rows(df)
+        if not new.any():
+            return new
+        meta = self._meta()
+        rows, id_bytes = meta['rows'], meta['id_bytes']
+        ids = self._load_ids(rows)
+        added = df.loc[new, self.cols]
+        added_ids = df.loc[new, ID_COL].astype(str).tolist()
+        id_text = ''.join(f'{sid}\n' for sid in added_ids).encode('utf-8')
+        # 중단된 이전 추가의 꼬리를 잘라낸 뒤 이어 쓰고, 모든 파일을 디스크에 반영한 다음 meta를 갱신
+        for col in self.cols:
+            with open(self._col_path(col), 'r+b') as f:
+                f.truncate(rows * DTYPE.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(added[col].to_numpy(dtype=DTYPE).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        with open(self._id_path, 'r+b') as f:
+            f.truncate(id_bytes)
+            f.seek(0, os.SEEK_END)
+            f.write(id_text)
+            f.flush()
+            os.fsync(f.fileno())
+        self._write_meta(rows + len(added_ids), id_bytes + len(id_text))
+        ids.update(added_ids)
+        self._id_rows = rows + len(added_ids)
+        return new
+
+    def _load_ids(self, rows):
+        # 다른 프로세스가 행을 추가했으면 session_id 인덱스를 다시 읽음
+        if self._ids is None or self._id_rows != rows:
+            with open(self._id_path, encoding='utf-8') as f:
+                self._ids = set(line.rstrip('\n') for _, line in zip(range(rows), f))
+            self._id_rows = rows
+        return self._ids
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def _shared_store(name, cols, base_dir):
+    path = history_dir(name, base_dir)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = FeatureStore(path, cols)
+        return _stores[path]
+
+def load_feature_store(name, cols, bootstrap_path, base_dir=HISTORY_DIR):
+    """
+    지표 이력 저장소 (프로세스 안에서 지표당 하나를 공유).
+    저장소가 없으면 bootstrap_path(기준선 데이터)로 초기화한다.
+    """
+    store = _shared_store(name, cols, base_dir)
+    if not store.exists():
+        with store.locked():
+            if not store.exists():
+                store.create()
+                store._append(read_sessions(bootstrap_path, [ID_COL] + store.cols))
+    return store
+
+def reset_feature_store(name, cols, df, base_dir=HISTORY_DIR):
+    """저장소를 df(기준선 데이터)만으로 다시 만든다 (calculate_cutoff.py에서 사용)"""
+    store = _shared_store(name, cols, base_dir)
+    with store.locked():
+        store.create()
+        store._append(df)
+    return store
+
+def pending_rows(store, raw_df):
+    """
+    배치 중 이력 저장소에 새로 추가할 행 mask (bool 배열, raw_df 행 순서).
+    session_id가 없는 배치는 중복 여부를 알 수 없으므로 저장하지 않고 None을 반환한다.
+    store.locked() 안에서 commit_batch와 함께 쓴다 (그 사이에 sketch 등 다른 이력을 먼저 갱신할 수 있도록).
+    """
+    if ID_COL not in raw_df.columns:
+        return None
+    return store.new_rows(raw_df)
+
+def commit_batch(store, raw_df, added):
+    """pending_rows가 구한 행을 저장소에 확정 (store.locked() 안에서)"""
+    if added is not None and added.any():
+        store._append(raw_df, added)
+
+def append_batch(store, raw_df):
+    """배치를 이력 저장소에 추가 → 추가된 행 mask (session_id가 없으면 저장하지 않고 None)"""
+    with store.locked():
+        added = pending_rows(store, raw_df)
+        commit_batch(store, raw_df, added)
+    return added
+
+def history_with_batch(store, raw_df, cols):
+    """
+    append_batch 이후의 전체 이력 + 이번 배치 DataFrame.
+    session_id가 없어 저장되지 않은 배치는 이번 계산에만 이어 붙인다.
+    """
+    history = store.frame(cols)
+    if ID_COL in raw_df.columns:
+        return history
+    return pd.concat([history, with_float64(raw_df, cols)[cols]], ignore_index=True)
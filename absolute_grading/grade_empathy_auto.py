@@ -1,41 +1,25 @@
-import pandas as pd
-import json
 import os
-import numpy as np
 import sys
 
-def clip_outliers_iqr(df, cols):
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.grader import compile_cutoffs, assign_grades
+from absolute_grading.cutoff_registry import current_snapshot, publish_cutoff
+from absolute_grading.session_io import read_sessions
+from absolute_grading.schema import with_float64
+from absolute_grading.feature_store import load_feature_store, pending_rows, commit_batch, history_with_batch
+from absolute_grading.instrumentation import laps, count, setup_trace
+from absolute_grading.rescore import score_batch, rescore_batch
+from absolute_grading.recalibration import recalibrate_exact
+from absolute_grading.sketch import load_history_sketch, fold_batch, save_sketch, sketch_path, recalibrate_from_sketch, df_iqr_bounds
+
+def clip_outliers_iqr(df, cols, bounds=None):
+    # bounds(cut-off json의 'iqr': 저장된 기준 사분위)가 없으면 df 자체의 IQR로 클리핑
+    if bounds is None:
+        bounds = df_iqr_bounds(df, cols)
     for col in cols:
-        q1 = df[col].quantile(0.25)
-        q3 = df[col].quantile(0.75)
-        iqr = q3 - q1
-        lower = q1 - 1.5 * iqr
-        upper = q3 + 1.5 * iqr
-        df[col] = df[col].clip(lower, upper)
+        df[col] = df[col].clip(bounds[col]['lower'], bounds[col]['upper'])
     return df
 
-DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'new_data.csv')
-DUMMY_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'dummy_data.csv')
-if os.path.exists(DATA_PATH):
-    print(f"[INFO] new_data.csv로 평가를 진행합니다.")
-    eval_path = DATA_PATH
-else:
-    print(f"[INFO] new_data.csv가 없어 dummy_data.csv로 평가를 진행합니다.")
-    eval_path = DUMMY_PATH
-
-CUTOFF_PATH = os.path.join(os.path.dirname(__file__), '..', 'cutoff', 'grade_cutoff_empathy.json')
-cols = ['empathy_ratio', 'apology_ratio']
-
-eval_df = pd.read_csv(eval_path)
-eval_df.columns = eval_df.columns.str.strip()
-eval_df = clip_outliers_iqr(eval_df, cols)
-
-with open(CUTOFF_PATH) as f:
-    cutoff_json = json.load(f)
-    cutoffs = cutoff_json['cutoff']
-    old_minmax = cutoff_json['minmax']
-new_minmax = {col: {"min": float(eval_df[col].min()), "max": float(eval_df[col].max())} for col in cols}
-
 def check_minmax(new_minmax, old_minmax):
     for key in new_minmax:
         if new_minmax[key]['min'] < old_minmax[key]['min'] or new_minmax[key]['max'] > old_minmax[key]['max']:
@@ -53,60 +37,119 @@ def compute_empathy_score(row):
     ar = row['apology_ratio_norm']
     return er * 0.7 + ar * 0.3
 
-def grade_from_cutoff(score, cutoffs):
-    if score >= cutoffs["A"]: return "A"
-    elif score >= cutoffs["B"]: return "B"
-    elif score >= cutoffs["C"]: return "C"
-    elif score >= cutoffs["D"]: return "D"
-    elif score >= cutoffs["E"]: return "E"
-    elif score >= cutoffs["F"]: return "F"
-    else: return "G"
-
-if check_minmax(new_minmax, old_minmax):
-    print('기존 cut-off/minmax로 평가')
-    minmax = old_minmax
-else:
-    print('범위 벗어남 → cut-off/minmax 재산출')
-    old_df = pd.read_csv(DUMMY_PATH)
-    old_df.columns = old_df.columns.str.strip()
-    all_df = pd.concat([old_df, eval_df], ignore_index=True)
-    all_df = clip_outliers_iqr(all_df, cols)
-    minmax = {col: {"min": float(all_df[col].min()), "max": float(all_df[col].max())} for col in cols}
-    scores = []
-    for _, row in all_df.iterrows():
-        er = minmax_normalize(row['empathy_ratio'], minmax['empathy_ratio']['min'], minmax['empathy_ratio']['max'])
-        ar = minmax_normalize(row['apology_ratio'], minmax['apology_ratio']['min'], minmax['apology_ratio']['max'])
-        score = er * 0.7 + ar * 0.3
-        scores.append(score)
-    new_cutoff = {
-        "A": float(np.percentile(scores, 90)),
-        "B":  float(np.percentile(scores, 80)),
-        "C": float(np.percentile(scores, 70)),
-        "D":  float(np.percentile(scores, 60)),
-        "E": float(np.percentile(scores, 50)),
-        "F":  float(np.percentile(scores, 40)),
-        "G":  -1e9
-    }
-    with open(CUTOFF_PATH, 'w') as f:
-        json.dump({'cutoff': new_cutoff, 'minmax': minmax}, f, indent=2)
-    cutoffs = new_cutoff
-
-for col in cols:
-    eval_df[f'{col}_norm'] = minmax_normalize(eval_df[col], minmax[col]['min'], minmax[col]['max'])
-eval_df['Empathy_score'] = eval_df.apply(compute_empathy_score, axis=1)
-eval_df['Empathy_Grade'] = eval_df['Empathy_score'].apply(lambda x: grade_from_cutoff(x, cutoffs))
-
-print(eval_df[['Empathy_score', 'Empathy_Grade']].head(20))
-
-def evaluate_empathy(df):
+def compute_empathy_scores(er, ar):
+    # compute_empathy_score의 배열 입력/출력 버전 (행 단위 결과와 bit 단위 동일)
+    return er * 0.7 + ar * 0.3
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'new_data.csv')
+DUMMY_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'dummy_data.csv')
+CUTOFF_PATH = os.path.join(os.path.dirname(__file__), '..', 'cutoff', 'grade_cutoff_empathy.json')
+cols = ['empathy_ratio', 'apology_ratio']
+
+def evaluate_empathy(df, snapshot=None):
     cols = ['empathy_ratio', 'apology_ratio']
-    with open(CUTOFF_PATH) as f:
-        cutoff_json = json.load(f)
-        cutoffs = cutoff_json['cutoff']
-        minmax = cutoff_json['minmax']
-    df = clip_outliers_iqr(df.copy(), cols)
+    # snapshot을 주지 않으면 프로세스 레지스트리의 최신 cut-off/minmax 사용 (파일이 바뀐 경우에만 재로드)
+    if snapshot is None:
+        snapshot = current_snapshot()
+    minmax = snapshot.minmax('empathy')
+    # float32로 읽은 feature는 원래 십진값의 float64로 복원해서 계산 (cut-off 경계 동점 세션의 등급 유지)
+    df = clip_outliers_iqr(with_float64(df, cols).copy(), cols, snapshot.iqr('empathy'))
     for col in cols:
         df[f'{col}_norm'] = minmax_normalize(df[col], minmax[col]['min'], minmax[col]['max'])
-    df['Empathy_score'] = df.apply(compute_empathy_score, axis=1)
-    df['Empathy_Grade'] = df['Empathy_score'].apply(lambda x: grade_from_cutoff(x, cutoffs))
-    return df[['Empathy_score', 'Empathy_Grade']] 
\ No newline at end of file
+    df['Empathy_score'] = compute_empathy_scores(*(df[f'{col}_norm'].to_numpy(dtype=float) for col in cols))
+    df['Empathy_Grade'] = assign_grades(df['Empathy_score'].to_numpy(), snapshot.table('empathy'))
+    return df[['Empathy_score', 'Empathy_Grade']]
+
+def run(raw_df, exact=False, log=print):
+    """
+    raw_df(헤더 공백을 제거한 세션 DataFrame) 평가. minmax를 벗어나면 cut-off/minmax/iqr를 재산출해 저장하고,
+    이력 sketch에 배치를 누적한다. exact=True면 sketch 대신 이력 feature 저장소(dummy_data + 누적 배치) 전체로 정확 재산출.
+    반환: 점수/등급 컬럼이 추가된 DataFrame (raw_df는 변경하지 않음)
+    """
+    # 단계별 시간 기록 (EVAL_TRACE/--trace로 켠 경우에만)
+    trace = laps('empathy', rows=len(raw_df))
+    # float32로 읽은 feature는 원래 십진값의 float64로 복원 (minmax 비교/sketch/재산출 모두 float64 기준)
+    raw_df = with_float64(raw_df, cols)
+    # 배치 하나는 한 버전의 cut-off로 고정 (도중에 다른 재산출이 게시되어도 같은 기준으로 비교/채점)
+    cutoff_json = current_snapshot().cutoff_json('empathy')
+    cutoffs = cutoff_json['cutoff']
+    old_minmax = cutoff_json['minmax']
+    bounds = cutoff_json.get('iqr')
+    # 저장된 기준 사분위(iqr)가 있으면 그 범위로, 없으면 이번 배치의 IQR로 클리핑
+    eval_df = clip_outliers_iqr(raw_df.copy(), cols, bounds)
+    new_minmax = {col: {"min": float(eval_df[col].min()), "max": float(eval_df[col].max())} for col in cols}
+    trace.lap('clip')
+
+    # 기존 기준 정규화 값/점수는 정규화·채점 단계에서 재사용 (rescore.py)
+    batch = score_batch(eval_df, compute_empathy_scores, old_minmax, bounds, cols)
+    # sketch에는 클리핑 전 원본 row를 넣는다 (이력 사분위가 기존 클리핑 범위에 묶이지 않도록)
+    batch_rows = raw_df[cols].to_numpy(dtype=float)
+
+    # 이력 feature 저장소 추가와 sketch 누적·재산출·저장을 저장소 잠금 하나로 직렬화
+    # (동시에 평가해도 서로의 sketch 누적을 덮어쓰지 않음, 저장소/sketch가 없으면 dummy_data.csv로 초기화)
+    store = load_feature_store('empathy', cols, DUMMY_PATH)
+    with store.locked():
+        # 저장소에 새로 추가할 행(session_id 기준 중복 제외)만 sketch에 누적 (같은 배치를 다시 평가해도 중복 누적 없음)
+        added = pending_rows(store, raw_df)
+        sketch = load_history_sketch('empathy', cols, compute_empathy_scores, old_minmax, DUMMY_PATH)
+        folded = fold_batch(sketch, batch_rows, batch.scores, added)
+        # sketch를 저장한 뒤 저장소에 확정 (그 사이 중단되면 다음 실행에서 다시 누적될 뿐 유실되지 않음)
+        if folded:
+            save_sketch(sketch, sketch_path('empathy'))
+        commit_batch(store, raw_df, added)
+        trace.lap('history_update', added=0 if added is None else int(added.sum()), folded=folded)
+
+        if check_minmax(new_minmax, old_minmax):
+            log('기존 cut-off/minmax로 평가')
+            minmax = old_minmax
+        elif exact:
+            log('범위 벗어남 → cut-off/minmax 재산출 (전체 이력 정확 계산)')
+            count('recalibration', indicator='empathy', mode='exact')
+            all_df = history_with_batch(store, raw_df, cols)
+            cutoffs, minmax, bounds = recalibrate_exact(all_df, compute_empathy_scores, cols)
+            publish_cutoff('empathy', {'cutoff': cutoffs, 'minmax': minmax, 'iqr': bounds})
+            eval_df = clip_outliers_iqr(raw_df.copy(), cols, bounds)
+            trace.lap('recalibrate_exact', rows=len(all_df))
+        else:
+            log('범위 벗어남 → cut-off/minmax 재산출 (이력 sketch 기준)')
+            count('recalibration', indicator='empathy', mode='sketch')
+            cutoffs, minmax, bounds = recalibrate_from_sketch(sketch, compute_empathy_scores)
+            # 재산출로 바뀐 sketch key(새 minmax 기준 점수)도 저장
+            save_sketch(sketch, sketch_path('empathy'))
+            publish_cutoff('empathy', {'cutoff': cutoffs, 'minmax': minmax, 'iqr': bounds})
+            eval_df = clip_outliers_iqr(raw_df.copy(), cols, bounds)
+            trace.lap('recalibrate_sketch', rows=sketch.n)
+
+    # 기준(minmax/iqr)이 그대로면 sketch 누적 때 계산한 점수로 등급만 매기고, 바뀌었으면 numpy로 다시 정규화·채점
+    norm, scores, mode = rescore_batch(batch, compute_empathy_scores, minmax, bounds, eval_df, cols)
+    for col in cols:
+        eval_df[f'{col}_norm'] = norm[cols.index(col)]
+    eval_df['Empathy_score'] = scores
+    eval_df['Empathy_Grade'] = assign_grades(scores, compile_cutoffs(cutoffs))
+    trace.lap('score', mode=mode)
+    return eval_df
+
+def main(argv=None):
+    # --exact: 이력 sketch 대신 이력 feature 저장소(dummy_data + 누적 배치) 전체로 cut-off/minmax 정확 재산출
+    # 입력 파일(csv/parquet/arrow)을 인자로 주면 new_data.csv 대신 사용
+    argv = sys.argv[1:] if argv is None else argv
+    setup_trace()
+    exact = '--exact' in argv
+    paths = [arg for arg in argv if not arg.startswith('--')]
+    if paths:
+        print(f"[INFO] {paths[0]}로 평가를 진행합니다.")
+        eval_path = paths[0]
+    elif os.path.exists(DATA_PATH):
+        print(f"[INFO] new_data.csv로 평가를 진행합니다.")
+        eval_path = DATA_PATH
+    else:
+        print(f"[INFO] new_data.csv가 없어 dummy_data.csv로 평가를 진행합니다.")
+        eval_path = DUMMY_PATH
+
+    # 이 지표에 필요한 컬럼만 읽음 (session_id는 이력 저장소 중복 확인용)
+    raw_df = read_sessions(eval_path, ['session_id'] + cols)
+    eval_df = run(raw_df, exact)
+    print(eval_df[['Empathy_score', 'Empathy_Grade']].head(20))
+
+if __name__ == "__main__":
+    main()
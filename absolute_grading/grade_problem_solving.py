@@ -1,15 +1,17 @@
 import pandas as pd
+import numpy as np
 import os
 import sys
 
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.grader import grade_codes, INVALID_GRADE
+from absolute_grading.cutoff_registry import current_snapshot
+from absolute_grading.session_io import read_sessions
+from absolute_grading.schema import as_float64
+from absolute_grading.instrumentation import laps, setup_trace
+
 DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'new_data.csv')
 DUMMY_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'dummy_data.csv')
-if os.path.exists(DATA_PATH):
-    print(f"[INFO] new_data.csv로 평가를 진행합니다.")
-    eval_path = DATA_PATH
-else:
-    print(f"[INFO] new_data.csv가 없어 dummy_data.csv로 평가를 진행합니다.")
-    eval_path = DUMMY_PATH
 
 def grade_from_score(score: float) -> str:
     if score == 1.0:
@@ -23,33 +25,54 @@ def grade_from_score(score: float) -> str:
     else:
         return "Invalid"
 
-# 1. 데이터 로드
-df = pd.read_csv(eval_path)
-
-# 2. 점수 및 등급 부여
-valid_scores = {0.0, 0.2, 0.6, 1.0}
-if not set(df['suggestions']).issubset(valid_scores):
-    raise ValueError("유효하지 않은 점수 발견")
-df['ProblemSolving_Grade'] = df['suggestions'].apply(grade_from_score)
-
-print(df[['suggestions', 'ProblemSolving_Grade']].head(20))
-
-def evaluate_problem_solving(df):
-    def grade_from_score(score: float) -> str:
-        if score == 1.0:
-            return "A"
-        elif score == 0.6:
-            return "B"
-        elif score == 0.2:
-            return "C"
-        elif score == 0.0:
-            return "D"
-        else:
-            return "Invalid"
-    valid_scores = {0.0, 0.2, 0.6, 1.0}
-    if not set(df['suggestions']).issubset(valid_scores):
+def compute_problem_solving_scores(suggestions):
+    # suggestions 값(0.0, 0.2, 0.6, 1.0)은 이미 정규화된 값이므로 그대로 점수로 사용
+    # (float32로 읽은 값은 0.2 → 0.2000000030이 되지 않도록 십진값으로 복원해야 등급 lookup과 일치)
+    return as_float64(np.asarray(suggestions))
+
+def evaluate_problem_solving(df, snapshot=None):
+    # 이산형 점수별 절대 등급 매핑(grade_cutoff_problem_solving.json)은 lookup table로 컴파일되어 있음
+    if snapshot is None:
+        snapshot = current_snapshot()
+    table = snapshot.table('problem_solving')
+    scores = compute_problem_solving_scores(df['suggestions'])
+    codes = grade_codes(scores, table)
+    if (codes == table.categories.index(INVALID_GRADE)).any():
         raise ValueError("유효하지 않은 점수 발견")
-    df = df.copy()
-    df['ProblemSolving_score'] = df['suggestions']
-    df['ProblemSolving_Grade'] = df['suggestions'].apply(grade_from_score)
-    return df[['ProblemSolving_score', 'ProblemSolving_Grade']] 
\ No newline at end of file
+    return pd.DataFrame({
+        'ProblemSolving_score': scores,
+        'ProblemSolving_Grade': pd.Categorical.from_codes(codes, categories=table.categories),
+    }, index=df.index)
+
+def run(raw_df, exact=False, log=print):
+    """
+    raw_df(헤더 공백을 제거한 세션 DataFrame) 평가 → 점수/등급 컬럼이 추가된 DataFrame (raw_df는 변경하지 않음).
+    이산형 절대 등급이라 재산출이 없으므로 exact/log는 다른 지표의 run과 호출 형식을 맞추기 위한 인자.
+    """
+    trace = laps('problem_solving', rows=len(raw_df))
+    df = raw_df.copy()
+    result = evaluate_problem_solving(df)
+    df['ProblemSolving_score'] = result['ProblemSolving_score']
+    df['ProblemSolving_Grade'] = result['ProblemSolving_Grade']
+    trace.lap('score')
+    return df
+
+def main():
+    setup_trace()
+    if os.path.exists(DATA_PATH):
+        print(f"[INFO] new_data.csv로 평가를 진행합니다.")
+        eval_path = DATA_PATH
+    else:
+        print(f"[INFO] new_data.csv가 없어 dummy_data.csv로 평가를 진행합니다.")
+        eval_path = DUMMY_PATH
+
+    # 1. 데이터 로드
+    df = read_sessions(eval_path, ['suggestions'])
+
+    # 2. 점수 및 등급 부여
+    df = run(df)
+
+    print(df[['suggestions', 'ProblemSolving_Grade']].head(20))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# 구간형 지표(정중함/공감/감정안정성/대화흐름) 등급 순서
+GRADES = ['A', 'B', 'C', 'D', 'E', 'F', 'G']
+INVALID_GRADE = 'Invalid'
+
+# kind: 'cutoff'(구간형) 또는 'lookup'(이산형)
+# keys: searchsorted 대상 오름차순 배열, codes: keys 위치별 등급 코드, categories: 등급 라벨
+GradeTable = namedtuple('GradeTable', ['kind', 'keys', 'codes', 'categories'])
+
+def grade_from_cutoff(score, cutoffs):
+    if score >= cutoffs["A"]: return "A"
+    elif score >= cutoffs["B"]: return "B"
+    elif score >= cutoffs["C"]: return "C"
+    elif score >= cutoffs["D"]: return "D"
+    elif score >= cutoffs["E"]: return "E"
+    elif score >= cutoffs["F"]: return "F"
+    else: return "G"
+
+def compile_cutoffs(cutoffs):
+    """
+    A~G cut-off dict를 searchsorted용 오름차순 threshold 배열로 컴파일.
+
+    grade_from_cutoff의 if/elif 사다리와 동일한 결과를 내도록, 각 등급의 threshold는
+    자기 자신과 상위 등급 cut-off 중 최솟값으로 둔다 (cut-off가 단조가 아니어도 동일).
+    """
+    ladder = np.array([cutoffs[g] for g in GRADES[:-1]], dtype=float)
+    effective = np.minimum.accumulate(ladder)
+    # 오름차순: [F, E, D, C, B, A] → searchsorted(right) 결과 i는 "통과한 threshold 개수"
+    keys = effective[::-1].copy()
+    codes = np.arange(len(GRADES) - 1, -1, -1, dtype=np.int8)  # i=0 → G(6), i=6 → A(0)
+    return GradeTable('cutoff', keys, codes, list(GRADES))
+
+def compile_lookup(mapping):
+    """
+    이산형 점수 → 등급 매핑(예: problem_solving {"A": 1.0, "B": 0.6, ...})을 lookup table로 컴파일.
+    매핑에 없는 점수는 'Invalid' 등급이 된다.
+    """
+    labels = list(mapping.keys())
+    values = np.array([mapping[g] for g in labels], dtype=float)
+    order = np.argsort(values, kind='stable')
+    codes = np.append(order.astype(np.int8), np.int8(len(labels)))  # 마지막 = Invalid
+    return GradeTable('lookup', values[order], codes, labels + [INVALID_GRADE])
+
+def compile_cutoff_json(cutoff_json):
+    """
+    cut-off json 내용을 GradeTable로 컴파일.
+    {'cutoff': {...}, 'minmax': {...}} 형식은 구간형, 점수 매핑 dict 자체(problem_solving)는 이산형으로 처리.
+    """
+    if 'cutoff' in cutoff_json:
+        return compile_cutoffs(cutoff_json['cutoff'])
+    return compile_lookup(cutoff_json)
+
+def grade_codes(scores, table):
+    # 점수 배열 → 등급 코드(int8) 배열 (table.categories 인덱스)
+    scores = np.asarray(scores, dtype=float)
+    if table.kind == 'cutoff':
+        idx = np.searchsorted(table.keys, scores, side='right')
+        idx[np.isnan(scores)] = 0  # NaN은 어떤 cut-off도 통과하지 못함 → G
+        return table.codes[idx]
+    idx = np.searchsorted(table.keys, scores, side='left')
+    idx = np.minimum(idx, len(table.keys) - 1)
+    matched = table.keys[idx] == scores
+    return np.where(matched, table.codes[idx], table.codes[-1]).astype(np.int8)
+
+def assign_grades(scores, table):
+    """점수 배열 전체에 대해 한 번의 searchsorted로 등급을 부여하고 categorical로 반환"""
+    return pd.Categorical.from_codes(grade_codes(scores, table), categories=table.categories)
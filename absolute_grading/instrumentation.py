@@ -0,0 +1,205 @@
+"""
+평가 파이프라인 단계별 시간/카운터 기록 (opt-in, JSON-lines trace + 요약 표).
+
+켜는 방법: 환경변수 EVAL_TRACE=trace.jsonl 또는 argparse 스크립트의 --trace trace.jsonl
+(켜지 않으면 stage()/laps()는 공유 no-op 객체를, count()는 바로 반환하므로 추가 비용은 함수 호출 1번)
+
+- stage(name, **fields): with 블록 하나를 한 단계로 기록 (wall/CPU 시간, rows/bytes 등 필드)
+- laps(prefix, **fields): 함수 안의 연속된 단계를 들여쓰기 없이 기록 (lap(name)마다 직전 lap 이후 시간)
+- count(name, n, **fields): 재산출 발생, 캐시 적중 등 카운터
+CPU 시간은 스레드 기준(time.thread_time)이라 batch_grade_all처럼 지표를 동시에 실행해도 단계별로 나뉜다.
+
+trace 파일은 이어 쓰므로 여러 스크립트(calculate_cutoff.py → batch_grade_all.py → LLM_evaluation_batch.py)를
+같은 파일에 기록한 뒤 한 번에 요약할 수 있다.
+    {"ts": 1760000000.12, "pid": 123, "thread": "ThreadPoolExecutor-0_0", "type": "stage", "name": "politeness.clip",
+     "parent": null, "wall_ms": 1.8, "cpu_ms": 1.7, "rows": 500}
+    {"ts": ..., "type": "counter", "name": "recalibration", "n": 1, "indicator": "politeness", "mode": "sketch"}
+
+사용법 (루트에서 실행):
+    EVAL_TRACE=trace.jsonl python batch_grade_all.py       # 종료 시 요약 표 출력
+    python -m absolute_grading.instrumentation trace.jsonl  # 기록된 trace 파일 요약
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+
+TRACE_ENV = 'EVAL_TRACE'
+# 요약 표에서 단계별로 합산하는 필드
+SUM_FIELDS = ['rows', 'bytes', 'prompt_tokens', 'output_tokens']
+
+class _NullStage:
+    """trace가 꺼져 있을 때 stage()/laps()가 돌려주는 공유 no-op 객체"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def add(self, **fields):
+        pass
+
+    def lap(self, name, **fields):
+        pass
+
+_NULL = _NullStage()
+
+class Tracer:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.events = []
+
+    def emit(self, event):
+        event = {'ts': round(time.time(), 6), 'pid': os.getpid(), 'thread': threading.current_thread().name, **event}
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self.events.append(event)
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def stack(self):
+        # 스레드별 진행 중인 stage 이름 (중첩 stage의 parent)
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+class _Stage:
+    def __init__(self, tracer, name, fields):
+        self.tracer = tracer
+        self.name = name
+        self.fields = fields
+
+    def add(self, **fields):
+        self.fields.update(fields)
+
+    def __enter__(self):
+        stack = self.tracer.stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall_ms = (time.perf_counter() - self.wall) * 1000
+        cpu_ms = (time.thread_time() - self.cpu) * 1000
+        self.tracer.stack().pop()
+        event = {'type': 'stage', 'name': self.name, 'parent': self.parent,
+                 'wall_ms': round(wall_ms, 3), 'cpu_ms': round(cpu_ms, 3), **self.fields}
+        if exc_type is not None:
+            event['error'] = exc_type.__name__
+        self.tracer.emit(event)
+        return False
+
+class _Laps:
+    def __init__(self, tracer, prefix, fields):
+        self.tracer = tracer
+        self.prefix = prefix
+        self.fields = fields
+        stack = tracer.stack()
+        self.parent = stack[-1] if stack else None
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+
+    def add(self, **fields):
+        self.fields.update(fields)
+
+    def lap(self, name, **fields):
+        """직전 lap(또는 laps() 호출) 이후의 시간을 '<prefix>.<name>' 단계로 기록"""
+        wall, cpu = time.perf_counter(), time.thread_time()
+        self.tracer.emit({'type': 'stage', 'name': f'{self.prefix}.{name}', 'parent': self.parent,
+                          'wall_ms': round((wall - self.wall) * 1000, 3), 'cpu_ms': round((cpu - self.cpu) * 1000, 3),
+                          **self.fields, **fields})
+        self.wall, self.cpu = wall, cpu
+
+_tracer = None
+
+def enabled():
+    return _tracer is not None
+
+def enable(path, summary=True):
+    """trace 기록 시작 (이미 켜져 있으면 그대로). summary=True면 프로세스 종료 시 요약 표를 stderr로 출력"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path)
+        atexit.register(_finish, _tracer, summary)
+    return _tracer
+
+def setup_trace(path=None):
+    """스크립트 main에서 호출: --trace 경로 또는 환경변수 EVAL_TRACE가 있으면 trace를 켠다"""
+    path = path or os.environ.get(TRACE_ENV)
+    if path:
+        enable(path)
+
+def _finish(tracer, summary):
+    tracer.close()
+    if summary and tracer.events:
+        print(format_summary(tracer.events), file=sys.stderr)
+
+def stage(name, **fields):
+    if _tracer is None:
+        return _NULL
+    return _Stage(_tracer, name, fields)
+
+def laps(prefix, **fields):
+    if _tracer is None:
+        return _NULL
+    return _Laps(_tracer, prefix, fields)
+
+def count(name, n=1, **fields):
+    if _tracer is None:
+        return
+    _tracer.emit({'type': 'counter', 'name': name, 'n': n, **fields})
+
+def summarize(events):
+    """이벤트 list → ({단계: {calls, wall_ms, cpu_ms, max_ms, rows, ...}}, {카운터 이름(+필드): 합계})"""
+    stages = defaultdict(lambda: defaultdict(float))
+    counters = defaultdict(int)
+    for event in events:
+        if event['type'] == 'stage':
+            agg = stages[event['name']]
+            agg['calls'] += 1
+            agg['wall_ms'] += event['wall_ms']
+            agg['cpu_ms'] += event['cpu_ms']
+            agg['max_ms'] = max(agg['max_ms'], event['wall_ms'])
+            for field in SUM_FIELDS:
+                if isinstance(event.get(field), (int, float)):
+                    agg[field] += event[field]
+        else:
+            labels = ','.join(f'{k}={v}' for k, v in event.items() if k not in ('ts', 'pid', 'thread', 'type', 'name', 'n'))
+            counters[f"{event['name']}[{labels}]" if labels else event['name']] += event['n']
+    return stages, counters
+
+def format_summary(events):
+    stages, counters = summarize(events)
+    lines = [f"{'stage':<40}{'calls':>7}{'wall ms':>12}{'cpu ms':>12}{'max ms':>10}{'rows':>12}{'bytes':>14}{'tokens':>10}"]
+    for name, agg in sorted(stages.items(), key=lambda item: -item[1]['wall_ms']):
+        tokens = agg['prompt_tokens'] + agg['output_tokens']
+        lines.append(f"{name:<40}{int(agg['calls']):>7}{agg['wall_ms']:>12.1f}{agg['cpu_ms']:>12.1f}{agg['max_ms']:>10.1f}"
+                     f"{int(agg['rows']):>12}{int(agg['bytes']):>14}{int(tokens):>10}")
+    if counters:
+        lines.append('')
+        lines.append(f"{'counter':<60}{'count':>10}")
+        for name, n in sorted(counters.items()):
+            lines.append(f"{name:<60}{n:>10}")
+    return '\n'.join(lines)
+
+def read_trace(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit('사용법: python -m absolute_grading.instrumentation trace.jsonl')
+    print(format_summary(read_trace(sys.argv[1])))
@@ -0,0 +1,44 @@
+"""
+전체 이력 기준 cut-off/minmax 정확 재산출 (*_auto.py --exact 분기와 calculate_cutoff.py 공용).
+
+- 이력 DataFrame의 컬럼을 IQR 클리핑 → minmax → 정규화(rescore.normalize_columns) → 지표 커널 순서로 배열 단위 계산한다.
+- cut-off는 np.percentile 한 번으로 A~F 백분위(GRADE_PERCENTILES)를 모두 구한다.
+- 행마다 iterrows + 스칼라 minmax_normalize로 계산하던 점수/cut-off와 bit 단위로 같다
+  (benchmarks/bench_recalibration.py로 확인).
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.rescore import minmax_arrays, column_values, normalize_columns
+from absolute_grading.sketch import GRADE_PERCENTILES, df_iqr_bounds
+
+def percentile_cutoffs(scores):
+    """점수 배열 → 등급별 cut-off dict (A~F 백분위, G는 -1e9)"""
+    values = np.percentile(scores, list(GRADE_PERCENTILES.values()))
+    cutoff = {grade: float(v) for grade, v in zip(GRADE_PERCENTILES, values)}
+    cutoff["G"] = -1e9
+    return cutoff
+
+def exact_cutoffs(df, kernel, cols, score_order=None):
+    """
+    DataFrame 전체(클리핑하지 않음)의 minmax로 정규화·채점한 cut-off → (cut-off dict, minmax dict)
+    score_order: kernel 인자 순서 (cols와 다를 때, 예: politeness SCORE_ORDER)
+    """
+    minmax = {col: {"min": float(df[col].min()), "max": float(df[col].max())} for col in cols}
+    order = score_order or cols
+    norm = normalize_columns(column_values(df, order), *minmax_arrays(minmax, order))
+    return percentile_cutoffs(kernel(*norm)), minmax
+
+def recalibrate_exact(df, kernel, cols, score_order=None):
+    """
+    전체 이력 DataFrame으로 IQR 클리핑 → minmax → 점수 → cut-off를 재산출 → (cut-off dict, minmax dict, iqr dict)
+    (recalibrate_from_sketch와 같은 반환 형식, df는 변경하지 않음)
+    """
+    bounds = df_iqr_bounds(df, cols)
+    clipped = df[cols].clip(lower=[bounds[col]['lower'] for col in cols],
+                            upper=[bounds[col]['upper'] for col in cols], axis=1)
+    cutoff, minmax = exact_cutoffs(clipped, kernel, cols, score_order)
+    return cutoff, minmax, bounds
@@ -0,0 +1,53 @@
+"""
+cut-off/minmax 재산출 뒤 배치 점수 갱신 (*_auto.py run()의 정규화/채점 단계).
+
+run()은 sketch 누적을 위해 기존 기준(minmax/iqr)으로 배치를 한 번 정규화·채점한다 (score_batch → BatchScores).
+정규화/채점 단계에서는 이 결과를 재사용한다 (rescore_batch).
+- minmax와 iqr가 그대로면 (재산출이 없었거나 cut-off 백분위만 바뀐 경우) 저장된 점수로 등급만 매긴다.
+- minmax나 iqr가 바뀌면 새 기준으로 클리핑한 값을 numpy로 한 번 정규화하고 커널만 다시 계산한다.
+  정규화 컬럼에 affine 변환(norm * span / span' + (min - min') / span')을 적용하는 방식은 원본 값이 메모리에 있어
+  연산 수가 줄지 않고, 마지막 자리 반올림이 달라 cut-off 경계나 커널 불연속 지점(감정안정성 late == early)의
+  점수/등급을 바꿀 수 있어 쓰지 않는다.
+"""
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+# norm: 컬럼별 연속 정규화 값 ((컬럼 수, 행 수)), scores: 점수, minmax/bounds: 이 점수를 계산한 기준
+# (bounds가 None이면 배치 자체 IQR로 클리핑한 경우)
+BatchScores = namedtuple('BatchScores', ['norm', 'scores', 'minmax', 'bounds'])
+
+def minmax_arrays(minmax, cols):
+    mins = np.array([minmax[col]['min'] for col in cols], dtype=float)
+    maxs = np.array([minmax[col]['max'] for col in cols], dtype=float)
+    return mins, maxs
+
+def column_values(df, cols):
+    # 컬럼별 연속 배열 (컬럼 수, 행 수): 커널 인자와 _norm 컬럼이 strided view가 되지 않도록
+    return np.stack([df[col].to_numpy(dtype=float) for col in cols])
+
+def normalize_columns(values, mins, maxs):
+    # sketch.normalize_rows와 같은 연산 ((x - min) / (max - min), max == min이면 0.5)을 컬럼별 배열에 적용
+    span = maxs - mins
+    out = values - mins[:, None]
+    out /= np.where(span > 0, span, 1.0)[:, None]
+    out[span <= 0] = 0.5
+    return out
+
+def score_batch(eval_df, kernel, minmax, bounds, cols):
+    """클리핑한 배치를 minmax로 정규화·채점하고 재사용할 수 있도록 기준과 함께 묶는다"""
+    norm = normalize_columns(column_values(eval_df, cols), *minmax_arrays(minmax, cols))
+    return BatchScores(norm, kernel(*norm), minmax, bounds)
+
+def rescore_batch(batch, kernel, minmax, bounds, eval_df, cols):
+    """
+    새 기준(minmax, iqr)의 배치 정규화 값/점수 → (norm, scores, 방식)
+    eval_df: 새 iqr로 클리핑한 배치 (기준이 같으면 쓰지 않음)
+    방식: 'reuse'(기준이 같아 점수 그대로) 또는 'renormalize'(새 minmax로 정규화 후 커널 재계산)
+    """
+    if minmax == batch.minmax and bounds == batch.bounds:
+        return batch.norm, batch.scores, 'reuse'
+    norm = normalize_columns(column_values(eval_df, cols), *minmax_arrays(minmax, cols))
+    return norm, kernel(*norm), 'renormalize'
@@ -0,0 +1,158 @@
+"""
+세션별 평가 결과 저장소 (증분 평가용).
+
+batch_grade_all.py --incremental이 이미 채점한 세션을 다시 채점하지 않도록 세션마다
+feature 해시와 지표별 점수, 그 점수를 낸 cut-off 버전을 보관한다.
+
+data/results/results.npz
+    session_id        세션 id (문자열)
+    feature_hash      채점에 쓰는 feature 12개(FEATURE_COLS + suggestions)의 행 해시 (uint64)
+    <지표>.score      지표 점수 (float64)
+    <지표>.version    점수를 계산한 cut-off 버전 번호
+
+- 새 세션(저장소에 없음)과 feature가 바뀐 세션만 지표 모듈 run()으로 채점한다 (minmax 확인/재산출, sketch/이력 누적 포함).
+- 나머지 세션은 저장된 점수를 쓴다. 점수는 minmax/iqr(정규화·클리핑 기준)로만 정해지므로
+  - 저장된 버전과 현재 버전의 minmax/iqr가 같으면 (cut-off만 바뀐 경우 포함) 저장된 점수를 현재 cut-off로 등급만 다시 매기고
+  - 다르면 (재산출로 minmax가 바뀐 경우, 또는 버전 파일이 정리되어 알 수 없는 경우) 현재 snapshot으로 다시 채점한다.
+- 등급은 저장하지 않고 매번 점수에서 현재 cut-off로 매긴다 (grade_codes, 배열 비교 몇 번).
+- 저장은 임시 파일 → os.replace로 교체하므로 중단되어도 이전 저장소가 남는다.
+"""
+import io
+import json
+import hashlib
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.engine import INDICATORS, FEATURE_COLS, RAW_COLS, evaluate_all
+from absolute_grading.grader import grade_codes, INVALID_GRADE
+from absolute_grading.cutoff_registry import CUTOFF_DIR, LEGACY_VERSION, atomic_write, load_version
+
+RESULT_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'results')
+RESULT_PATH = os.path.join(RESULT_DIR, 'results.npz')
+ID_COL = 'session_id'
+HASH_COLS = FEATURE_COLS + RAW_COLS
+
+def feature_hashes(df):
+    """행별 feature 해시 (같은 값이면 같은 해시, schema dtype으로 읽은 값 기준)"""
+    return pd.util.hash_pandas_object(df[HASH_COLS], index=False).to_numpy()
+
+def empty_results():
+    data = {'feature_hash': np.empty(0, dtype=np.uint64)}
+    for spec in INDICATORS:
+        data[f'{spec.name}.score'] = np.empty(0, dtype=float)
+        data[f'{spec.name}.version'] = np.empty(0, dtype=np.int64)
+    return pd.DataFrame(data, index=pd.Index([], dtype=str, name=ID_COL))
+
+def load_results(path=RESULT_PATH):
+    """저장된 결과 DataFrame (index: session_id, 없으면 빈 DataFrame)"""
+    if not os.path.exists(path):
+        return empty_results()
+    with np.load(path, allow_pickle=False) as npz:
+        data = {key: npz[key] for key in npz.files}
+    index = pd.Index(data.pop(ID_COL).astype(str), name=ID_COL)
+    return pd.DataFrame(data, index=index, copy=False)
+
+def save_results(results, path=RESULT_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    buf = io.BytesIO()
+    np.savez(buf, **{ID_COL: results.index.to_numpy(dtype=str)},
+             **{col: results[col].to_numpy() for col in results.columns})
+    atomic_write(path, buf.getvalue())
+
+def basis_of(data):
+    """cut-off json의 점수 계산 기준(minmax, iqr) 해시"""
+    raw = json.dumps({'minmax': data.get('minmax'), 'iqr': data.get('iqr')}, sort_keys=True)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+@lru_cache(maxsize=None)
+def _version_basis(name, version, cutoff_dir):
+    # 버전 파일은 한 번 쓰면 바뀌지 않으므로 (디렉터리, 버전)별로 한 번만 읽음
+    return basis_of(json.loads(load_version(name, version, cutoff_dir)))
+
+def scoring_basis(name, version, cutoff_dir=CUTOFF_DIR):
+    """
+    cutoff_dir에 있는 버전의 점수 계산 기준 해시 (버전 파일이 없으면 None → 다시 채점).
+    LEGACY_VERSION(첫 게시 전 grade_cutoff_<지표>.json)은 직접 고칠 수 있으므로 캐시하지 않는다.
+    """
+    version = int(version)
+    try:
+        if version == LEGACY_VERSION:
+            return basis_of(json.loads(load_version(name, version, cutoff_dir)))
+        return _version_basis(name, version, cutoff_dir)
+    except FileNotFoundError:
+        return None
+
+def lookup(raw_df, hashes, stored):
+    """
+    배치 행별 저장소 위치와 dirty 여부 → (저장소 행 번호 배열(없으면 -1), dirty bool 배열)
+    dirty: 새 세션이거나 feature 해시가 저장된 값과 다른 행
+    """
+    pos = stored.index.get_indexer(raw_df[ID_COL].astype(str).to_numpy())
+    dirty = np.ones(len(raw_df), dtype=bool)
+    known = pos >= 0
+    dirty[known] = stored['feature_hash'].to_numpy()[pos[known]] != hashes[known]
+    return pos, dirty
+
+def assemble_results(raw_df, pos, dirty, stored, results, snapshot):
+    """
+    dirty 행은 run() 결과 점수, 나머지는 저장된 점수(기준이 같을 때) 또는 snapshot으로 다시 채점한 점수를 모아
+    session_id + 지표별 점수/등급 DataFrame과 {지표: 다시 채점한 행 수}를 반환한다.
+    """
+    n = len(raw_df)
+    clean = ~dirty
+    scores = {spec.name: np.empty(n) for spec in INDICATORS}
+    stale_by = {}
+    for spec in INDICATORS:
+        if dirty.any():
+            scores[spec.name][dirty] = results[spec.name][f'{spec.prefix}_score'].to_numpy(dtype=float)
+        versions = np.zeros(n, dtype=np.int64)
+        versions[clean] = stored[f'{spec.name}.version'].to_numpy()[pos[clean]]
+        # 저장된 버전 중 현재 버전과 minmax/iqr가 같은 버전 (버전 종류 수만큼만 비교, snapshot을 읽은 디렉터리 기준)
+        current = basis_of(snapshot.cutoff_json(spec.name))
+        same = [v for v in np.unique(versions[clean])
+                if scoring_basis(spec.name, v, snapshot.cutoff_dir) == current]
+        reusable = clean & np.isin(versions, same)
+        scores[spec.name][reusable] = stored[f'{spec.name}.score'].to_numpy()[pos[reusable]]
+        stale_by[spec.name] = clean & ~reusable
+    stale = np.logical_or.reduce(list(stale_by.values()))
+    if stale.any():
+        rescored = evaluate_all(raw_df[stale], snapshot)
+        for spec in INDICATORS:
+            rows = stale_by[spec.name][stale]
+            scores[spec.name][stale_by[spec.name]] = rescored[f'{spec.prefix}_score'].to_numpy()[rows]
+
+    combined = pd.DataFrame({ID_COL: raw_df[ID_COL].to_numpy()}, index=raw_df.index)
+    for spec in INDICATORS:
+        table = snapshot.table(spec.name)
+        codes = grade_codes(scores[spec.name], table)
+        if table.kind == 'lookup' and (codes == table.categories.index(INVALID_GRADE)).any():
+            raise ValueError("유효하지 않은 점수 발견")
+        combined[f'{spec.prefix}_score'] = scores[spec.name]
+        combined[f'{spec.prefix}_Grade'] = pd.Categorical.from_codes(codes, categories=table.categories)
+    return combined, {name: int(mask.sum()) for name, mask in stale_by.items()}
+
+def needs_update(stored, pos, dirty, snapshot):
+    """새/변경 세션이 있거나 저장된 버전이 현재 버전과 다른 행이 있으면 True (모두 그대로면 저장소를 다시 쓰지 않음)"""
+    if dirty.any():
+        return True
+    return any((stored[f'{spec.name}.version'].to_numpy()[pos] != snapshot.version[spec.name]).any()
+               for spec in INDICATORS)
+
+def update_results(stored, pos, combined, hashes, snapshot):
+    """저장소 + 이번 배치 결과 (같은 session_id는 이번 배치 값으로 교체, 배치 안 중복은 마지막 행)"""
+    batch = pd.DataFrame({'feature_hash': hashes},
+                         index=pd.Index(combined[ID_COL].astype(str).to_numpy(), name=ID_COL))
+    for spec in INDICATORS:
+        batch[f'{spec.name}.score'] = combined[f'{spec.prefix}_score'].to_numpy()
+        batch[f'{spec.name}.version'] = np.int64(snapshot.version[spec.name])
+    batch = batch[~batch.index.duplicated(keep='last')]
+    # lookup()에서 찾은 저장소 행 번호로 교체 대상을 고름 (문자열 index isin보다 빠름)
+    keep = np.ones(len(stored), dtype=bool)
+    keep[pos[pos >= 0]] = False
+    kept = stored[keep]
+    return pd.concat([kept, batch[stored.columns]])
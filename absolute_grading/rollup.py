@@ -0,0 +1,270 @@
+"""
+평가 결과 그룹별 집계 (상담사/상담 유형/결과 라벨별 건수, 평균 점수, 등급 분포).
+
+대시보드가 원본 세션을 다시 읽지 않도록 배치마다 그룹별 부분 집계(건수/점수 합계/등급별 건수)를 저장하고,
+전체 집계는 누적 합계로 유지한다 (다른 배치의 부분 집계는 다시 읽지 않음).
+
+data/rollups/
+    batches/<batch_id>.json   배치별 부분 집계 (같은 배치를 다시 평가하면 덮어씀 → 중복 집계 없이 최신 채점 결과로 교체)
+    rollup.json               전체 집계 (누적 합계, 임시 파일 → os.replace로 교체)
+                              같은 배치를 다시 쓰면 이전 부분 집계를 빼고 새 부분 집계를 더한다.
+                              배치별 부분 집계의 digest를 함께 기록해, 이전 갱신이 부분 집계만 쓰고 중단된 경우
+                              (digest/배치 목록 불일치) 한 번만 batches/ 전체를 다시 더해 복구한다.
+
+- 집계 차원: agent_id(상담사), mid_category, result_label 중 입력에 있는 컬럼.
+  date 컬럼이 있으면 날짜(YYYY-MM-DD)별로 나눠 집계하므로 대시보드에서 기간을 골라 더할 수 있다.
+- 지표별 값: count(행 수), score_sum/score_count(NaN 제외), grades {등급: 건수}. 평균은 score_sum / score_count.
+- 계산: 차원마다 그룹 번호(groupby().ngroup())를 한 번 구하고, 점수 합계와 (그룹, 등급) 건수를 np.bincount로 센다
+  (행 단위 python 루프 없음).
+- batch_id를 주지 않으면 session_id 집합의 해시로 정한다 (같은 세션 집합 = 같은 배치).
+- 갱신 비용은 세션 수와 무관하지만 이번 배치만이 아니라 전체 집계 크기(누적 그룹 수 × 지표 수)에 비례한다:
+  rollup.json 전체를 읽고 다시 쓰며, merge_records가 합친 레코드 전체를 키 순서로 다시 정렬한다.
+
+사용법 (루트에서 실행):
+    python batch_grade_all.py --rollup                  # 평가 후 집계 갱신
+    python -m absolute_grading.rollup [차원] [지표]      # 저장된 전체 집계 출력 (예: mid_category Politeness)
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 프로세스 내 lock만 사용
+    fcntl = None
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.cutoff_registry import atomic_write
+from absolute_grading.instrumentation import laps
+
+ROLLUP_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'rollups')
+ID_COL = 'session_id'
+DIMENSIONS = ['agent_id', 'mid_category', 'result_label']
+DAY_COL = 'date'
+ROLLUP_COLS = DIMENSIONS + [DAY_COL]
+KEY_FIELDS = ['dimension', 'day', 'key', 'indicator']
+SUM_FIELDS = ['count', 'score_sum', 'score_count']
+
+def indicator_prefixes(df):
+    # '<prefix>_score'와 '<prefix>_Grade'가 모두 있는 지표 접두어
+    return [col[:-len('_Grade')] for col in df.columns
+            if col.endswith('_Grade') and f"{col[:-len('_Grade')]}_score" in df.columns]
+
+def day_keys(df):
+    """date 컬럼 → 자정으로 내린 datetime Series (date 컬럼이 없으면 None). 문자열 변환은 그룹 값에만 한다."""
+    if DAY_COL not in df.columns:
+        return None
+    return pd.to_datetime(df[DAY_COL], errors='coerce').dt.normalize()
+
+def aggregate(df, dimensions=None):
+    """
+    점수/등급 컬럼과 차원 컬럼이 함께 있는 DataFrame → 부분 집계 레코드 list.
+    레코드: {dimension, day, key, indicator, count, score_sum, score_count, grades}
+    """
+    trace = laps('rollup', rows=len(df))
+    dimensions = [dim for dim in (dimensions or DIMENSIONS) if dim in df.columns]
+    prefixes = indicator_prefixes(df)
+    days = day_keys(df)
+    records = []
+    for dim in dimensions:
+        keys = [days, df[dim]] if days is not None else [df[dim]]
+        grouper = df.groupby(keys, observed=True, sort=True)
+        codes = grouper.ngroup().to_numpy()
+        groups = grouper.size().index
+        n_groups = len(groups)
+        valid = codes >= 0  # 차원(또는 날짜) 값이 비어 있는 행은 제외
+        for prefix in prefixes:
+            scores = np.asarray(df[f'{prefix}_score'], dtype=float)
+            grades = df[f'{prefix}_Grade'].astype('category')
+            finite = valid & np.isfinite(scores)
+            count = np.bincount(codes[valid], minlength=n_groups)
+            score_sum = np.bincount(codes[finite], weights=scores[finite], minlength=n_groups)
+            score_count = np.bincount(codes[finite], minlength=n_groups)
+            categories = list(grades.cat.categories)
+            grade_codes = grades.cat.codes.to_numpy()
+            graded = valid & (grade_codes >= 0)
+            hist = np.bincount(codes[graded] * len(categories) + grade_codes[graded],
+                               minlength=n_groups * len(categories)).reshape(n_groups, len(categories))
+            for g, group in enumerate(groups):
+                day, key = (group[0].strftime('%Y-%m-%d'), group[1]) if days is not None else (None, group)
+                records.append({
+                    'dimension': dim, 'day': day, 'key': str(key), 'indicator': prefix,
+                    'count': int(count[g]), 'score_sum': float(score_sum[g]), 'score_count': int(score_count[g]),
+                    'grades': {str(c): int(n) for c, n in zip(categories, hist[g]) if n},
+                })
+        trace.lap(dim, groups=n_groups)
+    return records
+
+def merge_records(record_lists):
+    """부분 집계 레코드 list들을 (dimension, day, key, indicator)별로 더함 (건수가 0이 된 레코드/등급은 뺌)"""
+    merged = {}
+    for records in record_lists:
+        for record in records:
+            key = tuple(record[field] for field in KEY_FIELDS)
+            total = merged.get(key)
+            if total is None:
+                merged[key] = {**record, 'grades': dict(record['grades'])}
+                continue
+            for field in SUM_FIELDS:
+                total[field] += record[field]
+            for grade, n in record['grades'].items():
+                total['grades'][grade] = total['grades'].get(grade, 0) + n
+                if not total['grades'][grade]:
+                    del total['grades'][grade]
+    return [merged[key] for key in sorted(merged, key=lambda k: tuple('' if v is None else v for v in k))
+            if merged[key]['count'] or merged[key]['score_count']]
+
+def negate_records(records):
+    """부분 집계를 전체 집계에서 빼기 위한 부호 반전 레코드"""
+    return [{**record, **{field: -record[field] for field in SUM_FIELDS},
+             'grades': {grade: -n for grade, n in record['grades'].items()}} for record in records]
+
+def batch_id_of(df):
+    """session_id 집합(없으면 전체 행 내용)의 해시 → 배치 id (행 순서와 무관)"""
+    source = df[ID_COL].astype(str) if ID_COL in df.columns else df
+    hashes = np.sort(pd.util.hash_pandas_object(source, index=False).to_numpy())
+    return 'sessions-' + hashlib.sha256(hashes.tobytes()).hexdigest()[:16]
+
+def batch_path(batch_id, rollup_dir=ROLLUP_DIR):
+    return os.path.join(rollup_dir, 'batches', f'{batch_id}.json')
+
+def rollup_path(rollup_dir=ROLLUP_DIR):
+    return os.path.join(rollup_dir, 'rollup.json')
+
+_rollup_lock = threading.Lock()
+
+@contextmanager
+def _locked(rollup_dir):
+    # 부분 집계 교체 + 전체 집계 재계산을 프로세스 내 lock + (지원되면) 프로세스 간 파일 잠금으로 직렬화
+    os.makedirs(os.path.join(rollup_dir, 'batches'), exist_ok=True)
+    with _rollup_lock, open(os.path.join(rollup_dir, 'lock'), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def _digest(raw):
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+def _read_partial(path):
+    # 부분 집계 파일 → (dict, digest), 없으면 (None, None)
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return None, None
+    return json.loads(raw), _digest(raw)
+
+def _batch_ids(rollup_dir):
+    # batches/의 배치 id 집합 (파일 이름만 확인, 내용은 읽지 않음)
+    directory = os.path.join(rollup_dir, 'batches')
+    return {f[:-len('.json')] for f in os.listdir(directory) if f.endswith('.json')} if os.path.isdir(directory) else set()
+
+def rebuild_rollup(rollup_dir=ROLLUP_DIR):
+    """
+    batches/의 부분 집계를 모두 더해 rollup.json을 다시 쓴다 → 전체 집계 dict (잠금은 호출하는 쪽에서)
+    update_rollup이 누적 합계가 부분 집계와 맞지 않을 때(처음 갱신, 이전 갱신 중단)만 사용한다.
+    """
+    partials, digests = [], {}
+    for batch_id in sorted(_batch_ids(rollup_dir)):
+        partial, digest = _read_partial(batch_path(batch_id, rollup_dir))
+        partials.append(partial)
+        digests[partial['batch_id']] = digest
+    rollup = {
+        'updated': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'batches': digests,
+        'sessions': sum(partial['sessions'] for partial in partials),
+        'groups': merge_records(partial['groups'] for partial in partials),
+    }
+    atomic_write(rollup_path(rollup_dir), _dump(rollup))
+    return rollup
+
+def update_rollup(df, batch_id=None, dimensions=None, rollup_dir=ROLLUP_DIR):
+    """
+    배치 평가 결과(차원 컬럼 + 점수/등급 컬럼)의 부분 집계를 저장하고 전체 집계를 갱신 → (batch_id, 전체 집계 dict)
+    전체 집계는 이전 부분 집계(같은 batch_id를 다시 쓰는 경우)를 빼고 새 부분 집계를 더해 갱신한다 (다른 배치는 읽지 않음).
+    """
+    batch_id = batch_id or batch_id_of(df)
+    partial = {'batch_id': batch_id, 'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+               'sessions': len(df), 'groups': aggregate(df, dimensions)}
+    raw = _dump(partial)
+    with _locked(rollup_dir):
+        path = batch_path(batch_id, rollup_dir)
+        old, old_digest = _read_partial(path)
+        rollup = load_rollup(rollup_dir)
+        # 누적 합계가 없거나(이전 형식 포함) 부분 집계 목록/내용과 맞지 않으면 한 번 전체를 다시 더한 뒤 갱신
+        if rollup is None or not isinstance(rollup.get('batches'), dict) \
+                or set(rollup['batches']) != _batch_ids(rollup_dir) \
+                or (old is not None and rollup['batches'][batch_id] != old_digest):
+            rollup = rebuild_rollup(rollup_dir)
+        record_lists = [rollup['groups'], partial['groups']]
+        if old is not None:
+            record_lists.insert(1, negate_records(old['groups']))
+            rollup['sessions'] -= old['sessions']
+        # 부분 집계를 먼저 확정한 뒤 누적 합계를 교체 (그 사이에 중단되면 다음 갱신 때 digest 불일치로 복구)
+        atomic_write(path, raw)
+        rollup['groups'] = merge_records(record_lists)
+        rollup['sessions'] += partial['sessions']
+        rollup['batches'][batch_id] = _digest(raw)
+        rollup['updated'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        atomic_write(rollup_path(rollup_dir), _dump(rollup))
+    return batch_id, rollup
+
+def load_rollup(rollup_dir=ROLLUP_DIR):
+    """저장된 전체 집계 dict (없으면 None)"""
+    try:
+        return _load_json(rollup_path(rollup_dir))
+    except FileNotFoundError:
+        return None
+
+def rollup_frame(rollup, dimension=None, indicator=None, days=None):
+    """
+    전체 집계 → 대시보드용 DataFrame (그룹 × 지표 한 행: count, mean_score, 등급별 건수/비율 컬럼).
+    days를 주면 해당 날짜들만 더한다 (날짜 구분 없이 그룹별로 합산).
+    """
+    records = [r for r in rollup['groups']
+               if (dimension is None or r['dimension'] == dimension)
+               and (indicator is None or r['indicator'] == indicator)
+               and (days is None or r['day'] in days)]
+    if days is not None:
+        records = merge_records([[{**r, 'day': None} for r in records]])
+    rows = []
+    for r in records:
+        row = {field: r[field] for field in KEY_FIELDS + ['count']}
+        row['mean_score'] = r['score_sum'] / r['score_count'] if r['score_count'] else np.nan
+        for grade, n in r['grades'].items():
+            row[f'grade_{grade}'] = n
+            row[f'share_{grade}'] = n / r['count']
+        rows.append(row)
+    frame = pd.DataFrame(rows, columns=None if rows else KEY_FIELDS + ['count', 'mean_score'])
+    grade_cols = sorted(col for col in frame.columns if col.startswith('grade_'))
+    frame[grade_cols] = frame[grade_cols].fillna(0).astype(int)
+    share_cols = sorted(col for col in frame.columns if col.startswith('share_'))
+    frame[share_cols] = frame[share_cols].fillna(0.0)
+    return frame[KEY_FIELDS + ['count', 'mean_score'] + grade_cols + share_cols]
+
+if __name__ == "__main__":
+    rollup = load_rollup()
+    if rollup is None:
+        sys.exit('[ERROR] 저장된 집계가 없습니다. python batch_grade_all.py --rollup 으로 먼저 평가하세요.')
+    dimension = sys.argv[1] if len(sys.argv) > 1 else None
+    indicator = sys.argv[2] if len(sys.argv) > 2 else None
+    print(f"[INFO] 배치 {len(rollup['batches'])}개, 세션 {rollup['sessions']}건 (갱신 {rollup['updated']})")
+    frame = rollup_frame(rollup, dimension, indicator)
+    if frame['day'].isna().all():
+        frame = frame.drop(columns=['day'])
+    with pd.option_context('display.max_rows', 200, 'display.width', 200):
+        print(frame)
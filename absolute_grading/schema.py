@@ -0,0 +1,92 @@
+"""
+상담 세션 데이터(data/*.csv) 18개 컬럼의 dtype 정의와 float32 컬럼의 계산용 복원.
+
+- 비율/감정/지연 feature: float32 (값이 소수 1~2자리 십진수라 유효숫자 7자리로 충분)
+- 횟수/플래그 (Profane, interruption_count): float32 (상한이 없는 사용자 입력이라 int8처럼 넘치지 않고, 결측값(NaN)도 그대로 읽음.
+  정수는 2^24까지 정확)
+- 저카디널리티 문자열 (mid_category, result_label): category
+100만 행 기준 float64/int64/object로 읽을 때보다 DataFrame 메모리가 절반 이하로 준다 (benchmarks/bench_schema.py).
+
+점수/cut-off/minmax 계산은 float64로 한다. float32 값을 그냥 float64로 바꾸면 0.1 → 0.10000000149처럼
+원래 십진값과 달라져 cut-off 경계의 동점 세션 등급이 바뀌고 저장된 minmax 비교(check_minmax)가 어긋나므로,
+as_float64/with_float64로 원래 십진값의 float64를 복원해서 계산한다.
+"""
+import numpy as np
+import pandas as pd
+
+# pd.read_csv dtype 인자 / Parquet·Arrow 로드 후 변환용
+SESSION_DTYPES = {
+    'session_id': 'str',
+    'mid_category': 'category',
+    'result_label': 'category',
+    'Profane': 'float32',
+    'honorific_ratio': 'float32',
+    'positive_word_ratio': 'float32',
+    'negative_word_ratio': 'float32',
+    'euphonious_word_ratio': 'float32',
+    'empathy_ratio': 'float32',
+    'apology_ratio': 'float32',
+    'suggestions': 'float32',
+    'customer_sentiment_early': 'float32',
+    'customer_sentiment_late': 'float32',
+    'customer_sentiment_trend': 'float32',
+    'avg_response_latency': 'float32',
+    'interruption_count': 'float32',
+    'silence_ratio': 'float32',
+    'talk_ratio': 'float32',
+}
+
+SESSION_COLUMNS = list(SESSION_DTYPES)
+
+def dtypes_for(cols):
+    # 일부 컬럼만 읽을 때(usecols) 해당 컬럼의 dtype만 추림
+    return {col: SESSION_DTYPES[col] for col in cols if col in SESSION_DTYPES}
+
+def apply_schema(df):
+    """선언된 dtype과 다른 세션 컬럼만 변환 (Parquet/Arrow처럼 파일의 dtype을 그대로 읽는 경우)"""
+    changed = {col: dtype for col, dtype in dtypes_for(df.columns).items() if df[col].dtype != dtype}
+    return df.astype(changed) if changed else df
+
+def restore_float64(values):
+    """float32 값 → 유효숫자 7자리로 반올림한 float64 (float32 변환 전 십진값 복원)"""
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values) & (values != 0)
+    exp = np.zeros_like(values)
+    exp[finite] = np.floor(np.log10(np.abs(values[finite])))
+    digits = 6 - exp
+    # 10의 음수 거듭제곱은 정확히 표현되지 않으므로 자릿수 부호에 따라 곱/나눗셈을 나눔
+    scale = 10.0 ** np.abs(digits)
+    return np.where(digits >= 0, np.round(values * scale) / scale, np.round(values / scale) * scale)
+
+def as_float64(values):
+    """
+    계산용 float64 배열. float32면 원래 십진값으로 복원하고, 그 외 dtype은 그대로 float64로 변환한다.
+    빠른 경로: 컬럼 최대 절댓값의 유효숫자 7자리 자릿수로 한 번에 반올림한 값이 모두 같은 float32로 돌아가면 그대로 사용
+    (컬럼 안의 작은 값도 원래 자릿수가 그 이하인 경우, 예: 0.05와 0.45). 아니면 원소별 restore_float64.
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy()
+    if values.dtype != np.float32:
+        return np.asarray(values, dtype=np.float64)
+    wide = values.astype(np.float64)
+    finite = np.isfinite(wide)
+    amax = np.abs(wide, where=finite, out=np.zeros_like(wide)).max(initial=0.0)
+    if amax == 0:
+        return wide
+    digits = 6 - int(np.floor(np.log10(amax)))
+    if digits < 0:
+        return restore_float64(values)
+    scale = 10.0 ** digits
+    out = np.round(wide * scale)
+    out /= scale
+    out[~finite] = wide[~finite]
+    if (out.astype(np.float32) == values)[finite].all():
+        return out
+    return restore_float64(values)
+
+def with_float64(df, cols):
+    """cols 중 float32 컬럼을 as_float64로 복원한 얕은 복사본 (float32 컬럼이 없으면 df 그대로)"""
+    narrow = [col for col in cols if col in df.columns and df[col].dtype == np.float32]
+    if not narrow:
+        return df
+    return df.assign(**{col: as_float64(df[col]) for col in narrow})
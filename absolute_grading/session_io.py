@@ -0,0 +1,105 @@
+"""
+세션 데이터/평가 결과 입출력 (CSV, Parquet, Arrow IPC).
+
+- 확장자로 형식을 고른다: .parquet/.pq → Parquet, .arrow/.feather/.ipc → Arrow IPC(Feather v2), 그 외 → CSV
+- columns를 주면 해당 컬럼만 읽는다 (Parquet/Arrow는 컬럼 단위로 저장되어 나머지 컬럼은 읽지도 않음).
+- 결과를 Parquet/Arrow로 쓰면 등급 컬럼(pd.Categorical)은 dictionary 타입으로 저장되어 다시 읽어도 categorical이다.
+- 세션 컬럼은 schema.SESSION_DTYPES의 compact dtype(float32 feature/횟수, category 문자열)으로 읽는다.
+- Parquet/Arrow는 pyarrow가 필요하다 (CSV만 쓰면 설치하지 않아도 됨).
+"""
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.schema import dtypes_for, apply_schema
+from absolute_grading.instrumentation import enabled, stage
+
+PARQUET_EXTS = ('.parquet', '.pq')
+ARROW_EXTS = ('.arrow', '.feather', '.ipc')
+
+def file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in PARQUET_EXTS:
+        return 'parquet'
+    if ext in ARROW_EXTS:
+        return 'arrow'
+    return 'csv'
+
+def require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("Parquet/Arrow 입출력에는 pyarrow가 필요합니다 (pip install pyarrow)")
+
+def csv_read_args(path, columns=None):
+    """헤더 공백을 허용하면서 필요한 컬럼만 선언된 dtype으로 읽기 위한 pd.read_csv 인자"""
+    header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns
+    raw_names = {name.strip(): name for name in header}
+    if columns is None:
+        columns = list(raw_names)
+    usecols = [raw_names[col] for col in columns if col in raw_names]
+    dtype = {raw_names[col]: dt for col, dt in dtypes_for(columns).items() if col in raw_names}
+    return {'usecols': usecols, 'dtype': dtype, 'encoding': 'utf-8-sig'}
+
+def bytes_read(path, fmt, columns):
+    # trace용 읽은 바이트 수: Parquet은 읽은 컬럼 chunk의 압축 크기 합, 그 외는 파일 크기
+    if fmt != 'parquet' or columns is None:
+        return os.path.getsize(path)
+    import pyarrow.parquet as pq
+    metadata = pq.read_metadata(path)
+    wanted = {col.strip() for col in columns}
+    return sum(rg.column(i).total_compressed_size
+               for rg in (metadata.row_group(k) for k in range(metadata.num_row_groups))
+               for i in range(rg.num_columns) if rg.column(i).path_in_schema.strip() in wanted)
+
+def read_sessions(path, columns=None):
+    """
+    세션 파일을 DataFrame으로 읽는다 (컬럼명 앞뒤 공백 제거).
+    columns: 읽을 컬럼 목록 (없으면 전체). 파일에 없는 컬럼은 건너뛴다.
+    """
+    fmt = file_format(path)
+    with stage('read_sessions', format=fmt, path=os.path.basename(path)) as s:
+        df = _read_sessions(path, fmt, columns)
+        if enabled():
+            s.add(rows=len(df), columns=len(df.columns), bytes=bytes_read(path, fmt, columns))
+    return df
+
+def _read_sessions(path, fmt, columns):
+    if fmt == 'csv':
+        df = pd.read_csv(path, **csv_read_args(path, columns))
+    else:
+        require_pyarrow()
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        import pyarrow.feather as feather
+        if fmt == 'parquet':
+            names = pq.read_schema(path).names
+        else:
+            names = pa.ipc.open_file(pa.memory_map(path)).schema.names
+        if columns is not None:
+            raw_names = {name.strip(): name for name in names}
+            columns = [raw_names[col] for col in columns if col in raw_names]
+        if fmt == 'parquet':
+            table = pq.read_table(path, columns=columns)
+        else:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        # 변환하면서 Arrow 버퍼를 바로 해제해 최대 메모리를 줄임 (컬럼별 블록 유지, table은 이후 사용 불가)
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
+    df.columns = df.columns.str.strip()
+    # Parquet/Arrow는 파일에 저장된 dtype으로 읽히므로 선언된 dtype으로 맞춤 (CSV는 파싱 시 적용)
+    return df if fmt == 'csv' else apply_schema(df)
+
+def write_results(df, path, index=False):
+    """DataFrame을 확장자에 맞는 형식으로 저장 (Parquet/Arrow는 categorical 등급 컬럼을 그대로 보존)"""
+    fmt = file_format(path)
+    if fmt == 'csv':
+        df.to_csv(path, index=index)
+        return
+    require_pyarrow()
+    if fmt == 'parquet':
+        df.to_parquet(path, index=index)
+    else:
+        df.reset_index(drop=not index).to_feather(path)
@@ -0,0 +1,259 @@
+"""
+cut-off 재산출용 병합 가능한 quantile sketch (KLL 계열 compactor).
+
+지표별로 feature row(정규화 전 원본 값)를 가중치와 함께 보관하는 sketch.
+- level h의 항목은 가중치 2^h를 가지며, level이 k개를 넘으면 점수(key) 순으로 정렬한 뒤
+  한 칸씩 건너 절반만 다음 level로 올린다 (나머지는 버림).
+- 보관 항목 수는 O(k log(n/k))로 유지되고, 임의 분위수의 rank 오차는 O(n log(n/k) / k).
+  level h에서의 compaction 한 번은 rank 오차를 최대 2^h 늘리므로, 누적 상한(rank_error_bound)을 함께 기록한다.
+- 두 sketch는 같은 level끼리 이어 붙인 뒤 compaction 하면 병합된다.
+- feature row를 그대로 보관하므로 minmax가 바뀌어도 보관 항목만 다시 채점하면
+  새 기준의 점수 분포(cut-off)를 O(sketch 크기)로 구할 수 있다.
+- 컬럼별 최솟값/최댓값은 sketch와 별도로 정확하게 유지한다.
+"""
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.session_io import read_sessions
+from absolute_grading.schema import with_float64
+from absolute_grading.cutoff_registry import atomic_write
+
+CUTOFF_DIR = os.path.join(os.path.dirname(__file__), '..', 'cutoff')
+DEFAULT_K = 1024
+# cut-off 등급별 백분위 (A=90 ... F=40)
+GRADE_PERCENTILES = {"A": 90, "B": 80, "C": 70, "D": 60, "E": 50, "F": 40}
+
+def sketch_path(name, cutoff_dir=CUTOFF_DIR):
+    return os.path.join(cutoff_dir, f'sketch_{name}.json')
+
+def weighted_percentile(values, weights, qs):
+    """
+    가중 백분위. 가중치 w인 항목을 w번 반복한 배열에 대한 np.percentile(linear)과 같은 값.
+    (가중치가 모두 1이면 np.percentile과 동일)
+    """
+    values = np.asarray(values, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    order = np.argsort(values, kind='stable')
+    values, cum = values[order], np.cumsum(weights[order])
+    pos = np.asarray(qs, dtype=float) / 100 * (cum[-1] - 1)
+    lo = np.floor(pos)
+    frac = pos - lo
+    i_lo = np.minimum(np.searchsorted(cum, lo, side='right'), len(values) - 1)
+    i_hi = np.minimum(np.searchsorted(cum, lo + 1, side='right'), len(values) - 1)
+    # np.percentile(linear)과 같은 보간식 (t >= 0.5이면 위쪽 값 기준으로 계산)
+    a, b = values[i_lo], values[i_hi]
+    return np.where(frac >= 0.5, b - (b - a) * (1 - frac), a + (b - a) * frac)
+
+class RowSketch:
+    def __init__(self, cols, k=DEFAULT_K):
+        self.cols = list(cols)
+        self.k = k
+        self.n = 0
+        self.rows = []     # level별 (m, len(cols)) feature 배열
+        self.keys = []     # level별 (m,) 정렬 기준 점수
+        self.offsets = []  # level별 다음 compaction에서 남길 위치(0/1, 번갈아 사용)
+        self.rank_error_bound = 0.0  # 누적 rank 오차 상한 (행 수 단위)
+        self.col_min = np.full(len(self.cols), np.inf)
+        self.col_max = np.full(len(self.cols), -np.inf)
+
+    def _ensure_level(self, h):
+        while len(self.rows) <= h:
+            self.rows.append(np.empty((0, len(self.cols))))
+            self.keys.append(np.empty(0))
+            self.offsets.append(0)
+
+    def _append(self, h, rows, keys):
+        self._ensure_level(h)
+        self.rows[h] = np.concatenate([self.rows[h], rows])
+        self.keys[h] = np.concatenate([self.keys[h], keys])
+
+    def _compact(self):
+        h = 0
+        while h < len(self.rows):
+            keys = self.keys[h]
+            if len(keys) > self.k:
+                order = np.argsort(keys, kind='stable')
+                rows, keys = self.rows[h][order], keys[order]
+                # 홀수 개면 가장 큰 항목 하나는 현재 level에 남김
+                keep = len(keys) % 2
+                offset = self.offsets[h]
+                self.offsets[h] ^= 1
+                promoted_rows = rows[:len(keys) - keep][offset::2]
+                promoted_keys = keys[:len(keys) - keep][offset::2]
+                self.rows[h], self.keys[h] = rows[len(keys) - keep:], keys[len(keys) - keep:]
+                self._append(h + 1, promoted_rows, promoted_keys)
+                self.rank_error_bound += 2.0 ** h
+            h += 1
+
+    def update(self, rows, keys):
+        """feature row 배열과 각 row의 정렬 기준 점수(key)를 추가 (NaN이 있는 row는 제외)"""
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(self.cols))
+        keys = np.asarray(keys, dtype=float).reshape(-1)
+        valid = ~(np.isnan(rows).any(axis=1) | np.isnan(keys))
+        rows, keys = rows[valid], keys[valid]
+        if len(keys) == 0:
+            return self
+        self.n += len(keys)
+        self.col_min = np.minimum(self.col_min, rows.min(axis=0))
+        self.col_max = np.maximum(self.col_max, rows.max(axis=0))
+        self._append(0, rows, keys)
+        self._compact()
+        return self
+
+    def merge(self, other):
+        if other.cols != self.cols:
+            raise ValueError(f"컬럼이 다른 sketch는 병합할 수 없습니다: {self.cols} / {other.cols}")
+        for h in range(len(other.rows)):
+            self._append(h, other.rows[h], other.keys[h])
+        self.n += other.n
+        self.rank_error_bound += other.rank_error_bound
+        self.col_min = np.minimum(self.col_min, other.col_min)
+        self.col_max = np.maximum(self.col_max, other.col_max)
+        self._compact()
+        return self
+
+    def items(self):
+        """보관 중인 (rows, keys, weights) 전체"""
+        if not self.rows:
+            return np.empty((0, len(self.cols))), np.empty(0), np.empty(0)
+        weights = np.concatenate([np.full(len(k), 2.0 ** h) for h, k in enumerate(self.keys)])
+        return np.concatenate(self.rows), np.concatenate(self.keys), weights
+
+    def rekey(self, keys):
+        # items() 순서의 새 key 배열로 교체 (minmax 변경 후 재채점 결과 반영)
+        start = 0
+        for h in range(len(self.keys)):
+            end = start + len(self.keys[h])
+            self.keys[h] = np.asarray(keys[start:end], dtype=float)
+            start = end
+
+    def size(self):
+        return sum(len(k) for k in self.keys)
+
+    def epsilon(self):
+        # 정규화된 rank 오차 상한 (0.01이면 백분위 ±1%p 이내)
+        return self.rank_error_bound / self.n if self.n else 0.0
+
+    def to_dict(self):
+        return {
+            'cols': self.cols,
+            'k': self.k,
+            'n': self.n,
+            'col_min': self.col_min.tolist(),
+            'col_max': self.col_max.tolist(),
+            'offsets': self.offsets,
+            'rank_error_bound': self.rank_error_bound,
+            'levels': [{'rows': r.tolist(), 'keys': k.tolist()} for r, k in zip(self.rows, self.keys)],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data['cols'], data['k'])
+        sketch.n = data['n']
+        sketch.col_min = np.asarray(data['col_min'], dtype=float)
+        sketch.col_max = np.asarray(data['col_max'], dtype=float)
+        sketch.offsets = list(data['offsets'])
+        sketch.rank_error_bound = data.get('rank_error_bound', 0.0)
+        sketch.rows = [np.asarray(level['rows'], dtype=float).reshape(-1, len(sketch.cols)) for level in data['levels']]
+        sketch.keys = [np.asarray(level['keys'], dtype=float) for level in data['levels']]
+        return sketch
+
+def load_sketch(path):
+    with open(path) as f:
+        return RowSketch.from_dict(json.load(f))
+
+def save_sketch(sketch, path):
+    # 임시 파일 → fsync → os.replace (도중에 중단되어도 이전 sketch 전체가 남음)
+    atomic_write(path, json.dumps(sketch.to_dict()).encode('utf-8'))
+
+def fold_batch(sketch, rows, keys, added):
+    """
+    배치를 sketch에 누적 → 새로 누적해 저장이 필요한지 여부.
+    added: append_batch가 반환한 이력 저장소 추가 행 mask (이미 저장된 세션은 다시 누적하지 않음).
+    None(session_id가 없어 저장소에 넣지 않은 배치)이면 이번 재산출에만 쓰도록 누적하되 저장하지 않는다.
+    """
+    if added is None:
+        sketch.update(rows, keys)
+        return False
+    if not added.any():
+        return False
+    sketch.update(np.asarray(rows)[added], np.asarray(keys)[added])
+    return True
+
+def normalize_rows(rows, mins, maxs):
+    # minmax_normalize와 동일 (컬럼별 max > min이면 (x - min) / (max - min), 아니면 0.5)
+    span = maxs - mins
+    safe = np.where(span > 0, span, 1.0)
+    return np.where(span > 0, (rows - mins) / safe, 0.5)
+
+def score_rows(rows, kernel, minmax, cols):
+    # feature row 배열을 minmax로 정규화한 뒤 지표 커널로 채점
+    mins = np.array([minmax[col]['min'] for col in cols], dtype=float)
+    maxs = np.array([minmax[col]['max'] for col in cols], dtype=float)
+    norm = normalize_rows(rows, mins, maxs)
+    return kernel(*norm.T)
+
+def build_sketch(rows, kernel, minmax, cols, k=DEFAULT_K):
+    """원본 feature row 배열로 sketch 생성 (정렬 기준 key는 minmax 기준 점수)"""
+    rows = np.asarray(rows, dtype=float)
+    return RowSketch(cols, k).update(rows, score_rows(rows, kernel, minmax, cols))
+
+def iqr_bounds(cols, q1, q3):
+    # 컬럼별 사분위 → cut-off json 'iqr' 항목 형식 (lower/upper = q1 - 1.5 IQR / q3 + 1.5 IQR)
+    bounds = {}
+    for col, a, b in zip(cols, q1, q3):
+        iqr = b - a
+        bounds[col] = {"q1": float(a), "q3": float(b), "lower": float(a - 1.5 * iqr), "upper": float(b + 1.5 * iqr)}
+    return bounds
+
+def df_iqr_bounds(df, cols):
+    """DataFrame 컬럼별 사분위(pandas quantile)로 구한 IQR 클리핑 기준"""
+    return iqr_bounds(cols, [df[col].quantile(0.25) for col in cols], [df[col].quantile(0.75) for col in cols])
+
+def sketch_iqr_bounds(sketch):
+    """sketch 보관 항목의 가중 사분위로 구한 이력 전체의 IQR 클리핑 기준"""
+    rows, _, weights = sketch.items()
+    q1, q3 = np.array([weighted_percentile(rows[:, j], weights, [25, 75]) for j in range(len(sketch.cols))]).T
+    return iqr_bounds(sketch.cols, q1, q3)
+
+def recalibrate_from_sketch(sketch, kernel):
+    """
+    sketch에 누적된 이력으로 IQR 클리핑 → minmax → 점수 → cut-off를 재산출.
+    전체 이력을 concat 해서 np.percentile 하던 방식과 같은 절차를 보관 항목(가중치 포함)에 대해 수행한다.
+    반환: (cut-off dict, minmax dict, iqr dict). sketch의 key는 새 minmax 기준 점수로 갱신된다.
+
+    rank 오차 상한(epsilon)은 compaction 시점의 key 순서 기준이므로, 재산출로 minmax가 크게 바뀌어
+    점수 순서가 달라진 구간에서는 상한을 넘을 수 있다 (benchmarks/bench_sketch.py로 확인).
+    """
+    rows, _, weights = sketch.items()
+    bounds = sketch_iqr_bounds(sketch)
+    lower = np.array([bounds[col]['lower'] for col in sketch.cols])
+    upper = np.array([bounds[col]['upper'] for col in sketch.cols])
+    clipped = np.clip(rows, lower, upper)
+    # 클리핑은 단조 변환이므로 클리핑된 이력의 min/max = 원본 min/max를 클리핑한 값 (정확)
+    mins = np.clip(sketch.col_min, lower, upper)
+    maxs = np.clip(sketch.col_max, lower, upper)
+    scores = kernel(*normalize_rows(clipped, mins, maxs).T)
+    values = weighted_percentile(scores, weights, list(GRADE_PERCENTILES.values()))
+    cutoff = {grade: float(v) for grade, v in zip(GRADE_PERCENTILES, values)}
+    cutoff["G"] = -1e9
+    minmax = {col: {"min": float(mins[j]), "max": float(maxs[j])} for j, col in enumerate(sketch.cols)}
+    sketch.rekey(scores)
+    return cutoff, minmax, bounds
+
+def load_history_sketch(name, cols, kernel, minmax, bootstrap_path):
+    """
+    지표 이력 sketch 로드. 저장된 sketch가 없으면 bootstrap_path(기준선 데이터)로 새로 만들어 저장한다.
+    """
+    path = sketch_path(name)
+    if os.path.exists(path):
+        return load_sketch(path)
+    df = with_float64(read_sessions(bootstrap_path, cols), cols)
+    sketch = build_sketch(df[cols].to_numpy(dtype=float), kernel, minmax, cols)
+    # 배치를 누적하지 않는 실행(중복/session_id 없음)도 다음에 다시 만들지 않도록 바로 저장
+    save_sketch(sketch, path)
+    return sketch
@@ -0,0 +1,145 @@
+"""
+대용량 세션 파일 스트리밍 평가.
+
+입력 파일(new_data.csv 형식의 CSV, 또는 같은 컬럼의 Parquet/Arrow IPC)을 고정 크기 chunk로 읽어
+5개 지표를 evaluate_all로 채점하고, 결과를 chunk 단위로 출력 파일에 이어 쓴다.
+파일 크기와 무관하게 메모리에는 chunk 하나만 올라간다.
+
+- 채점에 필요한 컬럼(session_id + 11개 feature + suggestions)만 읽는다.
+- 출력 확장자가 .parquet/.arrow이면 등급 컬럼을 dictionary(categorical) 타입으로 저장한다.
+- 배치 전체를 하나의 cut-off snapshot으로 채점한다 (도중에 cut-off 파일이 갱신되어도 동일 기준).
+- IQR 클리핑은 cut-off json에 저장된 기준(iqr)으로 적용되므로 chunk 크기와 무관하게 같은 결과가 나온다
+  (iqr이 없는 cut-off 파일이면 evaluate_all과 마찬가지로 chunk 단위 IQR로 클리핑).
+
+사용법 (루트에서 실행):
+    python absolute_grading/streaming.py 입력.csv 출력.csv [--chunksize 100000]
+    python absolute_grading/streaming.py 입력.parquet 출력.parquet
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from absolute_grading.engine import evaluate_all, FEATURE_COLS, RAW_COLS
+from absolute_grading.cutoff_registry import current_snapshot
+from absolute_grading.session_io import file_format, require_pyarrow, csv_read_args
+from absolute_grading.schema import apply_schema
+
+DEFAULT_CHUNKSIZE = 100_000
+ID_COL = 'session_id'
+
+def iter_session_chunks(path, chunksize=DEFAULT_CHUNKSIZE, cols=None):
+    """세션 파일을 chunk 단위로 읽는 iterator (필요 컬럼만, 선언된 dtype으로: CSV는 파싱 시, Parquet/Arrow는 변환 후)"""
+    if cols is None:
+        cols = [ID_COL] + FEATURE_COLS + RAW_COLS
+    fmt = file_format(path)
+    if fmt == 'csv':
+        reader = pd.read_csv(path, chunksize=chunksize, **csv_read_args(path, cols))
+    else:
+        reader = iter_arrow_chunks(path, chunksize, cols, fmt)
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.strip()
+        yield chunk if fmt == 'csv' else apply_schema(chunk)
+
+def iter_arrow_chunks(path, chunksize, cols, fmt):
+    # Parquet은 row group, Arrow IPC는 record batch 단위로 필요한 컬럼만 읽어 chunksize행씩 변환
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    if fmt == 'parquet':
+        parquet_file = pq.ParquetFile(path)
+        raw_names = {name.strip(): name for name in parquet_file.schema_arrow.names}
+        columns = [raw_names[col] for col in cols if col in raw_names]
+        batches = parquet_file.iter_batches(batch_size=chunksize, columns=columns)
+    else:
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        raw_names = {name.strip(): name for name in reader.schema.names}
+        columns = [raw_names[col] for col in cols if col in raw_names]
+        batches = (reader.get_batch(i).select(columns) for i in range(reader.num_record_batches))
+    pending, rows = [], 0
+    for batch in batches:
+        pending.append(batch)
+        rows += batch.num_rows
+        if rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            for start in range(0, rows - rows % chunksize, chunksize):
+                yield table.slice(start, chunksize).to_pandas()
+            rest = table.slice(rows - rows % chunksize)
+            pending, rows = rest.to_batches(), rest.num_rows
+    if rows:
+        yield pa.Table.from_batches(pending).to_pandas()
+
+class ResultWriter:
+    """채점 결과 chunk를 출력 형식(CSV/Parquet/Arrow IPC)에 맞게 이어 쓴다"""
+    def __init__(self, path):
+        self.path = path
+        self.fmt = file_format(path)
+        self._writer = None
+        self._schema = None
+        if self.fmt == 'csv':
+            self._out = open(path, 'w', newline='', encoding='utf-8')
+        else:
+            require_pyarrow()
+
+    def write(self, df):
+        if self.fmt == 'csv':
+            df.to_csv(self._out, header=self._writer is None, index=False)
+            self._writer = True
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self._schema is None:
+            self._schema = pa.Schema.from_pandas(df, preserve_index=False)
+            if self.fmt == 'parquet':
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa.ipc.new_file(self.path, self._schema)
+        # chunk마다 categorical의 카테고리 구성이 달라도 첫 chunk의 스키마로 맞춘다
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self.fmt == 'csv':
+            self._out.close()
+        elif self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def evaluate_stream(input_path, output_path, chunksize=DEFAULT_CHUNKSIZE, snapshot=None):
+    """
+    input_path를 chunk 단위로 채점해 output_path에 이어 쓴다 (형식은 확장자로 결정).
+    반환값: {'rows': 처리 행 수, 'chunks': chunk 수, 'seconds': 소요 시간, 'version': cut-off 버전}
+    """
+    if snapshot is None:
+        snapshot = current_snapshot()
+    rows = chunks = 0
+    t0 = time.perf_counter()
+    with ResultWriter(output_path) as out:
+        for chunk in iter_session_chunks(input_path, chunksize):
+            result = evaluate_all(chunk, snapshot)
+            if ID_COL in chunk.columns:
+                result.insert(0, ID_COL, chunk[ID_COL])
+            out.write(result)
+            rows += len(result)
+            chunks += 1
+    return {'rows': rows, 'chunks': chunks, 'seconds': time.perf_counter() - t0, 'version': snapshot.version}
+
+def main():
+    parser = argparse.ArgumentParser(description='세션 파일 스트리밍 평가 (5개 지표 점수/등급)')
+    parser.add_argument('input', help='평가할 세션 파일 경로 (new_data.csv 형식의 csv/parquet/arrow)')
+    parser.add_argument('output', help='점수/등급 결과 경로 (.csv/.parquet/.arrow)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='chunk당 행 수')
+    args = parser.parse_args()
+    summary = evaluate_stream(args.input, args.output, args.chunksize)
+    print(f"[INFO] {summary['rows']}행 / {summary['chunks']}개 chunk 평가 완료 ({summary['seconds']:.1f}s) → {args.output}")
+
+if __name__ == "__main__":
+    main()
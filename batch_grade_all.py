@@ -1,17 +1,181 @@
+"""
+5개 지표 일괄 평가 (단일 프로세스).
+
+입력 파일(csv/parquet/arrow)에서 5개 지표에 필요한 컬럼만 한 번 읽고, 5개 지표 모듈의 run()을 스레드 풀에서 동시에 실행한다.
+(지표마다 파이썬 인터프리터를 새로 띄우고 pandas import/CSV 파싱을 반복하던 os.system 방식 대체)
+각 지표는 자기 cut-off/sketch 파일만 갱신하므로 서로 간섭하지 않는다.
+
+사용법 (루트에서 실행):
+    python batch_grade_all.py [--data 입력.csv] [--exact] [--workers 5] [--json] [--output 결과.parquet] [--trace trace.jsonl]
+                              [--rollup] [--rollup-batch 배치id] [--incremental]
+종료 코드: 모든 지표 성공 시 0, 하나라도 실패하면 1 (--json이면 지표별 상태를 JSON으로 출력)
+"""
+import argparse
+import json
 import os
 import sys
+import time
+import traceback
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from absolute_grading.engine import FEATURE_COLS, RAW_COLS
+from absolute_grading.session_io import read_sessions, write_results
+from absolute_grading.instrumentation import setup_trace, stage
+from absolute_grading.rollup import ROLLUP_COLS, update_rollup
+from absolute_grading.result_store import (RESULT_PATH, load_results, save_results, feature_hashes, lookup,
+                                           assemble_results, needs_update, update_results)
+from absolute_grading.cutoff_registry import current_snapshot
+from absolute_grading import grade_politeness_auto
+from absolute_grading import grade_empathy_auto
+from absolute_grading import grade_emotional_stability_auto
+from absolute_grading import grade_stability_auto
+from absolute_grading import grade_problem_solving
 
-# 실행할 평가 파일 목록 (루트에서 실행, 하위 폴더 경로 포함)
-scripts = [
-    'absolute_grading/grade_politeness_auto.py',
-    'absolute_grading/grade_empathy_auto.py',
-    'absolute_grading/grade_emotional_stability_auto.py',
-    'absolute_grading/grade_stability_auto.py',
-    'absolute_grading/grade_problem_solving.py',
+DATA_PATH = os.path.join(os.path.dirname(__file__), 'data', 'new_data.csv')
+DUMMY_PATH = os.path.join(os.path.dirname(__file__), 'data', 'dummy_data.csv')
+
+# (지표 이름, 모듈, 출력 컬럼) - 기존 실행 순서 유지
+INDICATORS = [
+    ('politeness', grade_politeness_auto, ['Politeness_score', 'Politeness_Grade']),
+    ('empathy', grade_empathy_auto, ['Empathy_score', 'Empathy_Grade']),
+    ('emotional_stability', grade_emotional_stability_auto, ['EmotionalStability_score', 'EmotionalStability_Grade']),
+    ('stability', grade_stability_auto, ['Stability_score', 'Stability_Grade']),
+    ('problem_solving', grade_problem_solving, ['suggestions', 'ProblemSolving_Grade']),
 ]
+ID_COL = 'session_id'
+INPUT_COLS = [ID_COL] + FEATURE_COLS + RAW_COLS
+# 결과 컬럼 순서 (INDICATORS 순서의 지표별 점수/등급, 전체/증분 평가 모두 이 순서로 저장)
+RESULT_COLS = [ID_COL] + [col for _, _, out_cols in INDICATORS
+                          for col in (f"{out_cols[1][:-len('_Grade')]}_score", out_cols[1])]
+
+def run_indicator(name, module, raw_df, exact=False):
+    """지표 하나 실행 → (상태 dict, 결과 DataFrame 또는 None). 예외는 상태의 error/traceback으로 남긴다."""
+    logs = []
+    t0 = time.perf_counter()
+    try:
+        with stage(f'{name}.run', rows=len(raw_df)):
+            result = module.run(raw_df, exact, log=logs.append)
+        status = {'indicator': name, 'status': 'ok', 'rows': len(result), 'error': None}
+    except Exception as e:
+        result = None
+        status = {'indicator': name, 'status': 'error', 'rows': 0,
+                  'error': f'{type(e).__name__}: {e}', 'traceback': traceback.format_exc()}
+    status['seconds'] = time.perf_counter() - t0
+    status['logs'] = logs
+    return status, result
+
+def run_all(raw_df, exact=False, workers=len(INDICATORS)):
+    """5개 지표를 동시에 실행 → (INDICATORS 순서의 상태 list, {지표 이름: 결과 DataFrame})"""
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(run_indicator, name, module, raw_df, exact) for name, module, _ in INDICATORS]
+        outcomes = [future.result() for future in futures]
+    return [status for status, _ in outcomes], {status['indicator']: result for status, result in outcomes}
+
+def combine_results(raw_df, results):
+    """지표별 결과 → session_id + 지표별 점수/등급 DataFrame (등급은 categorical)"""
+    combined = pd.DataFrame(index=raw_df.index)
+    if ID_COL in raw_df.columns:
+        combined[ID_COL] = raw_df[ID_COL]
+    for name, _, out_cols in INDICATORS:
+        prefix = out_cols[1][:-len('_Grade')]
+        combined[f'{prefix}_score'] = results[name][f'{prefix}_score']
+        combined[f'{prefix}_Grade'] = results[name][f'{prefix}_Grade'].astype('category')
+    return combined
+
+def run_incremental(raw_df, exact=False, workers=len(INDICATORS), store_path=RESULT_PATH):
+    """
+    세션별 결과 저장소(data/results)를 쓰는 증분 평가 → (상태 list, {지표: 새/변경 세션 결과}, 전체 결과 DataFrame, 건수 dict)
+    새 세션과 feature가 바뀐 세션만 run()으로 채점하고, 나머지는 저장된 점수를 현재 cut-off로 등급만 다시 매긴다
+    (minmax/iqr가 바뀐 지표만 현재 snapshot으로 다시 채점). 지표가 하나라도 실패하면 저장소를 갱신하지 않고 결과는 None.
+    """
+    stored = load_results(store_path)
+    hashes = feature_hashes(raw_df)
+    pos, dirty = lookup(raw_df, hashes, stored)
+    stats = {'new': int((pos < 0).sum()), 'changed': int((dirty & (pos >= 0)).sum()), 'reused': int((~dirty).sum())}
+    statuses, results = [], {}
+    if dirty.any():
+        statuses, results = run_all(raw_df[dirty], exact, workers)
+        if any(status['status'] != 'ok' for status in statuses):
+            return statuses, results, None, stats
+    # run()의 재산출까지 반영된 snapshot 하나로 저장된 점수의 등급을 매기고 버전을 기록
+    snapshot = current_snapshot()
+    with stage('incremental.assemble', rows=len(raw_df), dirty=int(dirty.sum())):
+        combined, stats['rescored'] = assemble_results(raw_df, pos, dirty, stored, results, snapshot)
+    # result_store는 engine.INDICATORS 순서로 모으므로 전체 평가(combine_results)와 같은 컬럼 순서로 맞춤
+    combined = combined[RESULT_COLS]
+    if needs_update(stored, pos, dirty, snapshot):
+        with stage('incremental.save', rows=len(stored)):
+            save_results(update_results(stored, pos, combined, hashes, snapshot), store_path)
+    return statuses, results, combined, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='5개 지표 일괄 평가')
+    parser.add_argument('--data', help='평가할 세션 파일 csv/parquet/arrow (기본: data/new_data.csv, 없으면 dummy_data.csv)')
+    parser.add_argument('--exact', action='store_true', help='cut-off 재산출 시 이력 sketch 대신 전체 이력 정확 계산')
+    parser.add_argument('--workers', type=int, default=len(INDICATORS), help='동시에 실행할 지표 수')
+    parser.add_argument('--json', action='store_true', help='지표별 실행 상태를 JSON으로 출력')
+    parser.add_argument('--output', help='점수/등급 결과 저장 경로 (.csv/.parquet/.arrow, 모든 지표 성공 시에만 저장)')
+    parser.add_argument('--trace', help='단계별 시간/카운터 JSON-lines 기록 경로 (환경변수 EVAL_TRACE와 같음)')
+    parser.add_argument('--rollup', action='store_true',
+                        help='상담사/mid_category/result_label별 집계(data/rollups) 갱신 (모든 지표 성공 시에만)')
+    parser.add_argument('--rollup-batch', help='집계 배치 id (기본: session_id 집합의 해시, 같은 id는 덮어씀)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='세션별 결과 저장소(data/results)로 새/변경 세션만 채점 (session_id 필요)')
+    args = parser.parse_args(argv)
+    setup_trace(args.trace)
+
+    # --json이면 stdout에는 JSON만 쓰도록 진행 상황은 stderr로 (오류 traceback은 항상 stderr)
+    log = partial(print, file=sys.stderr if args.json else sys.stdout)
+    eval_path = args.data or (DATA_PATH if os.path.exists(DATA_PATH) else DUMMY_PATH)
+    log(f"[INFO] {os.path.basename(eval_path)}로 평가를 진행합니다.")
+    t0 = time.perf_counter()
+    raw_df = read_sessions(eval_path, INPUT_COLS + ROLLUP_COLS if args.rollup else INPUT_COLS)
+    load_seconds = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    combined = incremental = None
+    if args.incremental and ID_COL in raw_df.columns:
+        statuses, results, combined, incremental = run_incremental(raw_df, args.exact, args.workers)
+    else:
+        if args.incremental:
+            log('[WARN] session_id 컬럼이 없어 증분 평가 없이 전체를 채점합니다.')
+        statuses, results = run_all(raw_df, args.exact, args.workers)
+    total_seconds = time.perf_counter() - t0
+
+    for (name, _, out_cols), status in zip(INDICATORS, statuses):
+        log(f'\n===== 실행: {name} ({status["seconds"]:.2f}s) =====')
+        for line in status['logs']:
+            log(line)
+        if status['status'] == 'ok':
+            log(results[name][out_cols].head(20))
+        else:
+            print(f'오류 발생: {name}\n{status["traceback"]}', file=sys.stderr)
+
+    failed = [status['indicator'] for status in statuses if status['status'] != 'ok']
+    log(f'\n[INFO] 로드 {load_seconds:.2f}s, 평가 {total_seconds:.2f}s '
+        f'(지표별 합계 {sum(s["seconds"] for s in statuses):.2f}s), 실패 {len(failed)}개 {failed if failed else ""}')
+    if incremental is not None:
+        log(f"[INFO] 증분 평가: 새 세션 {incremental['new']}, 변경 {incremental['changed']}, "
+            f"저장된 점수 사용 {incremental['reused']} (기준 변경으로 다시 채점 {incremental.get('rescored', {})})")
+    if combined is None and not failed:
+        combined = combine_results(raw_df, results)
+    if args.output and not failed:
+        write_results(combined, args.output)
+        log(f'[INFO] 평가 결과 저장: {args.output}')
+    if args.rollup and not failed:
+        group_cols = [col for col in ROLLUP_COLS if col in raw_df.columns]
+        batch_id, rollup = update_rollup(pd.concat([raw_df[group_cols], combined], axis=1), args.rollup_batch)
+        log(f"[INFO] 집계 갱신: 배치 {batch_id} ({len(raw_df)}행) → 전체 배치 {len(rollup['batches'])}개, "
+            f"세션 {rollup['sessions']}건")
+    if args.json:
+        print(json.dumps({'input': eval_path, 'rows': len(raw_df), 'load_seconds': load_seconds,
+                          'seconds': total_seconds, 'ok': not failed, 'incremental': incremental,
+                          'indicators': [{k: v for k, v in s.items() if k != 'traceback'} for s in statuses]},
+                         ensure_ascii=False, indent=2))
+    return 1 if failed else 0
 
-for script in scripts:
-    print(f'\n===== 실행: {script} =====')
-    exit_code = os.system(f'{sys.executable} {script}')
-    if exit_code != 0:
-        print(f'오류 발생: {script}') 
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
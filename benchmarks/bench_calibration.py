@@ -0,0 +1,59 @@
+"""
+기간/상담 유형별 기준선 산출: calibration.calibrate_partitions 직렬(workers=1) vs 프로세스 풀 비교.
+
+합성 세션 N행(synthetic.generate_sessions)에 date 컬럼(12개월)을 붙여
+전체 + 월별 12개 + mid_category별 10개 파티션 × 5개 지표의 cut-off/minmax/iqr를 산출하고
+- workers 수별 시간 (풀 생성, shared memory 복사 포함)
+- 직렬 결과와의 일치 여부 (JSON 기준 bit 단위)
+를 출력한다. 작업 프로세스 수보다 CPU가 적으면 풀은 직렬보다 빠르지 않다 (cpu_count를 함께 출력).
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_calibration.py [N행] [workers,...]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.calibration import calibrate_partitions
+from absolute_grading.engine import FEATURE_COLS
+from absolute_grading.schema import with_float64
+from benchmarks.synthetic import generate_sessions
+
+N_DAYS = 365
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+def make_history(n_rows):
+    history = with_float64(generate_sessions(n_rows), FEATURE_COLS)
+    rng = np.random.default_rng(1)
+    history['date'] = pd.Timestamp('2026-01-01') + pd.to_timedelta(rng.integers(0, N_DAYS, n_rows), unit='D')
+    return history
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cpus = os.cpu_count() or 1
+    worker_counts = [int(w) for w in sys.argv[2].split(',')] if len(sys.argv) > 2 else sorted({2, 4, cpus})
+    history = make_history(n_rows)
+    serial, t_serial = timed(lambda: calibrate_partitions(history, workers=1))
+    counts = {d: len(p) for d, p in serial['partitions'].items()}
+    print(f'[INFO] {n_rows}행, 파티션 {counts} + 전체, cpu_count {cpus}')
+    print(f"{'workers':<10}{'time (s)':>10}{'speedup':>10}  직렬과 일치")
+    print(f"{1:<10}{t_serial:>10.2f}{1:>9.2f}x  -")
+    expected = json.dumps(serial)
+    for workers in worker_counts:
+        if workers <= 1:
+            continue
+        result, t_pool = timed(lambda: calibrate_partitions(history, workers=workers))
+        print(f"{workers:<10}{t_pool:>10.2f}{t_serial / t_pool:>9.2f}x  {json.dumps(result) == expected}")
+
+if __name__ == "__main__":
+    main()
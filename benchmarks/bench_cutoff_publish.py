@@ -0,0 +1,99 @@
+"""
+cut-off 재산출 게시 중 동시 읽기 안전성 확인: 기존 in-place 쓰기 vs 버전 게시(publish_cutoff).
+
+임시 cutoff 디렉터리에서 writer 프로세스들이 cut-off/minmax 쌍(같은 난수 k로 만든 값)을 1ms 간격으로 쓰는 동안
+reader 프로세스들이 반복해서 읽고, 다음을 센다.
+- 깨진 읽기: JSON 파싱 실패 (쓰는 도중의 빈/잘린 파일)
+- 불일치: cutoff와 minmax가 서로 다른 쓰기에서 온 조합
+- 버전 역행: 한 reader가 본 버전 번호가 줄어든 경우 (버전 게시에서만)
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_cutoff_publish.py [초] [writer 수] [reader 수]
+"""
+import json
+import multiprocessing as mp
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.cutoff_registry import CutoffRegistry, cutoff_path, publish_cutoff
+
+NAME = 'politeness'
+
+def payload(k):
+    # cutoff와 minmax가 같은 k에서 나왔는지 읽는 쪽에서 확인할 수 있는 cut-off json
+    return {'cutoff': {g: k + i for i, g in enumerate('ABCDEFG')},
+            'minmax': {'honorific_ratio': {'min': float(k), 'max': float(k) + 1}},
+            'pad': ['x' * 64] * random.randint(10, 200)}  # 파일 크기를 바꿔 부분 쓰기가 드러나도록
+
+def consistent(data):
+    return data['minmax']['honorific_ratio']['min'] == data['cutoff']['A']
+
+def writer(mode, cutoff_dir, seconds, seed):
+    random.seed(seed)
+    end = time.time() + seconds
+    while time.time() < end:
+        data = payload(random.randint(0, 10**6))
+        if mode == 'inplace':
+            with open(cutoff_path(NAME, cutoff_dir), 'w') as f:
+                json.dump(data, f, indent=2)
+        else:
+            publish_cutoff(NAME, data, cutoff_dir)
+        time.sleep(0.001)
+
+def reader(mode, cutoff_dir, seconds, out):
+    reads = torn = mixed = backwards = 0
+    last_version = 0
+    registry = CutoffRegistry(names=[NAME], cutoff_dir=cutoff_dir, check_interval=0)  # 매 읽기마다 CURRENT 확인
+    end = time.time() + seconds
+    while time.time() < end:
+        reads += 1
+        try:
+            if mode == 'inplace':
+                with open(cutoff_path(NAME, cutoff_dir)) as f:
+                    data = json.load(f)
+            else:
+                snapshot = registry.snapshot()
+                data = snapshot.cutoff_json(NAME)
+                version = snapshot.version[NAME]
+                backwards += version < last_version
+                last_version = version
+        except (ValueError, KeyError):
+            torn += 1
+            continue
+        mixed += not consistent(data)
+    out.put({'reads': reads, 'torn': torn, 'mixed': mixed, 'backwards': backwards})
+
+def run(mode, seconds, writers, readers):
+    cutoff_dir = tempfile.mkdtemp(prefix='bench_cutoff_')
+    try:
+        with open(cutoff_path(NAME, cutoff_dir), 'w') as f:
+            json.dump(payload(0), f, indent=2)
+        out = mp.Queue()
+        procs = [mp.Process(target=writer, args=(mode, cutoff_dir, seconds, i)) for i in range(writers)]
+        procs += [mp.Process(target=reader, args=(mode, cutoff_dir, seconds, out)) for _ in range(readers)]
+        for p in procs:
+            p.start()
+        results = [out.get() for _ in range(readers)]
+        for p in procs:
+            p.join()
+        total = {key: sum(r[key] for r in results) for key in results[0]}
+        print(f"{mode:<10}{total['reads']:>10}{total['torn']:>10}{total['mixed']:>10}{total['backwards']:>12}")
+    finally:
+        shutil.rmtree(cutoff_dir)
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    print(f"{'mode':<10}{'reads':>10}{'torn':>10}{'mixed':>10}{'backwards':>12}")
+    run('inplace', seconds, writers, readers)
+    run('publish', seconds, writers, readers)
+
+if __name__ == "__main__":
+    main()
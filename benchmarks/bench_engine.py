@@ -0,0 +1,64 @@
+"""
+5개 evaluate_* 개별 호출 vs engine.evaluate_all 단일 패스 비교.
+
+- 각 행 수(기본 10k/100k/1M)마다 dummy_data.csv 행을 무작위 복원추출한 데이터로
+  두 경로의 실행 시간과 tracemalloc 최대 할당량을 측정
+- 가장 작은 행 수에서는 두 경로의 점수/등급이 완전히 같은지 검증
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_engine.py [행 수 ...]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.grade_politeness_auto import evaluate_politeness
+from absolute_grading.grade_empathy_auto import evaluate_empathy
+from absolute_grading.grade_problem_solving import evaluate_problem_solving
+from absolute_grading.grade_emotional_stability_auto import evaluate_emotional_stability
+from absolute_grading.grade_stability_auto import evaluate_stability
+from absolute_grading.engine import evaluate_all
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+
+def evaluate_five_calls(df):
+    # LLM_evaluation_batch.py 기존 경로: 지표별 evaluate_* 5회 호출
+    return pd.concat([
+        evaluate_politeness(df),
+        evaluate_empathy(df),
+        evaluate_problem_solving(df),
+        evaluate_emotional_stability(df),
+        evaluate_stability(df),
+    ], axis=1)
+
+def measure(fn, df):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(df)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    base = pd.read_csv(DUMMY_PATH)
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10}{'5-call(ms)':>14}{'engine(ms)':>14}{'speedup':>10}{'5-call peak(MB)':>18}{'engine peak(MB)':>18}")
+    for i, n_rows in enumerate(sizes):
+        df = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+        old, t_old, peak_old = measure(evaluate_five_calls, df)
+        new, t_new, peak_new = measure(evaluate_all, df)
+        if i == 0:
+            pd.testing.assert_frame_equal(old[new.columns], new)
+        print(f'{n_rows:>10}{t_old * 1000:>14.1f}{t_new * 1000:>14.1f}{t_old / t_new:>9.1f}x'
+              f'{peak_old / 1e6:>18.1f}{peak_new / 1e6:>18.1f}')
+
+if __name__ == "__main__":
+    main()
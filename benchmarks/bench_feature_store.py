@@ -0,0 +1,68 @@
+"""
+정확 재산출(--exact)의 이력 로드 시간 비교: CSV 파싱 vs 이력 feature 저장소(memmap).
+
+dummy_data.csv 행을 복원추출한 N행 이력을 CSV와 저장소(임시 디렉터리)로 만든 뒤
+- CSV: read_sessions(이력.csv, politeness 4개 컬럼) (기존 방식: 매 재산출마다 텍스트 파싱)
+- 저장소 columns(): memmap 뷰 (복사 없음)
+- 저장소 frame(): float64 복원 DataFrame (재산출 계산에 쓰는 형태)
+- 1만 행 배치 추가 (session_id 중복 확인 포함) / 같은 배치 재추가 (모두 중복)
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_feature_store.py [N행]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.feature_store import reset_feature_store
+from absolute_grading.schema import with_float64
+from absolute_grading.session_io import read_sessions
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+COLS = ['honorific_ratio', 'positive_word_ratio', 'negative_word_ratio', 'euphonious_word_ratio']
+BATCH_ROWS = 10_000
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - t0) * 1000
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = read_sessions(DUMMY_PATH)
+    rng = np.random.default_rng(0)
+    history = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    history['session_id'] = [f'h{i}' for i in range(n_rows)]
+    batch = df.iloc[rng.integers(0, len(df), BATCH_ROWS)].reset_index(drop=True)
+    batch['session_id'] = [f'b{i}' for i in range(BATCH_ROWS)]
+
+    tmp = tempfile.mkdtemp(prefix='bench_store_')
+    try:
+        csv_path = os.path.join(tmp, 'history.csv')
+        history.to_csv(csv_path, index=False)
+        store, build_ms = timed(lambda: reset_feature_store('politeness', COLS, history[['session_id'] + COLS], base_dir=tmp))
+        print(f'[INFO] {n_rows}행 이력, 저장소 생성 {build_ms:.0f}ms')
+
+        csv_df, csv_ms = timed(lambda: read_sessions(csv_path, COLS))
+        _, view_ms = timed(lambda: store.columns(COLS))
+        frame, frame_ms = timed(lambda: store.frame(COLS))
+        assert np.array_equal(frame.to_numpy(), with_float64(csv_df, COLS)[COLS].to_numpy()), 'float64 복원값이 CSV와 다름'
+        print(f"{'CSV 파싱':<24}{csv_ms:>10.1f} ms")
+        print(f"{'저장소 memmap 뷰':<24}{view_ms:>10.1f} ms")
+        print(f"{'저장소 frame (float64)':<24}{frame_ms:>10.1f} ms   (CSV 값과 동일)")
+
+        added, append_ms = timed(lambda: store.append(batch))
+        again, dedupe_ms = timed(lambda: store.append(batch))
+        print(f"{'배치 추가':<24}{append_ms:>10.1f} ms   ({int(added.sum())}행 추가)")
+        print(f"{'같은 배치 재추가':<24}{dedupe_ms:>10.1f} ms   ({int(again.sum())}행 추가)")
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
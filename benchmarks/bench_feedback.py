@@ -0,0 +1,103 @@
+"""
+세션별 Gemini 피드백 생성: 직렬 호출 vs 동시 호출(스레드 풀 + 토큰 버킷 + 재시도) 비교.
+로컬 stub 서버(llm/stub_server.py)를 띄워 응답 지연/429·503 실패를 흉내 낸다.
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_feedback.py [세션 수] [지연(초)] [실패 확률]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.engine import evaluate_all
+from llm.prompt import make_gemini_prompt, evaluation_result_of
+from llm.client import GeminiClient
+from llm.feedback import generate_feedback_batch
+from llm.cache import FeedbackCache, generate_feedback_cached
+from llm.packing import generate_feedback_packed
+from llm.stub_server import start_stub_server, HEADER_RE
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    fail_rate = float(sys.argv[3]) if len(sys.argv) > 3 else 0.1
+    df = pd.read_csv(DUMMY_PATH).head(n)
+    df.columns = df.columns.str.strip()
+    result_df = evaluate_all(df)
+    prompts = [(sid, make_gemini_prompt(evaluation_result_of(result_df, i), sid))
+               for i, sid in enumerate(df['session_id'])]
+
+    print(f"{n}개 세션, 응답 지연 {latency}s, 실패 확률 {fail_rate}")
+    print(f"{'mode':<28}{'seconds':>10}{'requests':>10}{'failed':>8}{'ok':>6}")
+    for label, concurrency, rate in [('serial', 1, 0), ('concurrency=8, rate=50/s', 8, 50), ('concurrency=32, rate=0', 32, 0)]:
+        server, base_url = start_stub_server(latency=latency, fail_rate=fail_rate)
+        client = GeminiClient('stub', base_url, model_name='gemini-1.5-pro', pool_size=concurrency)
+        t0 = time.perf_counter()
+        results = generate_feedback_batch(prompts, client.generate, concurrency=concurrency, rate=rate, backoff=0.05)
+        seconds = time.perf_counter() - t0
+        client.close()
+        server.shutdown()
+        # 응답 헤더의 세션 ID가 요청 세션과 일치하는지 확인
+        ok = sum(r['error'] is None and HEADER_RE.findall(r['feedback']) == [str(r['session_id'])] for r in results)
+        print(f"{label:<28}{seconds:>10.2f}{server.requests:>10}{server.failures:>8}{ok:>6}")
+
+    # 연결 재사용 효과: 요청마다 새 연결(requests.post) vs GeminiClient(keep-alive Session), 지연 0 stub에 직렬 호출
+    server, base_url = start_stub_server()
+    url = f"{base_url}/v1/models/gemini-1.5-pro:generateContent"
+    data = {"contents": [{"parts": [{"text": prompts[0][1]}]}]}
+    t0 = time.perf_counter()
+    for _ in range(n):
+        requests.post(f"{url}?key=stub", json=data).raise_for_status()
+    fresh = time.perf_counter() - t0
+    with GeminiClient('stub', base_url, model_name='gemini-1.5-pro') as client:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            client.generate(prompts[0][1])
+        pooled = time.perf_counter() - t0
+        summary = client.metrics.summary()
+    server.shutdown()
+    print(f"\n직렬 {n}회: 요청마다 새 연결 {fresh / n * 1000:.2f} ms/req, keep-alive 풀 {pooled / n * 1000:.2f} ms/req "
+          f"(첫 요청 {summary['first_ms']:.2f} ms, 이후 평균 {summary['rest_mean_ms']:.2f} ms)")
+
+    # 피드백 캐시: 점수/등급 구성이 서로 다른 세션 n//10개를 10번씩 반복한 n개 세션을 두 배치로 처리
+    profiles = prompts[:max(1, n // 10)]
+    repeated = [(f"{sid}-{j}", make_gemini_prompt(evaluation_result_of(result_df, i), f"{sid}-{j}"))
+                for j in range(10) for i, (sid, _) in enumerate(profiles)]
+    server, base_url = start_stub_server(latency=latency)
+    with GeminiClient('stub', base_url, model_name='gemini-1.5-pro') as client, FeedbackCache(':memory:') as cache:
+        print(f"\n피드백 캐시 ({len(repeated)}개 세션, 서로 다른 프롬프트 {len(profiles)}개)")
+        for label in ['1st batch', '2nd batch']:
+            t0 = time.perf_counter()
+            results, stats = generate_feedback_cached(repeated, client.generate, cache, client.model_name, concurrency=8, rate=0)
+            ok = sum(r['error'] is None and HEADER_RE.findall(r['feedback']) == [r['session_id']] for r in results)
+            print(f"{label:<12}{time.perf_counter() - t0:>8.2f}s  generated={stats['generated']} "
+                  f"saved={stats['api_calls_saved']} hits={stats['cache_hits']} misses={stats['cache_misses']} ok={ok}")
+    server.shutdown()
+
+    # 세션 묶음 요청: 묶음 응답에서 세션 10%를 빠뜨리는 stub으로 요청 수/프롬프트 길이/재요청 확인
+    print(f"\n세션 묶음 요청 ({n}개 세션, 응답 누락 확률 0.1)")
+    print(f"{'pack':<8}{'seconds':>10}{'requests':>10}{'fallback':>10}{'prompt chars':>14}{'ok':>6}")
+    for pack_size in [1, 5, 10, 20]:
+        server, base_url = start_stub_server(latency=latency, drop_rate=0.1)
+        with GeminiClient('stub', base_url, model_name='gemini-1.5-pro') as client:
+            stats = {}
+            t0 = time.perf_counter()
+            if pack_size == 1:
+                results = generate_feedback_batch(prompts, client.generate, concurrency=8, rate=0)
+                stats = {'fallback_sessions': 0, 'prompt_chars': sum(len(p) for _, p in prompts)}
+            else:
+                results = generate_feedback_packed(prompts, client.generate, pack_size, stats, concurrency=8, rate=0)
+            seconds = time.perf_counter() - t0
+        server.shutdown()
+        ok = sum(r['error'] is None and HEADER_RE.findall(r['feedback']) == [str(r['session_id'])] for r in results)
+        print(f"{pack_size:<8}{seconds:>10.2f}{server.requests:>10}{stats['fallback_sessions']:>10}{stats['prompt_chars']:>14,}{ok:>6}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+등급 부여: grade_from_cutoff / grade_from_score 원소별 apply vs grader.assign_grades(searchsorted) 비교.
+
+1) cutoff/*.json 의 실제 cut-off와 비단조 cut-off에 대해 두 방식의 등급이 동일한지 검증
+2) problem_solving lookup table이 grade_from_score와 동일한지 검증 (Invalid 포함)
+3) N행 점수에 대한 실행 시간과 결과 컬럼 메모리(object str vs categorical) 비교
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_grader.py [행 수]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.grader import grade_from_cutoff, compile_cutoffs, compile_cutoff_json, assign_grades
+from absolute_grading.grade_problem_solving import grade_from_score
+
+CUTOFF_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'cutoff')
+INDICATORS = ['politeness', 'empathy', 'emotional_stability', 'stability']
+
+def load_cutoff(name):
+    with open(os.path.join(CUTOFF_DIR, f'grade_cutoff_{name}.json')) as f:
+        return json.load(f)
+
+def check_ladder(cutoffs, scores):
+    expected = np.array([grade_from_cutoff(s, cutoffs) for s in scores], dtype=object)
+    actual = np.asarray(assign_grades(scores, compile_cutoffs(cutoffs)), dtype=object)
+    assert (expected == actual).all(), f'등급 불일치: {cutoffs}'
+
+def check_parity(rng):
+    scores = np.concatenate([rng.uniform(-0.2, 1.2, 10_000), [np.nan, -np.inf, np.inf]])
+    for name in INDICATORS:
+        cutoffs = load_cutoff(name)['cutoff']
+        # cut-off 값 자체(경계)도 포함
+        check_ladder(cutoffs, np.concatenate([scores, list(cutoffs.values())]))
+        print(f'[OK] {name}: cut-off 사다리와 동일')
+    shuffled = {'A': 0.3, 'B': 0.6, 'C': 0.5, 'D': 0.1, 'E': 0.2, 'F': 0.4, 'G': -1e9}
+    check_ladder(shuffled, np.concatenate([scores, list(shuffled.values())]))
+    print('[OK] 비단조 cut-off: 사다리와 동일')
+
+    table = compile_cutoff_json(load_cutoff('problem_solving'))
+    discrete = np.array([0.0, 0.2, 0.6, 1.0, 0.4, -0.2, 1.2, np.nan] * 100)
+    expected = np.array([grade_from_score(s) for s in discrete], dtype=object)
+    actual = np.asarray(assign_grades(discrete, table), dtype=object)
+    assert (expected == actual).all(), 'problem_solving lookup 불일치'
+    print('[OK] problem_solving: lookup table과 grade_from_score 동일')
+
+def bench(rng, n_rows):
+    cutoffs = load_cutoff('politeness')['cutoff']
+    scores = pd.Series(rng.uniform(0.0, 1.0, n_rows))
+    t0 = time.perf_counter()
+    ladder = scores.apply(lambda x: grade_from_cutoff(x, cutoffs))
+    t1 = time.perf_counter()
+    table = compile_cutoffs(cutoffs)
+    categorical = pd.Series(assign_grades(scores.to_numpy(), table))
+    t2 = time.perf_counter()
+    print(f'\n{n_rows}행 등급 부여')
+    print(f'  apply(grade_from_cutoff): {(t1 - t0) * 1000:10.1f} ms, {ladder.memory_usage(deep=True) / 1e6:8.2f} MB')
+    print(f'  assign_grades(searchsorted): {(t2 - t1) * 1000:7.1f} ms, {categorical.memory_usage(deep=True) / 1e6:8.2f} MB')
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    check_parity(rng)
+    bench(rng, n_rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+absolute_grading 5개 모듈의 import(기동) 시간 측정 스크립트.
+
+각 모듈을 새 파이썬 프로세스에서 import 하여
+- cold: 인터프리터 기동 후 모듈 import 전체 시간 (pandas/numpy import 포함)
+- module: pandas/numpy를 미리 import 한 뒤 모듈 자체 import 에 걸린 시간
+을 반복 측정하고 중앙값을 출력한다. import 시 파일 I/O나 출력이 발생하면 경고한다.
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_import.py [반복횟수]
+"""
+import os
+import subprocess
+import sys
+import statistics
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+MODULES = [
+    'absolute_grading.grade_politeness_auto',
+    'absolute_grading.grade_empathy_auto',
+    'absolute_grading.grade_emotional_stability_auto',
+    'absolute_grading.grade_stability_auto',
+    'absolute_grading.grade_problem_solving',
+]
+
+# 자식 프로세스에서 실행할 측정 코드: 마지막 줄에 전체 시간과 모듈 자체 import 시간을 출력
+_PROBE = """
+import time, importlib
+t0 = time.perf_counter()
+{preload}
+t1 = time.perf_counter()
+importlib.import_module({module!r})
+t2 = time.perf_counter()
+print('__BENCH__', t2 - t0, t2 - t1)
+"""
+
+def measure_once(module, preload):
+    code = _PROBE.format(module=module, preload='import pandas, numpy' if preload else 'pass')
+    proc = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f'{module} import 실패:\n{proc.stderr}')
+    lines = proc.stdout.strip().split('\n')
+    extra = [l for l in lines if not l.startswith('__BENCH__')]
+    _, total, module_only = lines[-1].split()
+    return float(total), float(module_only), extra
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'module':<50}{'cold(ms)':>12}{'module(ms)':>12}")
+    for module in MODULES:
+        colds, onlys, side_output = [], [], []
+        for _ in range(repeat):
+            total, _, extra = measure_once(module, preload=False)
+            _, module_only, _ = measure_once(module, preload=True)
+            colds.append(total)
+            onlys.append(module_only)
+            side_output.extend(extra)
+        print(f"{module:<50}{statistics.median(colds) * 1000:>12.1f}{statistics.median(onlys) * 1000:>12.1f}")
+        if side_output:
+            print(f"  [WARN] import 중 출력 발생: {side_output[:3]}")
+
+if __name__ == "__main__":
+    main()
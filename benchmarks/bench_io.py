@@ -0,0 +1,94 @@
+"""
+세션 파일 형식별(CSV / Parquet / Arrow IPC) 읽기 시간과 최대 메모리(RSS) 측정.
+
+dummy_data.csv 행을 복원추출한 N행 합성 파일을 세 형식으로 만든 뒤,
+읽기마다 새 프로세스를 띄워 read_sessions 시간과 ru_maxrss를 잰다 (이전 읽기의 메모리가 섞이지 않도록).
+- 전체 18개 컬럼
+- 지표 하나에 필요한 컬럼만 (예: politeness 4개)
+- batch_grade_all/streaming이 읽는 컬럼 (session_id + 11개 feature + suggestions)
+
+사용법 (루트에서 실행, 합성 파일은 임시 디렉터리에 생성 후 삭제):
+    python benchmarks/bench_io.py [N행]
+"""
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.engine import FEATURE_COLS, RAW_COLS
+from absolute_grading.session_io import read_sessions, write_results
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+PROJECTIONS = [
+    ('all columns', None),
+    ('politeness', ['honorific_ratio', 'positive_word_ratio', 'negative_word_ratio', 'euphonious_word_ratio']),
+    ('engine input', ['session_id'] + FEATURE_COLS + RAW_COLS),
+]
+
+def make_synthetic(n_rows, out_dir):
+    # 복원추출 + session_id만 고유하게 다시 부여
+    df = read_sessions(DUMMY_PATH)
+    rng = np.random.default_rng(0)
+    big = df.iloc[rng.integers(0, len(df), n_rows)].reset_index(drop=True)
+    big['session_id'] = np.arange(n_rows).astype(str)
+    paths = {}
+    for ext in ('csv', 'parquet', 'arrow'):
+        path = os.path.join(out_dir, f'sessions.{ext}')
+        t0 = time.perf_counter()
+        write_results(big, path)
+        paths[ext] = path
+        print(f'[INFO] {ext:<8} 쓰기 {time.perf_counter() - t0:6.1f}s, {os.path.getsize(path) / 2**20:8.1f} MiB')
+    return paths
+
+def peak_rss_mib():
+    # ru_maxrss는 fork 이후 exec해도 부모 값을 물려받으므로 Linux에서는 exec 시 초기화되는 VmHWM 사용
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def measure_read(path, columns):
+    # 자식 프로세스: 읽기 시간과 최대 RSS(MiB)를 JSON으로 출력
+    t0 = time.perf_counter()
+    df = read_sessions(path, columns)
+    seconds = time.perf_counter() - t0
+    rss = peak_rss_mib()
+    print(json.dumps({'seconds': seconds, 'rss_mib': rss, 'rows': len(df), 'cols': df.shape[1]}))
+
+def run_child(path, columns):
+    out = subprocess.run([sys.executable, os.path.abspath(__file__), '--read', path, json.dumps(columns)],
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--read':
+        measure_read(sys.argv[2], json.loads(sys.argv[3]))
+        return
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    out_dir = tempfile.mkdtemp(prefix='bench_io_')
+    try:
+        paths = make_synthetic(n_rows, out_dir)
+        baseline = run_child(DUMMY_PATH, [])  # 인터프리터 + pandas/pyarrow import만의 RSS 기준
+        print(f'[INFO] 기준 RSS (빈 읽기): {baseline["rss_mib"]:.0f} MiB')
+        print(f"{'projection':<14}{'format':<10}{'cols':>6}{'read(s)':>10}{'peak RSS(MiB)':>16}")
+        for name, columns in PROJECTIONS:
+            for fmt, path in paths.items():
+                result = run_child(path, columns)
+                print(f"{name:<14}{fmt:<10}{result['cols']:>6}{result['seconds']:>10.2f}{result['rss_mib']:>16.0f}")
+    finally:
+        shutil.rmtree(out_dir)
+
+if __name__ == "__main__":
+    main()
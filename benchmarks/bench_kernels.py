@@ -0,0 +1,63 @@
+"""
+지표별 점수 산출: 행 단위 df.apply(compute_*_score) vs 벡터화 커널(compute_*_scores) 비교.
+
+dummy_data.csv 를 N배 복제한 데이터로 두 방식의 실행 시간을 측정한다.
+두 방식의 점수가 bit 단위로 같은지는 tests/test_kernels.py에서 확인한다.
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_kernels.py [행 수]
+"""
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading import grade_politeness_auto as politeness
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import grade_emotional_stability_auto as emotional_stability
+from absolute_grading import grade_stability_auto as stability
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+
+# (모듈, feature 컬럼(커널 인자 순서), 행 단위 함수, 벡터화 커널)
+CASES = {
+    'politeness': (politeness, politeness.SCORE_ORDER, politeness.compute_politeness_score, politeness.compute_politeness_scores),
+    'empathy': (empathy, empathy.cols, empathy.compute_empathy_score, empathy.compute_empathy_scores),
+    'emotional_stability': (emotional_stability, emotional_stability.cols, emotional_stability.compute_emotional_stability_score, emotional_stability.compute_emotional_stability_scores),
+    'stability': (stability, stability.cols, stability.compute_stability_score, stability.compute_stability_scores),
+}
+
+def normalized_frame(module, df, cols):
+    # evaluate_* 와 동일한 전처리: IQR 클리핑 → 저장된 minmax로 정규화
+    with open(module.CUTOFF_PATH) as f:
+        minmax = json.load(f)['minmax']
+    df = module.clip_outliers_iqr(df.copy(), cols)
+    for col in cols:
+        df[f'{col}_norm'] = module.minmax_normalize(df[col], minmax[col]['min'], minmax[col]['max'])
+    return df
+
+def bench(df):
+    print(f"\n{'indicator':<22}{'apply(ms)':>12}{'kernel(ms)':>12}{'speedup':>10}")
+    for name, (module, cols, row_fn, kernel) in CASES.items():
+        norm_df = normalized_frame(module, df, cols)
+        t0 = time.perf_counter()
+        norm_df.apply(row_fn, axis=1)
+        t1 = time.perf_counter()
+        kernel(*(norm_df[f'{col}_norm'].to_numpy(dtype=float) for col in cols))
+        t2 = time.perf_counter()
+        print(f'{name:<22}{(t1 - t0) * 1000:>12.1f}{(t2 - t1) * 1000:>12.2f}{(t1 - t0) / max(t2 - t1, 1e-9):>9.0f}x')
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    df = pd.read_csv(DUMMY_PATH)
+    df.columns = df.columns.str.strip()
+    big = pd.concat([df] * (n_rows // len(df) + 1), ignore_index=True).iloc[:n_rows]
+    bench(big)
+
+if __name__ == "__main__":
+    main()
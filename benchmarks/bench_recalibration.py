@@ -0,0 +1,69 @@
+"""
+전체 이력 정확 재산출(--exact): 행 단위 iterrows 루프 vs recalibration.recalibrate_exact 비교.
+
+합성 이력 N행(synthetic.generate_sessions)에 대해 지표별로
+- 기존 방식: IQR 클리핑 → minmax → iterrows로 행마다 스칼라 minmax_normalize + compute_*_score → 백분위마다 np.percentile
+- recalibrate_exact: 컬럼 배열 클리핑 → 정규화 → 커널 → np.percentile 한 번
+의 시간과 cut-off/minmax/iqr 일치 여부(bit 단위)를 출력한다.
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_recalibration.py [N행]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading import grade_politeness_auto as politeness
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import grade_emotional_stability_auto as emotional_stability
+from absolute_grading import grade_stability_auto as stability
+from absolute_grading.recalibration import recalibrate_exact
+from absolute_grading.schema import with_float64
+from absolute_grading.sketch import df_iqr_bounds
+from benchmarks.synthetic import generate_sessions
+
+# (모듈, 행 단위 함수, 벡터화 커널, 커널 인자 순서)
+CASES = {
+    'politeness': (politeness, politeness.compute_politeness_score, politeness.compute_politeness_scores, politeness.SCORE_ORDER),
+    'empathy': (empathy, empathy.compute_empathy_score, empathy.compute_empathy_scores, None),
+    'emotional_stability': (emotional_stability, emotional_stability.compute_emotional_stability_score,
+                            emotional_stability.compute_emotional_stability_scores, None),
+    'stability': (stability, stability.compute_stability_score, stability.compute_stability_scores, None),
+}
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+def iterrows_recalibrate(all_df, module, row_fn):
+    # 기존 *_auto.py --exact 분기 (행마다 컬럼 수만큼 스칼라 minmax_normalize, 백분위마다 np.percentile)
+    cols = module.cols
+    bounds = df_iqr_bounds(all_df, cols)
+    all_df = module.clip_outliers_iqr(all_df.copy(), cols, bounds)
+    minmax = {col: {"min": float(all_df[col].min()), "max": float(all_df[col].max())} for col in cols}
+    scores = []
+    for _, row in all_df.iterrows():
+        norm = {f'{col}_norm': module.minmax_normalize(row[col], minmax[col]['min'], minmax[col]['max']) for col in cols}
+        scores.append(row_fn(norm))
+    cutoff = {grade: float(np.percentile(scores, q)) for grade, q in zip("ABCDEF", [90, 80, 70, 60, 50, 40])}
+    cutoff["G"] = -1e9
+    return cutoff, minmax, bounds
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    history = generate_sessions(n_rows)
+    print(f'[INFO] 이력 {n_rows}행')
+    print(f"{'지표':<22}{'iterrows (s)':>14}{'vectorized (s)':>16}{'speedup':>10}  일치")
+    for name, (module, row_fn, kernel, order) in CASES.items():
+        all_df = with_float64(history[module.cols], module.cols)
+        expected, t_old = timed(lambda: iterrows_recalibrate(all_df, module, row_fn))
+        result, t_new = timed(lambda: recalibrate_exact(all_df, kernel, module.cols, order))
+        print(f"{name:<22}{t_old:>14.2f}{t_new:>16.3f}{t_old / t_new:>9.0f}x  {result == expected}")
+
+if __name__ == "__main__":
+    main()
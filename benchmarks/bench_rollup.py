@@ -0,0 +1,85 @@
+"""
+그룹별 집계: rollup.aggregate(그룹 번호 + np.bincount) vs pandas groupby().agg + 등급별 value_counts.
+
+합성 세션 N행(synthetic.generate_sessions)을 evaluate_all로 채점하고, agent_id(상담사 200명)와 date(30일) 컬럼을 붙여
+- 집계 시간 (차원 3개 × 지표 5개, 날짜별)
+- 두 방식의 건수/평균 점수/등급 분포 일치 여부
+- 부분 집계 크기와 update_rollup(저장 + 전체 집계 갱신) 시간
+을 출력한다. 저장은 임시 디렉터리에 한다.
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_rollup.py [N행]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.engine import evaluate_all
+from absolute_grading.rollup import DIMENSIONS, aggregate, indicator_prefixes, update_rollup, rollup_frame
+from benchmarks.synthetic import generate_sessions
+
+N_AGENTS = 200
+N_DAYS = 30
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+def make_frame(n_rows):
+    sessions = generate_sessions(n_rows)
+    rng = np.random.default_rng(1)
+    sessions['agent_id'] = pd.Categorical(rng.integers(0, N_AGENTS, n_rows).astype(str))
+    sessions['date'] = pd.Timestamp('2026-09-01') + pd.to_timedelta(rng.integers(0, N_DAYS, n_rows), unit='D')
+    return pd.concat([sessions[['session_id', 'date'] + DIMENSIONS], evaluate_all(sessions)], axis=1)
+
+def pandas_rollup(df):
+    # 비교용: 차원 × 지표마다 groupby().agg + 등급 value_counts
+    records = {}
+    day = df['date'].dt.strftime('%Y-%m-%d')
+    for dim in DIMENSIONS:
+        for prefix in indicator_prefixes(df):
+            grouped = df.groupby([day, df[dim]], observed=True)
+            stats = grouped[f'{prefix}_score'].agg(['size', 'sum', 'count'])
+            grades = grouped[f'{prefix}_Grade'].value_counts()
+            for (d, key), row in stats.iterrows():
+                records[(dim, d, str(key), prefix)] = (int(row['size']), float(row['sum']), int(row['count']),
+                                                       {str(g): int(n) for g, n in grades.loc[(d, key)].items() if n})
+    return records
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_frame(n_rows)
+    records, t_rollup = timed(lambda: aggregate(df))
+    reference, t_pandas = timed(lambda: pandas_rollup(df))
+    print(f'[INFO] {n_rows}행, 차원 {len(DIMENSIONS)}개 × 지표 {len(indicator_prefixes(df))}개 × {N_DAYS}일 → 그룹 레코드 {len(records)}개')
+    print(f"{'rollup.aggregate (s)':<36}{t_rollup:>10.3f}")
+    print(f"{'pandas groupby + value_counts (s)':<36}{t_pandas:>10.3f}")
+
+    mismatched = 0
+    for r in records:
+        count, score_sum, score_count, grades = reference[(r['dimension'], r['day'], r['key'], r['indicator'])]
+        if (r['count'], r['score_count'], r['grades']) != (count, score_count, grades) \
+                or not np.isclose(r['score_sum'], score_sum, rtol=1e-12):
+            mismatched += 1
+    print(f'[INFO] 레코드 수 일치: {len(records) == len(reference)}, 값 불일치 {mismatched}건')
+
+    tmp = tempfile.mkdtemp(prefix='bench_rollup_')
+    try:
+        (_, rollup), t_update = timed(lambda: update_rollup(df, 'bench', rollup_dir=tmp))
+        size = os.path.getsize(os.path.join(tmp, 'batches', 'bench.json'))
+        print(f"{'update_rollup (s)':<36}{t_update:>10.3f}   (부분 집계 {size / 1024:.0f}KB, 다시 읽는 세션 없음)")
+        _, t_frame = timed(lambda: rollup_frame(rollup, 'mid_category', days=[f'2026-09-{d:02d}' for d in range(1, 8)]))
+        print(f"{'rollup_frame (7일 합산) (s)':<36}{t_frame:>10.3f}")
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+세션 DataFrame 메모리: pd.read_csv 기본 추론(float64/int64/object) vs 선언된 compact schema(float32/category).
+
+합성 세션 N행(synthetic.generate_sessions) CSV를 두 방식으로 읽어
+- DataFrame 메모리 (memory_usage(deep=True), 컬럼 종류별)
+- CSV 읽기 시간
+- evaluate_all 시간과 결과 비교: 점수 최대 오차, 등급 불일치 수
+  (compact: float32 → 십진값 float64 복원 후 계산 / 참고: 복원 없이 float32를 그대로 float64로 바꿔 계산한 경우)
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_schema.py [N행]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.engine import evaluate_all, FEATURE_COLS
+from absolute_grading.session_io import read_sessions
+from benchmarks.synthetic import generate_sessions
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+def memory_mb(df):
+    return df.memory_usage(deep=True, index=False).sum() / 2**20
+
+def compare(reference, result):
+    score_err = max(float(np.abs(reference[c].to_numpy() - result[c].to_numpy()).max())
+                    for c in reference.columns if c.endswith('_score'))
+    grade_diff = sum(int((reference[c].astype(str) != result[c].astype(str)).sum())
+                     for c in reference.columns if c.endswith('_Grade'))
+    return score_err, grade_diff
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tmp = tempfile.mkdtemp(prefix='bench_schema_')
+    try:
+        path = os.path.join(tmp, 'sessions.csv')
+        generate_sessions(n_rows).to_csv(path, index=False)
+        inferred, t_inferred = timed(lambda: pd.read_csv(path))
+        compact, t_compact = timed(lambda: read_sessions(path))
+        print(f'[INFO] {n_rows}행, 18개 컬럼')
+        print(f"{'':<28}{'inferred':>14}{'schema':>14}")
+        print(f"{'DataFrame 메모리 (MB)':<28}{memory_mb(inferred):>14.1f}{memory_mb(compact):>14.1f}")
+        for label, cols in [('  feature 15개', [c for c in compact.columns if c not in ('session_id', 'mid_category', 'result_label')]),
+                            ('  mid_category/result_label', ['mid_category', 'result_label']),
+                            ('  session_id', ['session_id'])]:
+            print(f"{label:<28}{memory_mb(inferred[cols]):>14.1f}{memory_mb(compact[cols]):>14.1f}")
+        print(f"{'CSV 읽기 (s)':<28}{t_inferred:>14.2f}{t_compact:>14.2f}")
+
+        reference, t_ref = timed(lambda: evaluate_all(inferred))
+        result, t_res = timed(lambda: evaluate_all(compact))
+        print(f"{'evaluate_all (s)':<28}{t_ref:>14.3f}{t_res:>14.3f}")
+        score_err, grade_diff = compare(reference, result)
+        print(f'[INFO] compact schema: 점수 최대 오차 {score_err:.2e}, 등급 불일치 {grade_diff}건')
+
+        # 참고: 십진값 복원 없이 float32 값을 그대로 float64로 바꿔 계산하면 cut-off 경계 동점 세션의 등급이 바뀜
+        naive = compact.astype({col: 'float64' for col in FEATURE_COLS})
+        score_err, grade_diff = compare(reference, evaluate_all(naive))
+        print(f'[INFO] 참고 (복원 없이 float32 → float64): 점수 최대 오차 {score_err:.2e}, 등급 불일치 {grade_diff}건')
+    finally:
+        shutil.rmtree(tmp)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+이력 quantile sketch 기반 cut-off 재산출의 오차/속도 측정.
+
+1) dummy_data.csv: 전체 이력에 대한 정확 계산(IQR 클리핑 → minmax → np.percentile)과
+   sketch(recalibrate_from_sketch) 결과의 cut-off 절대 오차, rank 오차(%p), sketch 오차 상한(%p) 비교
+2) dummy_data.csv 행을 복원추출한 N행 이력을 1만 행 배치로 나누어 sketch에 병합(fold)하면서
+   같은 비교와 함께 정확 계산 / sketch 재산출 시간 비교
+
+사용법 (루트에서 실행):
+    python benchmarks/bench_sketch.py [N행] [k]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.engine import NORMALIZED_INDICATORS
+from absolute_grading.sketch import (RowSketch, build_sketch, recalibrate_from_sketch,
+                                     normalize_rows, score_rows, GRADE_PERCENTILES, DEFAULT_K)
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+BATCH_ROWS = 10_000
+
+def exact_cutoffs(rows, kernel):
+    # *_auto.py 재산출 분기와 동일한 정확 계산 (전체 이력 IQR 클리핑 → minmax → 점수 → 백분위)
+    q1, q3 = np.percentile(rows, [25, 75], axis=0)
+    iqr = q3 - q1
+    clipped = np.clip(rows, q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+    scores = kernel(*normalize_rows(clipped, clipped.min(axis=0), clipped.max(axis=0)).T)
+    return np.percentile(scores, list(GRADE_PERCENTILES.values())), np.sort(scores)
+
+def report(name, rows, sketch, kernel):
+    t0 = time.perf_counter()
+    expected, sorted_scores = exact_cutoffs(rows, kernel)
+    t1 = time.perf_counter()
+    cutoff, _, _ = recalibrate_from_sketch(sketch, kernel)
+    t2 = time.perf_counter()
+    actual = np.array([cutoff[g] for g in GRADE_PERCENTILES])
+    # rank 오차: sketch cut-off가 정확한 점수 분포에서 차지하는 백분위 구간(동점 포함)과 목표 백분위의 거리
+    lo = np.searchsorted(sorted_scores, actual, side='left') / len(sorted_scores) * 100
+    hi = np.searchsorted(sorted_scores, actual, side='right') / len(sorted_scores) * 100
+    target = np.array(list(GRADE_PERCENTILES.values()), dtype=float)
+    rank_err = np.maximum(np.maximum(lo - target, target - hi), 0).max()
+    print(f'{name:<22}{len(rows):>10}{sketch.size():>8}{np.abs(actual - expected).max():>12.5f}'
+          f'{rank_err:>12.2f}{sketch.epsilon() * 100:>12.2f}'
+          f'{(t1 - t0) * 1000:>12.1f}{(t2 - t1) * 1000:>12.1f}')
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_K
+    df = pd.read_csv(DUMMY_PATH)
+    rng = np.random.default_rng(0)
+    print(f"{'indicator':<22}{'rows':>10}{'items':>8}{'max|Δcut|':>12}{'rank err%p':>12}{'bound %p':>12}"
+          f"{'exact(ms)':>12}{'sketch(ms)':>12}")
+    for spec in NORMALIZED_INDICATORS:
+        rows = df[spec.cols].to_numpy(dtype=float)
+        minmax = {col: {"min": float(df[col].min()), "max": float(df[col].max())} for col in spec.cols}
+        report(spec.name, rows, build_sketch(rows, spec.kernel, minmax, spec.cols, k), spec.kernel)
+
+    print(f'\n{n_rows}행 이력 ({BATCH_ROWS}행 배치 병합)')
+    for spec in NORMALIZED_INDICATORS:
+        base = df[spec.cols].to_numpy(dtype=float)
+        rows = base[rng.integers(0, len(base), n_rows)] * rng.normal(1.0, 0.05, (n_rows, len(spec.cols)))
+        # 배치 key는 저장된(=클리핑된 이력 기준) minmax로 채점한 점수 (운영 시 *_auto.py와 동일)
+        q1, q3 = np.percentile(rows, [25, 75], axis=0)
+        clipped = np.clip(rows, q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+        minmax = {col: {"min": float(clipped[:, j].min()), "max": float(clipped[:, j].max())} for j, col in enumerate(spec.cols)}
+        sketch = RowSketch(spec.cols, k)
+        t0 = time.perf_counter()
+        for start in range(0, n_rows, BATCH_ROWS):
+            batch = rows[start:start + BATCH_ROWS]
+            sketch.merge(RowSketch(spec.cols, k).update(batch, score_rows(batch, spec.kernel, minmax, spec.cols)))
+        fold = time.perf_counter() - t0
+        report(spec.name, rows, sketch, spec.kernel)
+        print(f'{"":<22}배치 병합 총 {fold * 1000:.0f} ms')
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+scoring_service.py 부하 테스트: 동시 클라이언트의 /score 지연(p50/p99)과 처리량 측정.
+
+batch window마다 서비스를 새 프로세스로 띄우고(임의 포트), 클라이언트 스레드마다 keep-alive 연결 하나로
+dummy_data.csv 세션을 하나씩 보내며 지연 시간을 기록한다. 끝나면 /health의 묶음 수로 평균 묶음 크기를 계산한다.
+
+사용법 (루트에서 실행):
+    python benchmarks/load_test_service.py [초] [동시 클라이언트 수] [window(ms),...]
+    예) python benchmarks/load_test_service.py 5 64 0,1,2,5
+"""
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.schema import with_float64
+from absolute_grading.session_io import read_sessions
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DUMMY_PATH = os.path.join(ROOT, 'data', 'dummy_data.csv')
+
+def start_service(window_ms):
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'scoring_service.py'), '--port', '0',
+                             '--batch-window', str(window_ms)],
+                            stdout=subprocess.PIPE, text=True, env=dict(os.environ, GEMINI_API_KEY=''))
+    for line in proc.stdout:
+        if 'http://' in line:
+            host, port = line.strip().split('http://')[1].split(':')
+            return proc, host, int(port)
+    raise RuntimeError('평가 서비스 시작 실패')
+
+def get_json(host, port, path):
+    conn = http.client.HTTPConnection(host, port)
+    conn.request('GET', path)
+    data = json.loads(conn.getresponse().read())
+    conn.close()
+    return data
+
+def client(host, port, bodies, offset, deadline, latencies, errors):
+    conn = http.client.HTTPConnection(host, port)
+    i = offset
+    while time.perf_counter() < deadline:
+        body = bodies[i % len(bodies)]
+        t0 = time.perf_counter()
+        conn.request('POST', '/score', body, {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - t0)
+        if response.status != 200:
+            errors.append(response.status)
+        i += 1
+    conn.close()
+
+def run(window_ms, seconds, clients, bodies):
+    proc, host, port = start_service(window_ms)
+    try:
+        latencies, errors = [], []
+        deadline = time.perf_counter() + seconds
+        threads = [threading.Thread(target=client, args=(host, port, bodies, k * 7, deadline, latencies, errors))
+                   for k in range(clients)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+        stats = get_json(host, port, '/health')['stats']
+    finally:
+        proc.terminate()
+        proc.wait()
+    ms = np.array(latencies) * 1000
+    batch_size = stats['batched_requests'] / max(stats['batches'], 1)
+    print(f"{window_ms:>10g}{len(ms):>10}{len(ms) / elapsed:>12.0f}{np.percentile(ms, 50):>10.2f}"
+          f"{np.percentile(ms, 99):>10.2f}{batch_size:>12.1f}{len(errors):>8}")
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    windows = [float(w) for w in sys.argv[3].split(',')] if len(sys.argv) > 3 else [0, 1, 2, 5]
+    # float32 컬럼은 십진값으로 복원해 JSON에 원래 값(74.3)이 그대로 들어가도록
+    df = read_sessions(DUMMY_PATH)
+    df = with_float64(df, df.columns)
+    bodies = [json.dumps(record) for record in json.loads(df.to_json(orient='records'))]
+    print(f"[INFO] {clients}개 클라이언트, {seconds:g}초, 요청당 세션 1개")
+    print(f"{'window ms':>10}{'requests':>10}{'req/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'batch size':>12}{'errors':>8}")
+    for window_ms in windows:
+        run(window_ms, seconds, clients, bodies)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+지표별 평가/cut-off 산출/재산출 성능 벤치마크 (행 수별 반복 측정 → JSON 저장, 커밋 간 비교).
+
+행 수마다 저장소 사본(임시 디렉터리)에서 별도 프로세스로 실행하므로 cutoff/, data/history/ 등
+실제 저장소의 파일은 바뀌지 않는다. 입력은 synthetic.generate_sessions로 만든 dummy_data.csv 분포의 합성 세션.
+
+측정 항목 (행 수 = 이력/입력 세션 수)
+- evaluate.<지표>, evaluate_all     : 저장된 cut-off로 N행 채점
+- calculate_cutoff                  : N행 dummy_data.csv로 calculate_cutoff.py 전체 실행 (프로세스 시작 포함)
+- recalibrate_sketch.<지표>         : minmax를 벗어난 1,000행 배치 run() (N행 이력 sketch로 재산출)
+- recalibrate_exact.<지표>          : 같은 배치 run(exact=True) (N행 이력 저장소 전체로 재산출)
+재산출 항목은 반복마다 기준선 cut-off를 다시 게시한 뒤 측정한다 (매번 재산출 분기를 타도록).
+max_rows를 지정한 항목은 그보다 큰 행 수에서 건너뛴다 (--no-limit로 해제). calculate_cutoff/recalibrate_exact는
+recalibration 모듈(배열 단위 점수 + np.percentile 한 번)로 바뀌어 100만 행까지 제한 없이 측정한다.
+
+결과 JSON (기본: benchmarks/results/<커밋>.json, 작업 트리가 바뀌었으면 <커밋>-dirty.json)
+    {"commit", "dirty", "created", "python", "numpy", "pandas", "platform", "cpu_count", "repeat",
+     "results": [{"name", "rows", "min", "median", "mean", "stdev", "repeat"} 또는 {"name", "rows", "skipped"}]}
+
+사용법 (루트에서 실행):
+    python benchmarks/run_benchmarks.py [--sizes 1000,10000,100000,1000000] [--repeat 5] [--bench evaluate,recalibrate]
+                                       [--output 결과.json] [--no-limit]
+    python benchmarks/run_benchmarks.py --compare 이전.json 이후.json [--threshold 0.1]
+    예) python benchmarks/run_benchmarks.py --sizes 10000000 --bench evaluate_all
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+BATCH_ROWS = 1_000
+# 저장소 사본에 복사할 항목 (cutoff/versions는 사본에서 현재 grade_cutoff_*.json으로 다시 시작)
+SANDBOX_ITEMS = ['absolute_grading', 'legacy', 'cutoff', 'calculate_cutoff.py',
+                 os.path.join('data', 'dummy_data.csv'),
+                 os.path.join('benchmarks', 'run_benchmarks.py'), os.path.join('benchmarks', 'synthetic.py')]
+
+Benchmark = namedtuple('Benchmark', ['name', 'target', 'setup', 'max_rows'])
+
+def timeit(target, setup=None, repeat=5):
+    """setup() 후 target() 실행 시간(초)을 repeat번 측정 (첫 실행 전 warm-up 1회)"""
+    times = []
+    for i in range(repeat + 1):
+        if setup is not None:
+            setup()
+        t0 = time.perf_counter()
+        target()
+        elapsed = time.perf_counter() - t0
+        if i > 0:
+            times.append(elapsed)
+    return {'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times),
+            'stdev': statistics.stdev(times) if len(times) > 1 else 0.0, 'repeat': repeat}
+
+# ---------------------------------------------------------------- worker (저장소 사본 안에서 실행)
+
+def out_of_range_batch(n_rows, history, cols, seed, base):
+    # 각 컬럼 첫 행을 IQR 클리핑 상한 이상으로 올려 저장된 minmax를 벗어나게 만든 배치 (session_id는 이력과 겹치지 않음)
+    from absolute_grading.sketch import df_iqr_bounds
+    from benchmarks.synthetic import generate_sessions
+    batch = generate_sessions(n_rows, seed, id_start=10**9, base=base)
+    bounds = df_iqr_bounds(history, cols)
+    for col in cols:
+        batch.loc[0, col] = max(bounds[col]['upper'], float(history[col].max()) + 1.0)
+    return batch
+
+def publish_baseline(df):
+    """
+    N행 df를 기준선으로 cut-off/minmax/iqr 게시 + 이력 sketch/저장소 재생성 (calculate_cutoff.py 5~7단계와 같은 결과).
+    반환: {지표: 게시한 cut-off json}
+    """
+    from absolute_grading.cutoff_registry import publish_cutoff
+    from absolute_grading.engine import NORMALIZED_INDICATORS
+    from absolute_grading.feature_store import reset_feature_store
+    from absolute_grading.sketch import (GRADE_PERCENTILES, build_sketch, df_iqr_bounds, save_sketch, score_rows,
+                                         sketch_path)
+    baseline = {}
+    for spec in NORMALIZED_INDICATORS:
+        rows = df[spec.cols].to_numpy(dtype=float)
+        minmax = {col: {"min": float(df[col].min()), "max": float(df[col].max())} for col in spec.cols}
+        scores = score_rows(rows, spec.kernel, minmax, spec.cols)
+        cutoff = {grade: float(np.percentile(scores, q)) for grade, q in GRADE_PERCENTILES.items()}
+        cutoff["G"] = -1e9
+        baseline[spec.name] = {'cutoff': cutoff, 'minmax': minmax, 'iqr': df_iqr_bounds(df, spec.cols)}
+        publish_cutoff(spec.name, baseline[spec.name])
+        save_sketch(build_sketch(rows, spec.kernel, minmax, spec.cols), sketch_path(spec.name))
+        reset_feature_store(spec.name, spec.cols, df[['session_id'] + spec.cols])
+    return baseline
+
+def worker_benchmarks(n_rows, seed):
+    from absolute_grading.cutoff_registry import publish_cutoff
+    from absolute_grading.engine import INDICATORS, evaluate_all
+    from absolute_grading.grade_politeness_auto import evaluate_politeness
+    from absolute_grading.grade_empathy_auto import evaluate_empathy
+    from absolute_grading.grade_problem_solving import evaluate_problem_solving
+    from absolute_grading.grade_emotional_stability_auto import evaluate_emotional_stability
+    from absolute_grading.grade_stability_auto import evaluate_stability
+    from absolute_grading import grade_politeness_auto, grade_empathy_auto, grade_emotional_stability_auto, grade_stability_auto
+    from absolute_grading.session_io import read_sessions, write_results
+    from benchmarks.synthetic import DUMMY_PATH, generate_sessions
+
+    # 분포 기준은 원본 dummy_data.csv (calculate_cutoff 측정 시 사본의 dummy_data.csv를 N행으로 덮어씀)
+    base = read_sessions(DUMMY_PATH)
+    df = generate_sessions(n_rows, seed, base=base)
+    state = {}
+
+    def run_calculate_cutoff():
+        subprocess.run([sys.executable, os.path.join(ROOT, 'calculate_cutoff.py')], cwd=ROOT,
+                       check=True, stdout=subprocess.DEVNULL)
+
+    def write_data():
+        if not state.get('written'):
+            write_results(df, DUMMY_PATH)
+            state['written'] = True
+
+    benchmarks = [
+        Benchmark('evaluate.politeness', lambda: evaluate_politeness(df), None, None),
+        Benchmark('evaluate.empathy', lambda: evaluate_empathy(df), None, None),
+        Benchmark('evaluate.problem_solving', lambda: evaluate_problem_solving(df), None, None),
+        Benchmark('evaluate.emotional_stability', lambda: evaluate_emotional_stability(df), None, None),
+        Benchmark('evaluate.stability', lambda: evaluate_stability(df), None, None),
+        Benchmark('evaluate_all', lambda: evaluate_all(df), None, None),
+        Benchmark('calculate_cutoff', run_calculate_cutoff, write_data, None),
+    ]
+    modules = {'politeness': grade_politeness_auto, 'empathy': grade_empathy_auto,
+               'emotional_stability': grade_emotional_stability_auto, 'stability': grade_stability_auto}
+    specs = {spec.name: spec for spec in INDICATORS}
+
+    def recalibrate(name, exact):
+        messages = []
+        result = modules[name].run(state['batch'], exact=exact, log=messages.append)
+        if not any('재산출' in m for m in messages):
+            raise RuntimeError(f'{name}: 재산출 분기를 타지 않음 ({messages})')
+        return result
+
+    for exact, prefix in [(False, 'recalibrate_sketch'), (True, 'recalibrate_exact')]:
+        for name in modules:
+            benchmarks.append(Benchmark(f'{prefix}.{name}',
+                                        lambda name=name, exact=exact: recalibrate(name, exact),
+                                        lambda name=name: publish_cutoff(name, state['baseline'][name]),
+                                        None))
+
+    def prepare():
+        # N행 기준선 cut-off/sketch/이력 저장소 게시 + 재산출용 배치
+        state['baseline'] = publish_baseline(df)
+        cols = [col for name in modules for col in specs[name].cols]
+        state['batch'] = out_of_range_batch(BATCH_ROWS, df, cols, seed + 1, base)
+
+    return benchmarks, prepare
+
+def run_worker(args):
+    os.chdir(ROOT)
+    benchmarks, prepare = worker_benchmarks(args.worker, args.seed)
+    results = []
+    prepare()
+    for bench in benchmarks:
+        if args.bench and not any(bench.name.startswith(prefix) for prefix in args.bench):
+            continue
+        if bench.max_rows is not None and args.worker > bench.max_rows and not args.no_limit:
+            results.append({'name': bench.name, 'rows': args.worker, 'skipped': f'max_rows {bench.max_rows}'})
+            continue
+        stats = timeit(bench.target, bench.setup, args.repeat)
+        results.append({'name': bench.name, 'rows': args.worker, **stats})
+        print(f"{bench.name:<40}{args.worker:>10}{stats['median'] * 1000:>12.2f}{stats['min'] * 1000:>12.2f}"
+              f"{stats['stdev'] * 1000:>10.2f}", flush=True)
+        if bench.name == 'calculate_cutoff':
+            # calculate_cutoff.py가 cut-off/sketch/이력 저장소를 다시 만들었으므로 기준선을 다시 게시
+            prepare()
+    with open(args.result, 'w') as f:
+        json.dump(results, f)
+
+# ---------------------------------------------------------------- driver
+
+def make_sandbox():
+    sandbox = tempfile.mkdtemp(prefix='bench_repo_')
+    ignore = shutil.ignore_patterns('__pycache__', 'versions', 'sketch_*.json')
+    for item in SANDBOX_ITEMS:
+        src, dst = os.path.join(ROOT, item), os.path.join(sandbox, item)
+        if os.path.isdir(src):
+            shutil.copytree(src, dst, ignore=ignore)
+        else:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(src, dst)
+    return sandbox
+
+def git_info():
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    return git('rev-parse', 'HEAD') or 'unknown', bool(git('status', '--porcelain', '--untracked-files=no'))
+
+def run_sizes(args):
+    commit, dirty = git_info()
+    report = {
+        'commit': commit, 'dirty': dirty, 'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+        'platform': platform.platform(), 'cpu_count': os.cpu_count(), 'repeat': args.repeat, 'results': [],
+    }
+    print(f"{'benchmark':<40}{'rows':>10}{'median ms':>12}{'min ms':>12}{'stdev':>10}")
+    for n_rows in args.sizes:
+        sandbox = make_sandbox()
+        try:
+            result_path = os.path.join(sandbox, 'result.json')
+            cmd = [sys.executable, os.path.join(sandbox, 'benchmarks', 'run_benchmarks.py'), '--worker', str(n_rows),
+                   '--result', result_path, '--repeat', str(args.repeat), '--seed', str(args.seed)]
+            if args.bench:
+                cmd += ['--bench', ','.join(args.bench)]
+            if args.no_limit:
+                cmd.append('--no-limit')
+            subprocess.run(cmd, check=True, env=dict(os.environ, GEMINI_API_KEY=''))
+            with open(result_path) as f:
+                report['results'].extend(json.load(f))
+        finally:
+            shutil.rmtree(sandbox)
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit[:10]}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"[INFO] 결과 저장: {output}")
+
+def compare(old_path, new_path, threshold):
+    """두 결과 JSON의 (항목, 행 수)별 median 비교. threshold보다 느려진 항목이 있으면 True"""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    old_results = {(r['name'], r['rows']): r for r in old['results'] if 'median' in r}
+    print(f"[INFO] {old['commit'][:10]} → {new['commit'][:10]}")
+    print(f"{'benchmark':<40}{'rows':>10}{'old ms':>12}{'new ms':>12}{'ratio':>8}")
+    regressed = False
+    for r in new['results']:
+        before = old_results.get((r['name'], r['rows']))
+        if before is None or 'median' not in r:
+            continue
+        ratio = r['median'] / before['median']
+        mark = ''
+        if ratio > 1 + threshold:
+            mark, regressed = '  회귀', True
+        elif ratio < 1 / (1 + threshold):
+            mark = '  개선'
+        print(f"{r['name']:<40}{r['rows']:>10}{before['median'] * 1000:>12.2f}{r['median'] * 1000:>12.2f}"
+              f"{ratio:>7.2f}x{mark}")
+    return regressed
+
+def parse_list(text, cast=str):
+    return [cast(x) for x in text.split(',') if x]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='지표별 평가/cut-off 산출/재산출 벤치마크')
+    parser.add_argument('--sizes', type=lambda s: parse_list(s, int), default=DEFAULT_SIZES, help='행 수 (쉼표 구분)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--bench', type=parse_list, default=None, help='측정할 항목 이름 접두어 (쉼표 구분)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--no-limit', action='store_true', help='max_rows 제한 없이 모든 항목 측정')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    parser.add_argument('--threshold', type=float, default=0.1, help='회귀로 볼 median 증가 비율')
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+    if args.worker is not None:
+        run_worker(args)
+    else:
+        run_sizes(args)
+
+if __name__ == "__main__":
+    main()
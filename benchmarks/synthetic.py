@@ -0,0 +1,88 @@
+"""
+벤치마크용 합성 세션 생성기: dummy_data.csv의 컬럼별 분포를 임의 행 수로 재현.
+
+- 이산형 컬럼 (고유값 20개 이하: suggestions ∈ {0, 0.2, 0.6, 1.0}, interruption_count, Profane)은
+  dummy_data.csv의 값별 빈도 그대로 추출
+- 연속형 컬럼 (honorific_ratio 등)은 경험적 분위 함수(정렬값 선형 보간)로 추출한 뒤
+  원본과 같은 소수 자릿수로 반올림 → 최소/최대와 값 형태가 dummy_data.csv와 같음
+- 범주형 컬럼 (mid_category, result_label)은 값별 빈도 그대로 추출
+- session_id는 id_start부터 연속된 고유 번호 (기존 이력과 겹치지 않게 배치마다 다르게 지정)
+dummy_data.csv의 컬럼 간 순위 상관은 모두 |ρ| < 0.2라 컬럼마다 독립적으로 추출한다.
+
+사용법 (루트에서 실행):
+    python benchmarks/synthetic.py [행 수] [출력 경로(csv/parquet/arrow)] [seed]
+    예) python benchmarks/synthetic.py 1000000 data/synthetic_1m.parquet
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from absolute_grading.schema import as_float64
+from absolute_grading.session_io import read_sessions, write_results
+
+DUMMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'dummy_data.csv')
+ID_COL = 'session_id'
+DISCRETE_MAX_UNIQUE = 20
+
+def decimals_of(values, max_decimals=6):
+    # 모든 값이 그 자릿수 반올림과 같아지는 최소 소수 자릿수
+    for decimals in range(max_decimals + 1):
+        if np.allclose(np.round(values, decimals), values, rtol=0, atol=1e-9):
+            return decimals
+    return max_decimals
+
+def column_profiles(df):
+    """컬럼별 분포 요약 {col: (종류, 값, 확률 또는 소수 자릿수)}"""
+    profiles = {}
+    for col in df.columns:
+        if col == ID_COL:
+            continue
+        series = df[col].dropna()
+        if not pd.api.types.is_numeric_dtype(series) or series.nunique() <= DISCRETE_MAX_UNIQUE:
+            counts = series.value_counts(sort=False).sort_index()
+            profiles[col] = ('discrete', counts.index.to_numpy(), (counts / counts.sum()).to_numpy())
+        else:
+            values = np.sort(as_float64(series))
+            profiles[col] = ('continuous', values, decimals_of(values))
+    return profiles
+
+def generate_sessions(n_rows, seed=0, id_start=None, base=None):
+    """
+    dummy_data.csv(또는 base DataFrame)와 같은 컬럼/분포의 합성 세션 n_rows행.
+    id_start를 주지 않으면 base의 최대 session_id 다음부터 번호를 매긴다.
+    """
+    if base is None:
+        base = read_sessions(DUMMY_PATH)
+    rng = np.random.default_rng(seed)
+    if id_start is None:
+        id_start = int(pd.to_numeric(base[ID_COL]).max()) + 1
+    profiles = column_profiles(base)
+    data = {}
+    for col in base.columns:
+        if col == ID_COL:
+            ids = np.arange(id_start, id_start + n_rows, dtype=np.int64)
+            data[col] = pd.array(ids.astype(str), dtype=base[col].dtype)
+            continue
+        kind, values, extra = profiles[col]
+        if kind == 'discrete':
+            sampled = values[rng.choice(len(values), size=n_rows, p=extra)]
+        else:
+            quantiles = rng.random(n_rows) * (len(values) - 1)
+            sampled = np.round(np.interp(quantiles, np.arange(len(values)), values), extra)
+        data[col] = pd.array(sampled, dtype=base[col].dtype)
+    return pd.DataFrame(data)
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    out_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join('data', f'synthetic_{n_rows}.csv')
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    df = generate_sessions(n_rows, seed)
+    write_results(df, out_path)
+    print(f"[INFO] 합성 세션 {n_rows}행 → {out_path}")
+
+if __name__ == "__main__":
+    main()
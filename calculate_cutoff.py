@@ -1,79 +1,60 @@
-import pandas as pd
-import numpy as np
-import json
 import os
-from legacy.evaluation_algorithms.politeness import evaluate_politeness
-from legacy.evaluation_algorithms.empathy import evaluate_empathy
-from legacy.evaluation_algorithms.problem_solving import compute_problem_solving_score_and_grade
-from legacy.evaluation_algorithms.emotional_stability import evaluate_emotional_stability
-from legacy.evaluation_algorithms.stability import compute_stability_score_and_grade
+from absolute_grading.engine import NORMALIZED_INDICATORS, FEATURE_COLS, RAW_COLS
+from absolute_grading.session_io import read_sessions
+from absolute_grading.schema import with_float64
+from absolute_grading.feature_store import reset_feature_store
+from absolute_grading.calibration import calibrate_partitions, publish_calibration, PARTITION_PATH
+from absolute_grading.sketch import build_sketch, save_sketch, sketch_path
+from absolute_grading.instrumentation import setup_trace, laps
 
 # robust하게 현재 파일 기준으로 데이터 경로 지정
 DATA_PATH = os.path.join(os.path.dirname(__file__), 'data', 'dummy_data.csv')
-df = pd.read_csv(DATA_PATH)
+CUTOFF_DIR = os.path.join(os.path.dirname(__file__), 'cutoff')
 
-# 각 평가지표별 점수 산출
-politeness_scores = evaluate_politeness(df[['honorific_ratio', 'positive_word_ratio', 'negative_word_ratio', 'euphonious_word_ratio']])['Politeness_score'].tolist()
-empathy_scores = evaluate_empathy(df[['empathy_ratio', 'apology_ratio']])['Empathy_score'].tolist()
-problem_solving_scores, _ = compute_problem_solving_score_and_grade(df[['suggestions']].to_dict(orient='records'), return_all=True)
-emotional_stability_scores = evaluate_emotional_stability(df[['customer_sentiment_early', 'customer_sentiment_late']])['EmotionalStability_score'].tolist()
-stability_scores, _ = compute_stability_score_and_grade(df[['interruption_count', 'silence_ratio', 'talk_ratio']].to_dict(orient='records'), return_all=True)
+def get_minmax(df, cols):
+    return {col: {"min": float(df[col].min()), "max": float(df[col].max())} for col in cols}
 
-scores_dict = {
-    'politeness': politeness_scores,
-    'empathy': empathy_scores,
-    'problem_solving': problem_solving_scores,
-    'emotional_stability': emotional_stability_scores,
-    'stability': stability_scores,
-}
+def main():
+    # EVAL_TRACE가 있으면 단계별 시간 기록
+    setup_trace()
 
-# 3. cut-off 산출 함수
-def get_cutoffs(scores, key=None):
-    if key == 'problem_solving':
-        # 이산형 점수에 대한 절대 등급 매핑
-        return {
-            "A": 1.0,
-            "B": 0.6,
-            "C": 0.2,
-            "D": 0.0
-        }
-    else:
-        return {
-            "A": float(np.percentile(scores, 90)),
-            "B":  float(np.percentile(scores, 80)),
-            "C": float(np.percentile(scores, 70)),
-            "D":  float(np.percentile(scores, 60)),
-            "E": float(np.percentile(scores, 50)),
-            "F":  float(np.percentile(scores, 40)),
-            "G":  -1e9
-        }
+    # float32로 읽은 feature는 원래 십진값의 float64로 복원 (cut-off/minmax/iqr가 float32 오차 없이 산출되도록)
+    df = with_float64(read_sessions(DATA_PATH), FEATURE_COLS + RAW_COLS)
 
-def get_minmax(df, cols):
-    return {col: {"min": float(df[col].min()), "max": float(df[col].max())} for col in cols}
+    trace = laps('calculate_cutoff', rows=len(df))
 
-# 4. cut-off 폴더 생성 (없으면)
-CUTOFF_DIR = os.path.join(os.path.dirname(__file__), 'cutoff')
-os.makedirs(CUTOFF_DIR, exist_ok=True)
+    # 3. cut-off 산출 (전체 + 월별/mid_category별 기준선을 프로세스 풀에서 함께 산출)
+    calibrated = calibrate_partitions(df)
+    trace.lap('score')
+
+    # 4. cut-off 폴더 생성 (없으면)
+    os.makedirs(CUTOFF_DIR, exist_ok=True)
+
+    # 5. 각 지표별 cut-off 저장
+    # 새 버전으로 게시 (임시 파일 → fsync → 원자적 교체, 실행 중인 평가는 이전 버전으로 끝까지 채점)
+    # minmax가 있는 지표는 평가 시 IQR 클리핑 기준(iqr)도 함께 저장 (배치마다 사분위를 다시 구하지 않도록)
+    # 기간/상담 유형별 기준선은 게시한 버전 번호와 함께 한 파일로 원자적 교체
+    versions = publish_calibration(calibrated, CUTOFF_DIR)
+    for key, table in calibrated['global'].items():
+        filename = os.path.join(CUTOFF_DIR, f'grade_cutoff_{key}.json')
+        print(f"{key} cut-off saved to {filename} (version {versions[key]}): {table.get('cutoff', table)}")
+    print(f"partition cut-offs saved to {PARTITION_PATH}: { {d: len(p) for d, p in calibrated['partitions'].items()} }")
+    trace.lap('publish')
+
+    # 6. 지표별 이력 quantile sketch 초기화 (*_auto.py의 cut-off 재산출 시 전체 이력 대신 사용)
+    for spec in NORMALIZED_INDICATORS:
+        minmax = get_minmax(df, spec.cols)
+        sketch = build_sketch(df[spec.cols].to_numpy(dtype=float), spec.kernel, minmax, spec.cols)
+        save_sketch(sketch, sketch_path(spec.name))
+        print(f"{spec.name} sketch saved to {sketch_path(spec.name)}: {sketch.size()} items / {sketch.n} rows")
+    trace.lap('sketch')
+
+    # 7. 지표별 이력 feature 저장소 초기화 (*_auto.py --exact 재산출 시 dummy_data.csv 대신 memmap으로 읽음)
+    for spec in NORMALIZED_INDICATORS:
+        store = reset_feature_store(spec.name, spec.cols, df)
+        print(f"{spec.name} history store saved to {store.path}: {store.rows()} rows")
+    trace.lap('store')
 
-# 5. 각 지표별 cut-off 산출 및 저장
-for key, scores in scores_dict.items():
-    cutoffs = get_cutoffs(scores, key)
-    # feature별 minmax 계산 (problem_solving은 제외)
-    if key == 'politeness':
-        minmax = get_minmax(df, ['honorific_ratio', 'positive_word_ratio', 'negative_word_ratio', 'euphonious_word_ratio'])
-    elif key == 'empathy':
-        minmax = get_minmax(df, ['empathy_ratio', 'apology_ratio'])
-    elif key == 'emotional_stability':
-        minmax = get_minmax(df, ['customer_sentiment_early', 'customer_sentiment_late'])
-    elif key == 'stability':
-        minmax = get_minmax(df, ['interruption_count', 'silence_ratio', 'talk_ratio'])
-    else:
-        minmax = None
-    filename = os.path.join(CUTOFF_DIR, f'grade_cutoff_{key}.json')
-    if minmax is not None:
-        with open(filename, 'w') as f:
-            json.dump({'cutoff': cutoffs, 'minmax': minmax}, f, indent=2)
-    else:
-        with open(filename, 'w') as f:
-            json.dump(cutoffs, f, indent=2)
-    print(f"{key} cut-off saved to {filename}: {cutoffs}")
\ No newline at end of file
+# 프로세스 풀(spawn 방식 포함)의 작업 프로세스가 이 스크립트를 다시 실행하지 않도록 main()으로 실행
+if __name__ == "__main__":
+    main()
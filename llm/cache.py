@@ -0,0 +1,128 @@
+"""
+코칭 피드백 캐시 (SQLite).
+
+Gemini 프롬프트는 5개 지표 점수(소수 2자리)/등급과 세션 ID로만 결정되므로,
+세션 ID를 뺀 프롬프트 해시(prompt_key)가 같으면 같은 피드백을 재사용한다.
+캐시에는 세션 헤더를 자리 표시로 바꾼 피드백을 저장하고, 꺼낼 때 요청 세션의 ID로 바꿔 넣는다.
+
+- TTL: 저장 후 ttl초가 지난 항목은 조회되지 않으며 다음 저장 시 삭제된다.
+- LRU: 항목 수가 max_entries를 넘으면 마지막 사용 시각이 오래된 항목부터 삭제한다.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from llm.feedback import generate_feedback_batch
+from llm.prompt import prompt_key, to_template, from_template
+
+CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '.cache', 'feedback.sqlite')
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 30 * 24 * 60 * 60  # 초
+
+class FeedbackCache:
+    def __init__(self, path=CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS feedback ("
+            " key TEXT PRIMARY KEY, template TEXT NOT NULL,"
+            " created_at REAL NOT NULL, last_used REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS feedback_last_used ON feedback(last_used)")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, key):
+        """키의 피드백 템플릿 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT template, created_at FROM feedback WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE feedback SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, template):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feedback (key, template, created_at, last_used, hits) VALUES (?, ?, ?, ?, 0)",
+                (key, template, now, now))
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM feedback WHERE created_at <= ?", (now - self.ttl,))
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM feedback WHERE key IN (SELECT key FROM feedback ORDER BY last_used LIMIT ?)", (excess,))
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+
+def generate_feedback_cached(prompts, send, cache, model_name='', generate=generate_feedback_batch, **batch_kwargs):
+    """
+    generate_feedback_batch에 캐시를 적용한 버전.
+    prompts의 세션을 prompt_key로 묶어, 캐시에 있으면 API 호출 없이 세션 헤더만 바꿔 쓰고
+    없으면 키당 한 번만 호출한 뒤 같은 키의 세션에 나눠 준다 (성공한 응답만 캐시에 저장).
+    generate: 캐시에 없는 세션을 생성할 함수 (generate_feedback_batch 또는 generate_feedback_packed)
+    반환: (입력 순서의 결과 list, 통계 dict)
+    """
+    keys = [prompt_key(prompt, session_id, model_name) for session_id, prompt in prompts]
+    hits0, misses0 = cache.hits, cache.misses
+    templates = {}
+    pending = {}  # 키 → API로 보낼 대표 세션의 위치
+    for i, key in enumerate(keys):
+        if key in templates or key in pending:
+            continue
+        template = cache.get(key)
+        if template is not None:
+            templates[key] = template
+        else:
+            pending[key] = i
+
+    fetched = dict(zip(pending, generate([prompts[i] for i in pending.values()], send, **batch_kwargs)))
+    for key, result in fetched.items():
+        if result['error'] is None:
+            templates[key] = to_template(result['feedback'], result['session_id'])
+            cache.put(key, templates[key])
+
+    results = []
+    for i, (key, (session_id, _)) in enumerate(zip(keys, prompts)):
+        if pending.get(key) == i:
+            results.append(dict(fetched[key], cached=False))
+        elif key in templates:
+            results.append({'session_id': session_id, 'feedback': from_template(templates[key], session_id),
+                            'error': None, 'attempts': 0, 'seconds': 0.0, 'cached': True})
+        else:
+            # 같은 키의 대표 호출이 실패하면 같은 오류로 기록
+            results.append(dict(fetched[key], session_id=session_id, cached=False))
+    stats = {
+        'sessions': len(prompts),
+        'unique_prompts': len(set(keys)),
+        'cache_hits': cache.hits - hits0,
+        'cache_misses': cache.misses - misses0,
+        'generated': len(pending),  # generate로 보낸 세션 수 (세션별 요청이면 API 호출 수와 같음)
+        'api_calls_saved': len(prompts) - len(pending),
+    }
+    return results, stats
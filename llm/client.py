@@ -0,0 +1,195 @@
+"""
+재사용 가능한 Gemini API 클라이언트.
+
+- requests.Session 하나를 keep-alive 연결 풀로 재사용한다 (요청마다 TCP/TLS 연결을 새로 맺지 않음).
+- 자동 선택한 모델명은 디스크(.cache/gemini_model.json)에 TTL과 함께 저장해,
+  TTL 안에서는 시작 시 모델 목록 조회(GET /v1/models)를 생략한다.
+- 요청별 지연 시간을 기록해 평균/p50/p95, 첫 요청(연결 수립 포함)과 이후 요청을 비교할 수 있다.
+- trace를 켜면(EVAL_TRACE) generateContent 호출마다 지연 시간, 상태 코드, 토큰 수(usageMetadata)를 기록한다.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+from absolute_grading.instrumentation import stage
+
+DEFAULT_BASE_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_POOL_SIZE = 32
+MODEL_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '.cache', 'gemini_model.json')
+MODEL_CACHE_TTL = 24 * 60 * 60  # 초
+PREFERRED_MODELS = ['gemini-1.5-pro', 'gemini-1.0-pro', 'gemini-pro', 'gemini-1.5-flash']
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class GeminiError(Exception):
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+        self.attempts = 1
+
+    @property
+    def retryable(self):
+        return self.status is None or self.status in RETRY_STATUS
+
+def select_model(models):
+    # 모델 목록(GET /v1/models의 'models')에서 선호 순서대로 선택, 없으면 첫 번째 모델 (name이 없는 항목은 GeminiError)
+    names = []
+    for m in models:
+        name = m.get('name') if isinstance(m, dict) else None
+        if not isinstance(name, str):
+            raise GeminiError(f"모델 리스트 응답 형식 오류: name 없음 ({str(m)[:100]})")
+        names.append(name)
+    for p in PREFERRED_MODELS:
+        for name in names:
+            if name.endswith(p):
+                return name.split('/')[-1]
+    if names:
+        return names[0].split('/')[-1]
+    return None
+
+class LatencyMetrics:
+    """요청별 (엔드포인트, 지연 시간, 상태 코드) 기록 (여러 스레드에서 공유)"""
+
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status):
+        with self._lock:
+            self.records.append((endpoint, seconds, status))
+
+    def summary(self, endpoint='generateContent'):
+        with self._lock:
+            seconds = np.array([s for e, s, _ in self.records if e == endpoint])
+            errors = sum(1 for e, _, status in self.records if e == endpoint and status != 200)
+        if len(seconds) == 0:
+            return {'count': 0}
+        return {
+            'count': len(seconds),
+            'errors': errors,
+            'mean_ms': float(seconds.mean() * 1000),
+            'p50_ms': float(np.percentile(seconds, 50) * 1000),
+            'p95_ms': float(np.percentile(seconds, 95) * 1000),
+            'max_ms': float(seconds.max() * 1000),
+            # 첫 요청은 연결 수립 비용 포함, 이후 요청은 풀의 keep-alive 연결 재사용
+            'first_ms': float(seconds[0] * 1000),
+            'rest_mean_ms': float(seconds[1:].mean() * 1000) if len(seconds) > 1 else None,
+        }
+
+class GeminiClient:
+    def __init__(self, api_key, base_url=DEFAULT_BASE_URL, model_name=None, timeout=DEFAULT_TIMEOUT,
+                 pool_size=DEFAULT_POOL_SIZE, model_cache_path=MODEL_CACHE_PATH, model_cache_ttl=MODEL_CACHE_TTL):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.model_cache_path = model_cache_path
+        self.model_cache_ttl = model_cache_ttl
+        self.metrics = LatencyMetrics()
+        self.session = requests.Session()
+        # 동시 요청 수만큼 keep-alive 연결을 풀에 유지
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+        self._model_name = model_name
+        self._model_lock = threading.Lock()
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _request(self, method, endpoint, url, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            response = self.session.request(method, url, params={'key': self.api_key}, timeout=self.timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self.metrics.record(endpoint, time.perf_counter() - t0, None)
+            raise GeminiError(f"Gemini API 연결 실패: {e}")
+        self.metrics.record(endpoint, time.perf_counter() - t0, response.status_code)
+        return response
+
+    def list_models(self):
+        response = self._request('GET', 'models', f"{self.base_url}/v1/models")
+        if response.status_code != 200:
+            raise GeminiError('모델 리스트 조회 실패', status=response.status_code)
+        try:
+            return response.json().get('models', [])
+        except (ValueError, AttributeError) as e:
+            raise GeminiError(f"모델 리스트 응답 파싱 오류: {type(e).__name__}: {e}", status=response.status_code)
+
+    def _cached_model(self):
+        # 같은 base_url에 대해 TTL 안에 저장된 모델명 (없거나 만료되면 None)
+        try:
+            with open(self.model_cache_path) as f:
+                entry = json.load(f).get(self.base_url)
+        except (OSError, ValueError):
+            return None
+        if entry and time.time() - entry['resolved_at'] < self.model_cache_ttl:
+            return entry['model']
+        return None
+
+    def _save_model(self, model_name):
+        try:
+            with open(self.model_cache_path) as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = {}
+        cache[self.base_url] = {'model': model_name, 'resolved_at': time.time()}
+        directory = os.path.dirname(self.model_cache_path)
+        os.makedirs(directory, exist_ok=True)
+        # 프로세스마다 다른 임시 파일에 쓰고 교체 (같은 .tmp 경로를 동시에 쓰다 섞이지 않도록)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_path, self.model_cache_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @property
+    def model_name(self):
+        """사용할 모델명 (디스크 캐시 → 없거나 만료 시 모델 목록 조회 후 캐시 갱신)"""
+        with self._model_lock:
+            if self._model_name is None:
+                model_name = self._cached_model()
+                if model_name is None:
+                    model_name = select_model(self.list_models())
+                    if model_name is None:
+                        raise GeminiError('사용 가능한 Gemini 모델이 없습니다')
+                    self._save_model(model_name)
+                self._model_name = model_name
+            return self._model_name
+
+    def generate(self, prompt):
+        """generateContent 1회 호출 → 응답 텍스트 (실패 시 GeminiError)"""
+        url = f"{self.base_url}/v1/models/{self.model_name}:generateContent"
+        with stage('llm.generate', prompt_chars=len(prompt)) as trace:
+            response = self._request('POST', 'generateContent', url, json={"contents": [{"parts": [{"text": prompt}]}]})
+            trace.add(status=response.status_code)
+            if response.status_code != 200:
+                retry_after = response.headers.get('Retry-After')
+                raise GeminiError(f"Gemini API 호출 실패: {response.status_code} {response.text[:200]}",
+                                  status=response.status_code,
+                                  retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None)
+            try:
+                # 200이어도 본문이 JSON이 아니거나(ValueError) 객체가 아니면(TypeError/AttributeError) 파싱 오류로 처리
+                result = response.json()
+                usage = result.get('usageMetadata', {})
+                text = result['candidates'][0]['content']['parts'][0]['text']
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+                raise GeminiError(f"Gemini 응답 파싱 오류: {type(e).__name__}: {e}", status=response.status_code)
+            trace.add(prompt_tokens=usage.get('promptTokenCount', 0), output_tokens=usage.get('candidatesTokenCount', 0))
+        return text
@@ -0,0 +1,93 @@
+"""
+세션별 Gemini 코칭 피드백 동시 생성.
+
+- 세션별 프롬프트를 스레드 풀(동시 요청 수 제한)로 나누어 generateContent를 호출한다.
+- 모든 요청(재시도 포함)은 토큰 버킷을 거쳐 초당 요청 수를 넘지 않는다.
+- 429/5xx 및 연결 오류는 지수 backoff + full jitter로 재시도한다 (Retry-After 헤더가 있으면 그 값 이상 대기).
+- 한 세션이 끝내 실패해도 배치 전체는 계속 진행되고, 결과의 'error'에 사유가 남는다.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from absolute_grading.instrumentation import count
+from llm.client import GeminiError
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_RATE = 5.0          # 초당 요청 수 (0이면 제한 없음)
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 1.0       # 첫 재시도 대기 상한(초), 재시도마다 2배
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (여러 스레드에서 공유)"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def call_with_retries(send, prompt, bucket=None, max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF):
+    """
+    send(prompt)를 재시도 정책에 따라 호출.
+    반환: (응답 텍스트, 시도 횟수). 재시도 불가 오류이거나 재시도를 모두 소진하면 마지막 GeminiError를 올린다.
+    """
+    for attempt in range(max_retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return send(prompt), attempt + 1
+        except GeminiError as e:
+            if not e.retryable or attempt == max_retries:
+                e.attempts = attempt + 1
+                count('llm.failure', status=e.status)
+                raise
+            count('llm.retry', status=e.status)
+            # full jitter: [0, backoff * 2^attempt] 구간에서 무작위 대기
+            delay = random.uniform(0, backoff * 2 ** attempt)
+            if e.retry_after is not None:
+                delay = max(delay, e.retry_after)
+            time.sleep(delay)
+
+def generate_feedback_batch(prompts, send, concurrency=DEFAULT_CONCURRENCY, rate=DEFAULT_RATE,
+                            max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF, bucket=None, pool=None):
+    """
+    prompts: [(session_id, prompt), ...], send: prompt → 응답 텍스트 (예: GeminiClient.generate)
+    bucket/pool: 여러 배치가 함께 쓰는 TokenBucket/스레드 풀 (상주 서비스에서 요청마다 새로 만들지 않도록).
+                 주면 rate/concurrency는 무시하고, 없으면 이 배치용으로 만든다.
+    반환: 입력 순서의 [{'session_id', 'feedback', 'error', 'attempts', 'seconds'}, ...]
+    """
+    if bucket is None:
+        bucket = TokenBucket(rate)
+
+    def run(item):
+        session_id, prompt = item
+        t0 = time.perf_counter()
+        try:
+            text, attempts = call_with_retries(send, prompt, bucket, max_retries, backoff)
+            return {'session_id': session_id, 'feedback': text, 'error': None,
+                    'attempts': attempts, 'seconds': time.perf_counter() - t0}
+        except GeminiError as e:
+            return {'session_id': session_id, 'feedback': None, 'error': str(e),
+                    'attempts': e.attempts, 'seconds': time.perf_counter() - t0}
+
+    if pool is not None:
+        return list(pool.map(run, prompts))
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        return list(pool.map(run, prompts))
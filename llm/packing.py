@@ -0,0 +1,47 @@
+"""
+여러 세션을 한 번의 generateContent 요청으로 묶어 피드백 생성 (요청 수/반복되는 지시문 토큰 절감).
+
+- 세션 pack_size개씩 make_packed_prompt로 묶어 generate_feedback_batch로 동시에 요청한다.
+- 응답은 세션 헤더 기준으로 나누고 검증(split_packed_response)하며,
+  묶음 요청이 실패했거나 응답에서 찾지 못한 세션은 세션 단위 프롬프트로 다시 요청한다.
+"""
+from llm.feedback import generate_feedback_batch
+from llm.prompt import make_packed_prompt, split_packed_response
+
+DEFAULT_PACK_SIZE = 10
+
+def generate_feedback_packed(prompts, send, pack_size=DEFAULT_PACK_SIZE, stats=None, **batch_kwargs):
+    """
+    prompts: [(session_id, make_gemini_prompt 결과), ...] → 입력 순서의 결과 list (generate_feedback_batch와 같은 형식 + 'packed')
+    stats(dict)를 주면 요청 수/재요청 세션 수/프롬프트 길이를 누적한다.
+    """
+    packs = [prompts[i:i + pack_size] for i in range(0, len(prompts), pack_size)]
+    packed_prompts = [(f"pack-{k}", make_packed_prompt(pack)) for k, pack in enumerate(packs)]
+    packed_results = generate_feedback_batch(packed_prompts, send, **batch_kwargs)
+
+    results = [None] * len(prompts)
+    fallback = []
+    for k, (pack, result) in enumerate(zip(packs, packed_results)):
+        sections = {} if result['error'] is not None else split_packed_response(result['feedback'], [sid for sid, _ in pack])
+        for j, (session_id, prompt) in enumerate(pack):
+            i = k * pack_size + j
+            if session_id in sections:
+                results[i] = {'session_id': session_id, 'feedback': sections[session_id], 'error': None,
+                              'attempts': result['attempts'], 'seconds': result['seconds'], 'packed': True}
+            else:
+                fallback.append(i)
+
+    # 묶음 응답에서 얻지 못한 세션은 세션 단위로 재요청
+    single_results = generate_feedback_batch([prompts[i] for i in fallback], send, **batch_kwargs)
+    for i, result in zip(fallback, single_results):
+        results[i] = dict(result, packed=False)
+
+    if stats is not None:
+        stats['sessions'] = stats.get('sessions', 0) + len(prompts)
+        stats['packed_requests'] = stats.get('packed_requests', 0) + len(packs)
+        stats['fallback_sessions'] = stats.get('fallback_sessions', 0) + len(fallback)
+        stats['api_calls'] = stats.get('api_calls', 0) + len(packs) + len(fallback)
+        stats['prompt_chars'] = stats.get('prompt_chars', 0) + sum(len(p) for _, p in packed_prompts) \
+            + sum(len(prompts[i][1]) for i in fallback)
+        stats['single_prompt_chars'] = stats.get('single_prompt_chars', 0) + sum(len(p) for _, p in prompts)
+    return results
@@ -0,0 +1,121 @@
+# 평가 결과 → Gemini 코칭 프롬프트
+
+import hashlib
+import re
+
+# evaluate_all 결과 컬럼 접두어 (프롬프트 항목 순서)
+INDICATOR_KEYS = ['Politeness', 'Empathy', 'ProblemSolving', 'EmotionalStability', 'Stability']
+# 세션 ID 자리 표시 (캐시 키/캐시된 피드백에서 세션 ID 대신 사용)
+SESSION_PLACEHOLDER = '<SESSION_ID>'
+
+def session_header(session_id):
+    return f"## 상담사 평가 분석 (세션 ID: {session_id})"
+
+def prompt_key(prompt, session_id, model_name=''):
+    """
+    세션 ID를 뺀 프롬프트 해시 (점수 2자리/등급 구성이 같은 세션은 같은 키).
+    model_name이 다르면 다른 키가 되도록 함께 해시한다.
+    """
+    normalized = prompt.replace(session_header(session_id), session_header(SESSION_PLACEHOLDER))
+    return hashlib.sha256(f"{model_name}\n{normalized}".encode('utf-8')).hexdigest()
+
+def to_template(feedback, session_id):
+    # 응답의 세션 헤더를 자리 표시로 바꾼 재사용 가능한 피드백
+    return feedback.replace(session_header(session_id), session_header(SESSION_PLACEHOLDER))
+
+def from_template(template, session_id):
+    return template.replace(session_header(SESSION_PLACEHOLDER), session_header(session_id))
+
+def evaluation_result_of(result_df, i):
+    """evaluate_all 결과의 i번째 행 → make_gemini_prompt 입력 형식 {지표: {'score', 'grade'}}"""
+    return {
+        key: {
+            "score": result_df[f'{key}_score'].iloc[i],
+            "grade": result_df[f'{key}_Grade'].iloc[i]
+        }
+        for key in INDICATOR_KEYS
+    }
+
+def make_gemini_prompt(evaluation_result, session_id):
+    prompt = (
+        f"아래는 상담사의 5가지 평가 지표별 점수와 등급입니다. "
+        "각 항목을 참고하여 상담사의 강점, 약점, 그리고 구체적인 개선점 및 코칭 멘트를 작성해 주세요.\n\n"
+        f"- 정중함 및 언어 품질 (Politeness): 점수 {evaluation_result['Politeness']['score']:.2f}, 등급 {evaluation_result['Politeness']['grade']}\n"
+        f"- 공감적 소통 (Empathy): 점수 {evaluation_result['Empathy']['score']:.2f}, 등급 {evaluation_result['Empathy']['grade']}\n"
+        f"- 문제 해결 역량 (Problem Solving): 점수 {evaluation_result['ProblemSolving']['score']:.2f}, 등급 {evaluation_result['ProblemSolving']['grade']}\n"
+        f"- 감정 안정성 (Emotional Stability): 점수 {evaluation_result['EmotionalStability']['score']:.2f}, 등급 {evaluation_result['EmotionalStability']['grade']}\n"
+        f"- 대화 흐름 및 응대 태도 (Stability): 점수 {evaluation_result['Stability']['score']:.2f}, 등급 {evaluation_result['Stability']['grade']}\n\n"
+        "[요청]\n"
+        "1. 상담사의 강점 2가지 이상\n"
+        "2. 상담사의 약점 2가지 이상\n"
+        "3. 상담사가 실제로 참고할 수 있는 구체적 개선점/코칭 멘트 2가지 이상\n\n"
+        "[출력 형식]\n"
+        f"{session_header(session_id)}\n"
+        "- 강점:\n"
+        "  - 예시1\n"
+        "  - 예시2\n"
+        "- 약점:\n"
+        "  - 예시1\n"
+        "  - 예시2\n"
+        "- 개선점/코칭 멘트:\n"
+        "  - 예시1\n"
+        "  - 예시2\n"
+    )
+    return prompt
+
+# 여러 세션을 한 번에 요청하는 프롬프트 (세션별 점수 블록을 각자의 세션 헤더 아래에 배치)
+FEEDBACK_SECTIONS = ['- 강점:', '- 약점:', '- 개선점/코칭 멘트:']
+HEADER_RE = re.compile(r'^## 상담사 평가 분석 \(세션 ID: (.*)\)[ \t]*$', re.MULTILINE)
+
+def score_block(prompt):
+    """make_gemini_prompt 프롬프트에서 5개 지표 점수/등급 줄만 추출"""
+    start = prompt.index('\n\n') + 2
+    return prompt[start:prompt.index('\n\n[요청]', start)]
+
+def make_packed_prompt(prompts):
+    """
+    prompts: [(session_id, make_gemini_prompt 결과), ...] → 한 번의 generateContent로 보낼 묶음 프롬프트.
+    세션마다 '## 상담사 평가 분석 (세션 ID: …)' 헤더 아래에 점수 블록을 두고, 같은 헤더로 세션별 분석을 요청한다.
+    """
+    blocks = "\n\n".join(f"{session_header(session_id)}\n{score_block(prompt)}" for session_id, prompt in prompts)
+    return (
+        f"아래는 상담 세션 {len(prompts)}개의 상담사 5가지 평가 지표별 점수와 등급입니다. "
+        "세션마다 각 항목을 참고하여 상담사의 강점, 약점, 그리고 구체적인 개선점 및 코칭 멘트를 작성해 주세요.\n\n"
+        f"{blocks}\n\n"
+        "[요청]\n"
+        "1. 상담사의 강점 2가지 이상\n"
+        "2. 상담사의 약점 2가지 이상\n"
+        "3. 상담사가 실제로 참고할 수 있는 구체적 개선점/코칭 멘트 2가지 이상\n"
+        "4. 위의 모든 세션을 입력 순서대로 빠짐없이, 세션마다 아래 형식으로 작성 (세션 ID는 입력의 세션 ID 그대로)\n\n"
+        "[출력 형식]\n"
+        f"{session_header('세션 ID')}\n"
+        "- 강점:\n"
+        "  - 예시1\n"
+        "  - 예시2\n"
+        "- 약점:\n"
+        "  - 예시1\n"
+        "  - 예시2\n"
+        "- 개선점/코칭 멘트:\n"
+        "  - 예시1\n"
+        "  - 예시2\n"
+    )
+
+def split_packed_response(text, session_ids):
+    """
+    묶음 응답을 세션 헤더 기준으로 나눠 {session_id: 해당 세션 분석} 반환.
+    요청한 세션이 아니거나, 두 번 이상 나오거나, 강점/약점/개선점 항목이 빠진 세션은 제외한다.
+    """
+    expected = {str(session_id): session_id for session_id in session_ids}
+    matches = list(HEADER_RE.finditer(text))
+    sections, seen = {}, set()
+    for i, match in enumerate(matches):
+        sid = match.group(1).strip()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        section = text[match.start():end].strip()
+        if sid in seen:
+            sections.pop(expected.get(sid), None)
+            continue
+        seen.add(sid)
+        if sid in expected and all(label in section for label in FEEDBACK_SECTIONS):
+            sections[expected[sid]] = section + "\n"
+    return sections
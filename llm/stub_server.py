@@ -0,0 +1,114 @@
+"""
+Gemini API 로컬 stub 서버 (API 키/네트워크 없이 배치 피드백 생성을 확인하기 위한 용도).
+
+- GET  /v1/models                      → 모델 목록 (gemini-1.5-pro)
+- POST /v1/models/{model}:generateContent → 프롬프트의 '## 상담사 평가 분석 (세션 ID: …)' 헤더를 포함한 고정 형식 응답
+- --latency: 응답 지연(초), --fail-rate: 429/503을 돌려줄 확률 (재시도 동작 확인용)
+- --drop-rate: 여러 세션을 묶은 요청에서 세션별 분석을 빠뜨릴 확률 (단일 요청 재시도 확인용)
+
+사용법 (루트에서 실행):
+    python llm/stub_server.py [--port 8765] [--latency 0.2] [--fail-rate 0.1]
+    python LLM_evaluation_batch.py --all --base-url http://127.0.0.1:8765
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HEADER_RE = re.compile(r'^## 상담사 평가 분석 \(세션 ID: (.*)\)$', re.MULTILINE)
+
+def stub_feedback(prompt, drop_rate=0.0):
+    # 프롬프트의 세션 헤더(세션 ID)마다 고정 피드백 (여러 세션이면 drop_rate 확률로 일부 세션을 빠뜨림)
+    session_ids = HEADER_RE.findall(prompt) or ['unknown_session']
+    sections = []
+    for session_id in session_ids:
+        if len(session_ids) > 1 and random.random() < drop_rate:
+            continue
+        sections.append(
+            f"## 상담사 평가 분석 (세션 ID: {session_id})\n"
+            "- 강점:\n  - 정중한 언어 사용\n  - 고객 감정 안정화\n"
+            "- 약점:\n  - 공감 표현 부족\n  - 해결책 제시 지연\n"
+            "- 개선점/코칭 멘트:\n  - 고객의 말을 요약해 공감을 표현해 보세요.\n  - 해결 방안을 먼저 제시해 보세요.\n"
+        )
+    return "\n".join(sections)
+
+class StubHandler(BaseHTTPRequestHandler):
+    # keep-alive 연결 재사용이 가능하도록 HTTP/1.1 (응답마다 Content-Length 지정)
+    # 헤더/본문을 따로 쓰므로 Nagle을 끄지 않으면 연결 재사용 시 delayed ACK 대기(~40ms)가 생긴다
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    latency = 0.0
+    fail_rate = 0.0
+    drop_rate = 0.0
+
+    def _send_json(self, status, body, headers=None):
+        raw = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(raw)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        self.server.requests += 1
+        if self.path.split('?')[0] == '/v1/models':
+            self._send_json(200, {'models': [{'name': 'models/gemini-1.5-pro'}]})
+        else:
+            self._send_json(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        self.server.requests += 1
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.split('?')[0].endswith(':generateContent'):
+            self._send_json(404, {'error': {'message': 'not found'}})
+            return
+        time.sleep(self.latency)
+        if random.random() < self.fail_rate:
+            self.server.failures += 1
+            status = random.choice([429, 503])
+            self._send_json(status, {'error': {'code': status, 'message': 'stub failure'}},
+                            headers={'Retry-After': '0'} if status == 429 else None)
+            return
+        prompt = body['contents'][0]['parts'][0]['text']
+        text = stub_feedback(prompt, self.drop_rate)
+        # 실제 API처럼 토큰 수(usageMetadata)도 돌려줌 (4글자당 1토큰으로 근사)
+        usage = {'promptTokenCount': len(prompt) // 4, 'candidatesTokenCount': len(text) // 4,
+                 'totalTokenCount': (len(prompt) + len(text)) // 4}
+        self._send_json(200, {'candidates': [{'content': {'parts': [{'text': text}]}}], 'usageMetadata': usage})
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server(port=0, latency=0.0, fail_rate=0.0, drop_rate=0.0):
+    """백그라운드 스레드에서 stub 서버 시작 → (server, base_url). 종료는 server.shutdown()"""
+    handler = type('Handler', (StubHandler,), {'latency': latency, 'fail_rate': fail_rate, 'drop_rate': drop_rate})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    server.requests = 0
+    server.failures = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description='Gemini API 로컬 stub 서버')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help='응답 지연(초)')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='429/503 응답 확률')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='묶음 요청에서 세션별 분석을 빠뜨릴 확률')
+    args = parser.parse_args()
+    server, base_url = start_stub_server(args.port, args.latency, args.fail_rate, args.drop_rate)
+    print(f"[INFO] Gemini stub 서버 실행 중: {base_url} (Ctrl+C로 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
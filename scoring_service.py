@@ -0,0 +1,332 @@
+"""
+상담 세션 실시간 평가 HTTP 서비스 (asyncio, 단일 프로세스 상주).
+
+상담이 끝날 때마다 세션 feature를 보내면 5개 지표 점수/등급(및 Gemini 코칭 피드백)을 돌려준다.
+CLI처럼 매번 pandas import / cut-off 로드를 반복하지 않도록 상태를 프로세스에 유지한다.
+- cut-off: CutoffRegistry를 계속 보유 (--cutoff-check-interval초마다 CURRENT만 확인, 재산출이 게시되면 다음 묶음부터 적용)
+- Gemini: GeminiClient(keep-alive 연결 풀, 모델명 캐시), 피드백 캐시(SQLite), 토큰 버킷(--rate)과 호출 스레드 풀(--concurrency)을
+  한 번만 생성 (초당/동시 요청 수 제한은 요청별이 아니라 서비스 전체 기준)
+- micro-batching: --batch-window(ms) 동안 들어온 요청(최대 --max-batch행)을 한 DataFrame으로 묶어
+  evaluate_all로 한 번에 채점한 뒤 요청별로 나눠 돌려준다.
+  cut-off json에 저장된 IQR 기준으로 클리핑하므로 어떤 요청과 묶여도 점수/등급은 같다.
+
+API (JSON, HTTP/1.1 keep-alive):
+    POST /score     {"sessions": [{"session_id": ..., "honorific_ratio": ..., ...}, ...]} 또는 세션 객체 하나
+                    → {"results": [{"session_id", "Politeness_score", "Politeness_Grade", ...}], "cutoff_version": {...}}
+    POST /feedback  /score와 같은 입력 → 결과마다 "feedback"(또는 "error") 추가
+    GET  /health    → {"status": "ok", "cutoff_version": {...}, "stats": {...}}
+
+사용법 (루트에서 실행):
+    python scoring_service.py [--port 8080] [--batch-window 5] [--max-batch 1024]
+    python scoring_service.py --base-url http://127.0.0.1:8765   # 로컬 Gemini stub으로 피드백 확인
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from dotenv import load_dotenv
+
+from absolute_grading.engine import evaluate_all, INDICATORS, FEATURE_COLS, RAW_COLS
+from absolute_grading.cutoff_registry import CutoffRegistry
+from llm.prompt import make_gemini_prompt, evaluation_result_of
+from llm.client import GeminiClient, DEFAULT_BASE_URL
+from llm.feedback import TokenBucket, DEFAULT_CONCURRENCY, DEFAULT_RATE, DEFAULT_MAX_RETRIES
+from llm.cache import FeedbackCache, generate_feedback_cached
+
+ID_COL = 'session_id'
+INPUT_COLS = FEATURE_COLS + RAW_COLS
+RESULT_COLS = [col for spec in INDICATORS for col in (f'{spec.prefix}_score', f'{spec.prefix}_Grade')]
+DEFAULT_BATCH_WINDOW = 5.0  # ms
+DEFAULT_MAX_BATCH = 1024
+MAX_BODY = 10 * 2**20
+
+class RequestError(Exception):
+    """클라이언트 입력 오류 (400 응답)"""
+
+def parse_sessions(body):
+    """요청 본문 → (session_id list, (세션 수, feature 수) float 배열). 필수 컬럼이 없거나 숫자가 아니면 RequestError"""
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise RequestError("JSON 본문을 해석할 수 없습니다")
+    sessions = payload.get('sessions', [payload]) if isinstance(payload, dict) else payload
+    if not isinstance(sessions, list) or not sessions or not all(isinstance(s, dict) for s in sessions):
+        raise RequestError("세션 객체 또는 {'sessions': [...]} 형식이어야 합니다")
+    missing = sorted({col for s in sessions for col in INPUT_COLS if col not in s})
+    if missing:
+        raise RequestError(f"필수 컬럼 누락: {missing}")
+    try:
+        features = np.array([[s[col] for col in INPUT_COLS] for s in sessions], dtype=float)
+    except (TypeError, ValueError):
+        raise RequestError("feature 값은 숫자여야 합니다")
+    session_ids = [s.get(ID_COL, 'unknown_session') for s in sessions]
+    return session_ids, features
+
+def result_columns(result_df):
+    # 점수/등급 DataFrame → {컬럼: 값 list} (묶음당 한 번 변환, 점수 NaN은 JSON null)
+    columns = {}
+    for col in RESULT_COLS:
+        if col.endswith('_Grade'):
+            grades = result_df[col].array
+            categories = list(grades.categories)
+            columns[col] = [categories[code] for code in grades.codes.tolist()]
+        else:
+            columns[col] = [None if math.isnan(v) else v for v in result_df[col].tolist()]
+    return columns
+
+def to_records(session_ids, columns):
+    return [{ID_COL: session_id, **{col: values[i] for col, values in columns.items()}}
+            for i, session_id in enumerate(session_ids)]
+
+def to_frame(feature_blocks):
+    return pd.DataFrame(np.concatenate(feature_blocks), columns=INPUT_COLS)
+
+class MicroBatcher:
+    """
+    동시에 들어온 요청을 window초(또는 max_batch행)까지 모아 한 번의 evaluate_all로 채점.
+    채점은 전용 스레드 하나에서 실행해 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, registry, window, max_batch):
+        self.registry = registry
+        self.window = window
+        self.max_batch = max_batch
+        self._pending = []
+        self._rows = 0
+        self._timer = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scoring')
+        self.batches = 0
+        self.batched_requests = 0
+
+    async def score(self, features):
+        """features(요청 하나의 (세션 수, feature 수) 배열) → ({결과 컬럼: 값 list}, cut-off 버전)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((features, future))
+        self._rows += len(features)
+        if self._rows >= self.max_batch or self.window <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._rows = self._pending, [], 0
+        if pending:
+            asyncio.get_running_loop().run_in_executor(self._executor, self._score_batch, pending)
+
+    def _score_batch(self, pending):
+        self.batches += 1
+        self.batched_requests += len(pending)
+        version = None
+        try:
+            # 묶음 전체를 한 snapshot(지표별 cut-off 버전 고정)으로 채점
+            snapshot = self.registry.snapshot()
+            version = snapshot.version
+            outcomes = self._evaluate(pending, snapshot)
+        except Exception as e:
+            outcomes = [(None, e)] * len(pending)
+        for (_, future), (result, error) in zip(pending, outcomes):
+            future.get_loop().call_soon_threadsafe(self._resolve, future, result, error, version)
+
+    @staticmethod
+    def _evaluate(pending, snapshot):
+        try:
+            result = result_columns(evaluate_all(to_frame([f for f, _ in pending]), snapshot))
+        except ValueError:
+            # 잘못된 값(예: suggestions가 0/0.2/0.6/1.0이 아님)이 섞이면 요청별로 다시 채점해 해당 요청만 실패
+            outcomes = []
+            for features, _ in pending:
+                try:
+                    outcomes.append((result_columns(evaluate_all(to_frame([features]), snapshot)), None))
+                except ValueError as e:
+                    outcomes.append((None, RequestError(str(e))))
+            return outcomes
+        outcomes, start = [], 0
+        for features, _ in pending:
+            end = start + len(features)
+            outcomes.append(({col: values[start:end] for col, values in result.items()}, None))
+            start = end
+        return outcomes
+
+    @staticmethod
+    def _resolve(future, result, error, version):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result((result, version))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+class ScoringService:
+    def __init__(self, registry, batcher, client=None, cache=None, feedback_kwargs=None):
+        self.registry = registry
+        self.batcher = batcher
+        self.client = client
+        self.cache = cache
+        # 초당 요청 수/동시 요청 수는 요청별이 아니라 서비스 전체 기준 (토큰 버킷과 Gemini 호출 스레드 풀을 한 번만 생성)
+        kwargs = dict(feedback_kwargs or {})
+        concurrency = kwargs.pop('concurrency', DEFAULT_CONCURRENCY)
+        self.bucket = TokenBucket(kwargs.pop('rate', DEFAULT_RATE))
+        self._gemini_pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='gemini')
+        self.feedback_kwargs = dict(kwargs, bucket=self.bucket, pool=self._gemini_pool)
+        self._feedback_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='feedback')
+        self.requests = 0
+        self.errors = 0
+        self.started = time.time()
+
+    async def score(self, body):
+        session_ids, features = parse_sessions(body)
+        columns, version = await self.batcher.score(features)
+        return {'results': to_records(session_ids, columns), 'cutoff_version': version}, session_ids, columns
+
+    async def feedback(self, body):
+        if self.client is None:
+            return 503, {'error': 'Gemini 클라이언트가 설정되지 않았습니다 (GEMINI_API_KEY 또는 --base-url)'}
+        response, session_ids, columns = await self.score(body)
+        result_df = pd.DataFrame(columns)
+        prompts = [(sid, make_gemini_prompt(evaluation_result_of(result_df, i), sid)) for i, sid in enumerate(session_ids)]
+        loop = asyncio.get_running_loop()
+        results, _ = await loop.run_in_executor(
+            self._feedback_executor,
+            lambda: generate_feedback_cached(prompts, self.client.generate, self.cache, self.client.model_name,
+                                             **self.feedback_kwargs))
+        for record, result in zip(response['results'], results):
+            record['feedback'] = result['feedback']
+            record['cached'] = result['cached']
+            if result['error'] is not None:
+                record['error'] = result['error']
+        return 200, response
+
+    def health(self):
+        return {'status': 'ok', 'cutoff_version': self.registry.snapshot().version,
+                'stats': {'requests': self.requests, 'errors': self.errors,
+                          'batches': self.batcher.batches, 'batched_requests': self.batcher.batched_requests,
+                          'uptime_seconds': round(time.time() - self.started, 1)}}
+
+    async def route(self, method, path, body):
+        path = path.split('?')[0]
+        try:
+            if method == 'GET' and path == '/health':
+                return 200, self.health()
+            if method == 'POST' and path == '/score':
+                response, _, _ = await self.score(body)
+                return 200, response
+            if method == 'POST' and path == '/feedback':
+                return await self.feedback(body)
+            return 404, {'error': 'not found'}
+        except RequestError as e:
+            return 400, {'error': str(e)}
+        except Exception as e:
+            return 500, {'error': f'{type(e).__name__}: {e}'}
+
+    async def handle(self, reader, writer):
+        # HTTP/1.1 keep-alive: 연결 하나에서 요청을 차례로 처리
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0))
+                too_large = length > MAX_BODY
+                if too_large:
+                    # 본문은 읽지 않고 응답한 뒤 연결을 닫음 (남은 본문은 버려짐)
+                    status, response = 413, {'error': '요청 본문이 너무 큽니다'}
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = await self.route(method, path, body)
+                self.requests += 1
+                self.errors += status >= 400
+                raw = json.dumps(response, ensure_ascii=False).encode('utf-8')
+                keep_alive = not too_large and headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(raw)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + raw)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def close(self):
+        self._feedback_executor.shutdown(wait=True)
+        self._gemini_pool.shutdown(wait=True)
+        self.batcher.close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.client is not None:
+            self.client.close()
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.handle, host, port)
+    port = server.sockets[0].getsockname()[1]
+    # 부하 테스트 등에서 포트를 읽을 수 있도록 한 줄로 출력 (--port 0이면 임의 포트)
+    print(f"[INFO] 평가 서비스 실행 중: http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='5개 지표 실시간 평가 + Gemini 피드백 HTTP 서비스')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080, help='0이면 임의 포트')
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW,
+                        help='요청을 모아 한 번에 채점할 최대 대기 시간(ms, 0이면 묶지 않음)')
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help='한 번에 채점할 최대 세션 수')
+    parser.add_argument('--cutoff-check-interval', type=float, default=1.0,
+                        help='cut-off 새 버전 확인 간격(초)')
+    parser.add_argument('--base-url', default=os.getenv('GEMINI_BASE_URL', DEFAULT_BASE_URL),
+                        help='Gemini API 주소 (로컬 stub 서버 테스트용)')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Gemini 동시 요청 수')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE, help='Gemini 초당 최대 요청 수 (0이면 제한 없음)')
+    parser.add_argument('--max-retries', type=int, default=DEFAULT_MAX_RETRIES, help='429/5xx 재시도 횟수')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    registry = CutoffRegistry(check_interval=args.cutoff_check_interval)
+    registry.snapshot()  # 시작 시 cut-off 로드/컴파일
+    batcher = MicroBatcher(registry, args.batch_window / 1000, args.max_batch)
+    client = cache = None
+    if api_key or args.base_url != DEFAULT_BASE_URL:
+        client = GeminiClient(api_key, args.base_url, pool_size=args.concurrency)
+        print(f"[INFO] Gemini 모델: {client.model_name}")
+        cache = FeedbackCache()
+    else:
+        print("[INFO] GEMINI_API_KEY가 없어 /feedback은 비활성화됩니다")
+    service = ScoringService(registry, batcher, client, cache,
+                             dict(concurrency=args.concurrency, rate=args.rate, max_retries=args.max_retries))
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+DUMMY_PATH = os.path.join(ROOT, 'data', 'dummy_data.csv')
+
+@pytest.fixture
+def cutoff_dir(tmp_path):
+    """저장소 cutoff/의 grade_cutoff_*.json만 복사한 임시 cut-off 디렉터리 (versions/ 없음)"""
+    directory = tmp_path / 'cutoff'
+    directory.mkdir()
+    for name in os.listdir(os.path.join(ROOT, 'cutoff')):
+        if name.startswith('grade_cutoff_') and name.endswith('.json'):
+            shutil.copy(os.path.join(ROOT, 'cutoff', name), directory / name)
+    return str(directory)
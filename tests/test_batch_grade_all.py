@@ -0,0 +1,25 @@
+"""일괄 평가 CLI: --json이면 stdout에는 JSON만, 오류 traceback은 stderr"""
+import json
+
+import batch_grade_all
+from absolute_grading import grade_politeness_auto, grade_empathy_auto, grade_emotional_stability_auto
+from absolute_grading import grade_stability_auto
+from conftest import DUMMY_PATH
+
+def test_json_output_is_not_mixed_with_tracebacks(monkeypatch, capsys):
+    # *_auto.run()은 sketch/이력 저장소/cut-off를 갱신하므로 현재 cut-off로 채점만 하는 evaluate_*로 대신함
+    for module, evaluate in [(grade_politeness_auto, grade_politeness_auto.evaluate_politeness),
+                             (grade_emotional_stability_auto, grade_emotional_stability_auto.evaluate_emotional_stability),
+                             (grade_stability_auto, grade_stability_auto.evaluate_stability)]:
+        monkeypatch.setattr(module, 'run', lambda raw_df, exact=False, log=print, evaluate=evaluate: evaluate(raw_df))
+
+    def broken(raw_df, exact=False, log=print):
+        raise RuntimeError('고장')
+
+    monkeypatch.setattr(grade_empathy_auto, 'run', broken)
+    assert batch_grade_all.main(['--data', DUMMY_PATH, '--json', '--workers', '1']) == 1
+    out, err = capsys.readouterr()
+    report = json.loads(out)
+    assert not report['ok']
+    assert [s['indicator'] for s in report['indicators'] if s['status'] != 'ok'] == ['empathy']
+    assert '오류 발생: empathy' in err and 'RuntimeError: 고장' in err
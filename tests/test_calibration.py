@@ -0,0 +1,51 @@
+"""기간/상담 유형별 기준선: 직렬과 프로세스 풀 결과 동일, 파티션 표는 함께 게시한 전체 기준선 버전일 때만 사용"""
+import json
+
+import pandas as pd
+import pytest
+
+from absolute_grading.calibration import (calibrate_partitions, load_partition_tables, partition_path,
+                                          publish_calibration)
+from absolute_grading.cutoff_registry import CutoffRegistry, publish_cutoff
+from absolute_grading.engine import FEATURE_COLS, RAW_COLS
+from absolute_grading.schema import with_float64
+from absolute_grading.session_io import read_sessions
+from conftest import DUMMY_PATH
+
+@pytest.fixture(scope='module')
+def history():
+    df = with_float64(read_sessions(DUMMY_PATH), FEATURE_COLS + RAW_COLS)
+    df['date'] = pd.Timestamp('2026-01-01') + pd.to_timedelta(df.index % 90, unit='D')
+    return df
+
+@pytest.fixture(scope='module')
+def calibrated(history):
+    return calibrate_partitions(history, workers=1)
+
+def test_partitions_cover_month_and_category(calibrated):
+    assert calibrated['dimensions'] == ['month', 'mid_category']
+    assert list(calibrated['partitions']['month']) == ['2026-01', '2026-02', '2026-03']
+    assert set(calibrated['global']) == {'politeness', 'empathy', 'problem_solving', 'emotional_stability', 'stability'}
+
+def test_pool_matches_serial(history, calibrated):
+    assert json.dumps(calibrate_partitions(history, workers=2)) == json.dumps(calibrated)
+
+def test_partition_tables_follow_published_versions(cutoff_dir, calibrated):
+    versions = publish_calibration(calibrated, cutoff_dir)
+    snapshot = CutoffRegistry(cutoff_dir=cutoff_dir).snapshot()
+    assert snapshot.version == versions
+    assert snapshot.cutoff_json('empathy') == calibrated['global']['empathy']
+    tables = load_partition_tables(partition_path(cutoff_dir), snapshot)
+    assert tables['versions'] == versions
+
+    # 이후 전체 기준선이 다시 게시되면 (재산출 등) 파티션 표는 쓰지 않음
+    empathy = calibrated['global']['empathy']
+    publish_cutoff('empathy', dict(empathy, cutoff={k: v + 0.01 for k, v in empathy['cutoff'].items()}), cutoff_dir)
+    snapshot = CutoffRegistry(cutoff_dir=cutoff_dir).snapshot()
+    assert load_partition_tables(partition_path(cutoff_dir), snapshot) is None
+    assert load_partition_tables(partition_path(cutoff_dir)) is not None
+
+def test_partition_file_without_versions_is_ignored(cutoff_dir, calibrated):
+    with open(partition_path(cutoff_dir), 'w') as f:
+        json.dump({'partitions': calibrated['partitions']}, f)
+    assert load_partition_tables(partition_path(cutoff_dir), CutoffRegistry(cutoff_dir=cutoff_dir).snapshot()) is None
@@ -0,0 +1,43 @@
+"""IQR 클리핑: 저장된 기준 사분위(cut-off json 'iqr')로 클리핑해 배치 구성과 무관하게 같은 점수"""
+import pandas as pd
+import pytest
+
+from absolute_grading import grade_politeness_auto as politeness
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import grade_emotional_stability_auto as emotional_stability
+from absolute_grading import grade_stability_auto as stability
+from absolute_grading.cutoff_registry import CutoffRegistry
+from absolute_grading.engine import evaluate_all
+from conftest import DUMMY_PATH
+
+CASES = [
+    ('politeness', politeness.evaluate_politeness, politeness.cols),
+    ('empathy', empathy.evaluate_empathy, empathy.cols),
+    ('emotional_stability', emotional_stability.evaluate_emotional_stability, emotional_stability.cols),
+    ('stability', stability.evaluate_stability, stability.cols),
+]
+
+@pytest.fixture
+def snapshot(cutoff_dir):
+    return CutoffRegistry(cutoff_dir=cutoff_dir).snapshot()
+
+@pytest.mark.parametrize('name,evaluate,cols', CASES, ids=[c[0] for c in CASES])
+def test_score_does_not_depend_on_batch(snapshot, name, evaluate, cols):
+    df = pd.read_csv(DUMMY_PATH)
+    whole = evaluate(df, snapshot)
+    alone = pd.concat([evaluate(df.iloc[[i]], snapshot) for i in range(0, len(df), 97)])
+    pd.testing.assert_frame_equal(alone, whole.iloc[::97])
+
+@pytest.mark.parametrize('name,evaluate,cols', CASES, ids=[c[0] for c in CASES])
+def test_outlier_is_clipped_to_stored_upper_bound(snapshot, name, evaluate, cols):
+    bounds = snapshot.iqr(name)
+    at_bound = pd.DataFrame([{col: bounds[col]['upper'] for col in cols}])
+    beyond = pd.DataFrame([{col: bounds[col]['upper'] * 10 + 100 for col in cols}])
+    pd.testing.assert_frame_equal(evaluate(beyond, snapshot), evaluate(at_bound, snapshot))
+
+def test_engine_matches_per_indicator(snapshot):
+    df = pd.read_csv(DUMMY_PATH).head(50)
+    result = evaluate_all(df, snapshot)
+    for name, evaluate, _ in CASES:
+        expected = evaluate(df, snapshot)
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
@@ -0,0 +1,101 @@
+"""cut-off 버전 게시/읽기: 읽기 전용 조회, 첫 게시 때 기존 파일 가져오기, 파일 권한, snapshot 고정, 직접 고친 기존 파일 반영, 없는 버전 오류"""
+import json
+import os
+import stat
+
+import pytest
+
+from absolute_grading.cutoff_registry import (CutoffRegistry, LEGACY_VERSION, cutoff_path, current_version,
+                                              load_version, publish_cutoff, version_dir, version_path)
+
+def tree(directory):
+    return sorted(os.path.relpath(os.path.join(root, f), directory)
+                  for root, _, files in os.walk(directory) for f in files)
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def test_snapshot_does_not_write_without_versions(cutoff_dir):
+    before = tree(cutoff_dir)
+    snapshot = CutoffRegistry(cutoff_dir=cutoff_dir).snapshot()
+    assert tree(cutoff_dir) == before
+    assert snapshot.version['politeness'] == LEGACY_VERSION
+    assert snapshot.cutoff_json('politeness') == read_json(cutoff_path('politeness', cutoff_dir))
+
+def test_snapshot_works_on_read_only_dir(cutoff_dir):
+    os.chmod(cutoff_dir, 0o555)
+    try:
+        if os.access(cutoff_dir, os.W_OK):
+            pytest.skip('root는 권한과 무관하게 쓸 수 있음')
+        assert CutoffRegistry(cutoff_dir=cutoff_dir).snapshot().version['empathy'] == LEGACY_VERSION
+    finally:
+        os.chmod(cutoff_dir, 0o755)
+
+def test_first_publish_migrates_legacy_file(cutoff_dir):
+    legacy = read_json(cutoff_path('empathy', cutoff_dir))
+    new = dict(legacy, cutoff=dict(legacy['cutoff'], A=0.99))
+    assert publish_cutoff('empathy', new, cutoff_dir) == 2
+    assert read_json(version_path('empathy', 1, cutoff_dir)) == legacy
+    assert json.loads(load_version('empathy', LEGACY_VERSION, cutoff_dir)) == legacy
+    assert current_version('empathy', cutoff_dir) == 2
+    assert read_json(cutoff_path('empathy', cutoff_dir)) == new
+
+def test_published_files_are_world_readable(cutoff_dir):
+    publish_cutoff('politeness', read_json(cutoff_path('politeness', cutoff_dir)), cutoff_dir)
+    for path in [version_path('politeness', 1, cutoff_dir), version_path('politeness', 2, cutoff_dir),
+                 os.path.join(version_dir('politeness', cutoff_dir), 'CURRENT'), cutoff_path('politeness', cutoff_dir)]:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o644, path
+
+def test_snapshot_is_fixed_until_next_call(cutoff_dir):
+    registry = CutoffRegistry(cutoff_dir=cutoff_dir)
+    before = registry.snapshot()
+    data = read_json(cutoff_path('stability', cutoff_dir))
+    version = publish_cutoff('stability', dict(data, cutoff=dict(data['cutoff'], A=0.5)), cutoff_dir)
+    assert before.cutoffs('stability')['A'] == data['cutoff']['A']
+    after = registry.snapshot()
+    assert after.version['stability'] == version
+    assert after.cutoffs('stability')['A'] == 0.5
+    assert registry.snapshot_at({'stability': 1}).cutoffs('stability')['A'] == data['cutoff']['A']
+
+def test_snapshot_skips_current_reads_within_interval(cutoff_dir, monkeypatch):
+    from absolute_grading import cutoff_registry
+    registry = CutoffRegistry(cutoff_dir=cutoff_dir, check_interval=60)
+    registry.snapshot()
+    calls = []
+    original = cutoff_registry.current_version
+    monkeypatch.setattr(cutoff_registry, 'current_version', lambda *a: calls.append(a) or original(*a))
+    for _ in range(10):
+        registry.snapshot()
+    assert calls == []
+
+def test_same_process_publish_is_visible_within_interval(cutoff_dir):
+    registry = CutoffRegistry(cutoff_dir=cutoff_dir, check_interval=60)
+    registry.snapshot()
+    data = read_json(cutoff_path('empathy', cutoff_dir))
+    version = publish_cutoff('empathy', dict(data, cutoff=dict(data['cutoff'], A=0.7)), cutoff_dir)
+    assert registry.snapshot().version['empathy'] == version
+
+def test_legacy_file_edit_is_reloaded(cutoff_dir):
+    registry = CutoffRegistry(cutoff_dir=cutoff_dir, check_interval=0)
+    registry.snapshot()
+    data = read_json(cutoff_path('politeness', cutoff_dir))
+    with open(cutoff_path('politeness', cutoff_dir), 'w') as f:
+        json.dump(dict(data, cutoff=dict(data['cutoff'], A=0.42)), f)
+    after = registry.snapshot()
+    assert after.version['politeness'] == LEGACY_VERSION
+    assert after.cutoffs('politeness')['A'] == 0.42
+
+def test_unchanged_legacy_file_is_not_recompiled(cutoff_dir):
+    registry = CutoffRegistry(cutoff_dir=cutoff_dir, check_interval=0)
+    first = registry.snapshot()
+    reloads = registry.reloads
+    assert registry.snapshot() is first
+    assert registry.reloads == reloads
+
+def test_missing_current_version_raises(cutoff_dir):
+    data = read_json(cutoff_path('empathy', cutoff_dir))
+    version = publish_cutoff('empathy', data, cutoff_dir)
+    os.remove(version_path('empathy', version, cutoff_dir))
+    with pytest.raises(FileNotFoundError, match='CURRENT'):
+        CutoffRegistry(cutoff_dir=cutoff_dir).snapshot()
@@ -0,0 +1,53 @@
+"""Gemini 클라이언트: 200이어도 해석할 수 없는 응답 본문/모델 목록은 GeminiError, 모델명 캐시는 임시 파일 → 교체"""
+import os
+
+import pytest
+import requests
+
+from llm.client import GeminiClient, GeminiError, select_model
+
+def fake_response(body, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    return response
+
+@pytest.fixture
+def client():
+    client = GeminiClient('test-key', 'http://127.0.0.1:1', model_name='gemini-pro')
+    yield client
+    client.close()
+
+def reply_with(client, monkeypatch, body):
+    monkeypatch.setattr(client.session, 'request', lambda *args, **kwargs: fake_response(body))
+
+@pytest.mark.parametrize('body', [b'<html>bad gateway</html>', b'[1, 2]', b'{"candidates": []}', b'{}'])
+def test_unparseable_body_raises_gemini_error(client, monkeypatch, body):
+    reply_with(client, monkeypatch, body)
+    with pytest.raises(GeminiError) as info:
+        client.generate('프롬프트')
+    assert info.value.status == 200
+
+def test_text_is_returned(client, monkeypatch):
+    reply_with(client, monkeypatch, b'{"candidates": [{"content": {"parts": [{"text": "ok"}]}}]}')
+    assert client.generate('프롬프트') == 'ok'
+
+def test_unparseable_model_list_raises_gemini_error(client, monkeypatch):
+    reply_with(client, monkeypatch, b'not json')
+    with pytest.raises(GeminiError):
+        client.list_models()
+
+@pytest.mark.parametrize('models', [[{'displayName': 'Gemini Pro'}], [{'name': 'models/gemini-pro'}, 'gemini-pro']])
+def test_model_without_name_raises_gemini_error(models):
+    with pytest.raises(GeminiError):
+        select_model(models)
+
+def test_model_is_resolved_and_cached(tmp_path, monkeypatch):
+    cache_path = str(tmp_path / 'gemini_model.json')
+    with GeminiClient('test-key', 'http://127.0.0.1:1', model_cache_path=cache_path) as client:
+        reply_with(client, monkeypatch, b'{"models": [{"name": "models/gemini-1.5-flash"}, {"name": "models/gemini-pro"}]}')
+        assert client.model_name == 'gemini-pro'
+    assert os.listdir(tmp_path) == ['gemini_model.json']
+    with GeminiClient('test-key', 'http://127.0.0.1:1', model_cache_path=cache_path) as client:
+        monkeypatch.setattr(client, 'list_models', lambda: pytest.fail('캐시된 모델명을 써야 함'))
+        assert client.model_name == 'gemini-pro'
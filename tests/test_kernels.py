@@ -0,0 +1,56 @@
+"""벡터화 커널(compute_*_scores)과 행 단위 함수(compute_*_score)의 점수 bit 단위 일치"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from absolute_grading import grade_politeness_auto as politeness
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import grade_emotional_stability_auto as emotional_stability
+from absolute_grading import grade_stability_auto as stability
+from conftest import DUMMY_PATH
+
+# (모듈, feature 컬럼(커널 인자 순서), 행 단위 함수, 벡터화 커널)
+CASES = {
+    'politeness': (politeness, politeness.SCORE_ORDER, politeness.compute_politeness_score, politeness.compute_politeness_scores),
+    'empathy': (empathy, empathy.cols, empathy.compute_empathy_score, empathy.compute_empathy_scores),
+    'emotional_stability': (emotional_stability, emotional_stability.cols,
+                            emotional_stability.compute_emotional_stability_score,
+                            emotional_stability.compute_emotional_stability_scores),
+    'stability': (stability, stability.cols, stability.compute_stability_score, stability.compute_stability_scores),
+}
+
+def normalized_frame(module, df, cols):
+    # evaluate_*와 같은 전처리: IQR 클리핑 → 저장된 minmax로 정규화
+    with open(module.CUTOFF_PATH) as f:
+        minmax = json.load(f)['minmax']
+    df = module.clip_outliers_iqr(df.copy(), cols)
+    for col in cols:
+        df[f'{col}_norm'] = module.minmax_normalize(df[col], minmax[col]['min'], minmax[col]['max'])
+    return df
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_kernel_matches_row_function(name):
+    module, cols, row_fn, kernel = CASES[name]
+    df = pd.read_csv(DUMMY_PATH)
+    df.columns = df.columns.str.strip()
+    norm_df = normalized_frame(module, df, cols)
+    expected = norm_df.apply(row_fn, axis=1).to_numpy(dtype=float)
+    actual = kernel(*(norm_df[f'{col}_norm'].to_numpy(dtype=float) for col in cols))
+    assert np.array_equal(expected, actual, equal_nan=True)
+
+def test_emotional_stability_edges():
+    # change == 0 분기(early < 0.4 / >= 0.7 / 그 사이), 0~1 클램프, NaN
+    early = np.array([0.1, 0.5, 0.8, 0.2, 0.9, np.nan, 1.5])
+    late = np.array([0.1, 0.5, 0.8, 0.9, 0.3, 0.5, 1.6])
+    norm_df = pd.DataFrame({'customer_sentiment_early_norm': early, 'customer_sentiment_late_norm': late})
+    expected = norm_df.apply(emotional_stability.compute_emotional_stability_score, axis=1).to_numpy(dtype=float)
+    actual = emotional_stability.compute_emotional_stability_scores(early, late)
+    assert np.array_equal(expected, actual, equal_nan=True)
+
+@pytest.mark.parametrize('name', list(CASES))
+def test_constant_column_normalizes_to_half(name):
+    # max == min이면 minmax_normalize는 0.5 (커널 입력도 같은 값)
+    module = CASES[name][0]
+    assert module.minmax_normalize(3.0, 3.0, 3.0) == 0.5
@@ -0,0 +1,75 @@
+"""증분 평가: 저장된 결과를 쓰는 재실행과 전체 평가의 결과(컬럼 순서, 값)가 같음, 버전 비교는 snapshot의 디렉터리 기준"""
+import json
+
+import pandas as pd
+import pytest
+
+import batch_grade_all
+from absolute_grading import grade_politeness_auto, grade_empathy_auto, grade_emotional_stability_auto
+from absolute_grading import grade_stability_auto, grade_problem_solving
+from absolute_grading.cutoff_registry import CutoffRegistry, LEGACY_VERSION, load_version, publish_cutoff
+from absolute_grading.engine import INDICATORS, evaluate_all
+from absolute_grading.result_store import assemble_results, empty_results, feature_hashes, lookup, update_results
+from absolute_grading.session_io import read_sessions
+from conftest import DUMMY_PATH
+
+EVALUATE = {
+    grade_politeness_auto: grade_politeness_auto.evaluate_politeness,
+    grade_empathy_auto: grade_empathy_auto.evaluate_empathy,
+    grade_emotional_stability_auto: grade_emotional_stability_auto.evaluate_emotional_stability,
+    grade_stability_auto: grade_stability_auto.evaluate_stability,
+    grade_problem_solving: grade_problem_solving.evaluate_problem_solving,
+}
+
+@pytest.fixture
+def raw_df(monkeypatch):
+    # run()은 sketch/이력 저장소/cut-off를 갱신하므로 현재 cut-off로 채점만 하는 evaluate_*로 대신함
+    for module, evaluate in EVALUATE.items():
+        monkeypatch.setattr(module, 'run', lambda raw_df, exact=False, log=print, evaluate=evaluate: evaluate(raw_df))
+    return read_sessions(DUMMY_PATH, batch_grade_all.INPUT_COLS).head(100)
+
+def full_results(raw_df):
+    statuses, results = batch_grade_all.run_all(raw_df, workers=1)
+    assert all(status['status'] == 'ok' for status in statuses)
+    return batch_grade_all.combine_results(raw_df, results)
+
+def test_incremental_matches_full_run(raw_df, tmp_path):
+    store = str(tmp_path / 'results.npz')
+    expected = full_results(raw_df)
+    assert list(expected.columns) == batch_grade_all.RESULT_COLS
+
+    _, _, first, stats = batch_grade_all.run_incremental(raw_df, workers=1, store_path=store)
+    assert stats['new'] == len(raw_df)
+    _, _, again, stats = batch_grade_all.run_incremental(raw_df, workers=1, store_path=store)
+    assert stats['reused'] == len(raw_df)
+    for combined in (first, again):
+        assert list(combined.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(combined, expected, check_categorical=False)
+
+def test_changed_session_is_rescored(raw_df, tmp_path):
+    store = str(tmp_path / 'results.npz')
+    batch_grade_all.run_incremental(raw_df, workers=1, store_path=store)
+    changed = raw_df.copy()
+    changed.loc[3, 'honorific_ratio'] = 0.0
+    _, _, combined, stats = batch_grade_all.run_incremental(changed, workers=1, store_path=store)
+    assert (stats['new'], stats['changed']) == (0, 1)
+    pd.testing.assert_frame_equal(combined, full_results(changed), check_categorical=False)
+
+def test_reuse_compares_versions_in_snapshot_dir(cutoff_dir):
+    raw_df = read_sessions(DUMMY_PATH, batch_grade_all.INPUT_COLS).head(50)
+    registry = CutoffRegistry(cutoff_dir=cutoff_dir, check_interval=0)
+    data = json.loads(load_version('politeness', LEGACY_VERSION, cutoff_dir))
+    publish_cutoff('politeness', data, cutoff_dir)
+    first = registry.snapshot()
+    hashes = feature_hashes(raw_df)
+    pos, dirty = lookup(raw_df, hashes, empty_results())
+    results = {spec.name: evaluate_all(raw_df, first) for spec in INDICATORS}
+    combined, _ = assemble_results(raw_df, pos, dirty, empty_results(), results, first)
+    stored = update_results(empty_results(), pos, combined, hashes, first)
+
+    # cut-off만 바뀐 버전 (minmax/iqr 동일) → 기본 cutoff/가 아닌 이 디렉터리의 버전끼리 비교해 점수 재사용
+    publish_cutoff('politeness', dict(data, cutoff=dict(data['cutoff'], A=0.99)), cutoff_dir)
+    second = registry.snapshot()
+    pos, dirty = lookup(raw_df, hashes, stored)
+    _, rescored = assemble_results(raw_df, pos, dirty, stored, {}, second)
+    assert rescored == {spec.name: 0 for spec in INDICATORS}
@@ -0,0 +1,55 @@
+"""그룹별 집계: 전체 집계는 누적 합계 (같은 배치를 다시 쓰면 이전 부분 집계를 빼고 더함, 다른 배치는 읽지 않음)"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from absolute_grading import rollup as rollup_module
+from absolute_grading.rollup import aggregate, batch_path, load_rollup, merge_records, rebuild_rollup, update_rollup
+
+def results(n, seed):
+    rng = np.random.default_rng(seed)
+    scores = rng.random(n)
+    scores[::7] = np.nan
+    return pd.DataFrame({
+        'session_id': [f'{seed}-{i}' for i in range(n)],
+        'agent_id': rng.choice(['a1', 'a2', 'a3'], n),
+        'mid_category': rng.choice(['요금', '해지'], n),
+        'Politeness_score': scores,
+        'Politeness_Grade': pd.Categorical(rng.choice(list('ABC'), n), categories=list('ABCDEFG')),
+    })
+
+def totals(rollup):
+    return {(r['dimension'], r['day'], r['key'], r['indicator']): (r['count'], r['score_count'], r['grades'],
+                                                                  pytest.approx(r['score_sum']))
+            for r in rollup['groups']}
+
+def test_rewritten_batch_replaces_its_partial(tmp_path):
+    update_rollup(results(50, 1), 'b1', rollup_dir=tmp_path)
+    update_rollup(results(40, 2), 'b2', rollup_dir=tmp_path)
+    _, rollup = update_rollup(results(30, 3), 'b1', rollup_dir=tmp_path)
+    expected = merge_records([aggregate(results(30, 3)), aggregate(results(40, 2))])
+    assert rollup['sessions'] == 70
+    assert set(rollup['batches']) == {'b1', 'b2'}
+    assert totals(rollup) == totals({'groups': expected})
+    assert totals(load_rollup(tmp_path)) == totals(rebuild_rollup(tmp_path))
+
+def test_update_reads_only_the_rewritten_batch(tmp_path, monkeypatch):
+    for seed in range(5):
+        update_rollup(results(20, seed), f'b{seed}', rollup_dir=tmp_path)
+    read = []
+    original = rollup_module._read_partial
+    monkeypatch.setattr(rollup_module, '_read_partial', lambda path: read.append(path) or original(path))
+    update_rollup(results(20, 9), 'b2', rollup_dir=tmp_path)
+    assert read == [batch_path('b2', tmp_path)]
+
+def test_interrupted_update_is_repaired(tmp_path):
+    update_rollup(results(50, 1), 'b1', rollup_dir=tmp_path)
+    # 부분 집계만 쓰고 전체 집계 갱신 전에 중단된 상태
+    partial = {'batch_id': 'b1', 'created': '', 'sessions': 20, 'groups': aggregate(results(20, 4))}
+    with open(batch_path('b1', tmp_path), 'w', encoding='utf-8') as f:
+        json.dump(partial, f)
+    _, rollup = update_rollup(results(10, 5), 'b1', rollup_dir=tmp_path)
+    assert rollup['sessions'] == 10
+    assert totals(rollup) == totals({'groups': aggregate(results(10, 5))})
@@ -0,0 +1,37 @@
+"""compact schema로 읽은 세션 값이 원본과 같은지 (넘침/결측/float32 복원)"""
+import numpy as np
+import pandas as pd
+
+from absolute_grading.schema import SESSION_DTYPES, as_float64, with_float64
+from absolute_grading.session_io import read_sessions
+from conftest import DUMMY_PATH
+
+def write_sessions(tmp_path, rows):
+    base = pd.read_csv(DUMMY_PATH, nrows=len(rows))
+    for i, values in enumerate(rows):
+        for col, value in values.items():
+            base.loc[i, col] = value
+    path = tmp_path / 'sessions.csv'
+    base.to_csv(path, index=False)
+    return str(path)
+
+def test_large_counts_do_not_wrap(tmp_path):
+    path = write_sessions(tmp_path, [{'interruption_count': 300}, {'Profane': 1000}])
+    df = read_sessions(path)
+    assert as_float64(df['interruption_count'])[0] == 300
+    assert as_float64(df['Profane'])[1] == 1000
+
+def test_missing_counts_are_read_as_nan(tmp_path):
+    path = write_sessions(tmp_path, [{'interruption_count': np.nan, 'Profane': np.nan}, {}])
+    df = read_sessions(path)
+    assert np.isnan(as_float64(df['interruption_count'])[0])
+    assert np.isnan(as_float64(df['Profane'])[0])
+
+def test_float32_columns_restore_decimal_values():
+    raw = pd.read_csv(DUMMY_PATH)
+    raw.columns = raw.columns.str.strip()
+    df = read_sessions(DUMMY_PATH)
+    numeric = [col for col, dtype in SESSION_DTYPES.items() if dtype == 'float32']
+    restored = with_float64(df, numeric)
+    for col in numeric:
+        assert np.array_equal(restored[col].to_numpy(), raw[col].to_numpy(dtype=float), equal_nan=True), col
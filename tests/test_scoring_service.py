@@ -0,0 +1,105 @@
+"""평가 서비스: 큰 본문은 읽지 않고 413 후 연결 종료, 묶어 채점해도 요청별 결과 동일, 잘못된 요청만 400,
+Gemini 토큰 버킷/스레드 풀은 서비스 전체에서 하나"""
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+import llm.feedback
+from absolute_grading.cutoff_registry import CutoffRegistry
+from conftest import DUMMY_PATH
+from llm.cache import FeedbackCache
+from scoring_service import INPUT_COLS, MAX_BODY, MicroBatcher, ScoringService
+
+class FakeClient:
+    model_name = 'fake-model'
+
+    def generate(self, prompt):
+        return f'피드백 {len(prompt)}'
+
+    def close(self):
+        pass
+
+@pytest.fixture
+def make_service(cutoff_dir):
+    services = []
+
+    def make(client=None, cache=None, feedback_kwargs=None, window=0):
+        registry = CutoffRegistry(cutoff_dir=cutoff_dir)
+        service = ScoringService(registry, MicroBatcher(registry, window, 1024), client, cache, feedback_kwargs)
+        services.append(service)
+        return service
+
+    yield make
+    for service in services:
+        service.close()
+
+def session_body(rows, **overrides):
+    df = pd.read_csv(DUMMY_PATH).iloc[rows].assign(**overrides)
+    return json.dumps({'sessions': df[['session_id'] + INPUT_COLS].to_dict('records')}).encode()
+
+def score_all(service, bodies):
+    # 같은 window 안에 모든 요청을 보냄
+    async def scenario():
+        return await asyncio.gather(*[service.route('POST', '/score', body) for body in bodies])
+    return asyncio.run(scenario())
+
+def test_oversized_body_is_rejected_without_reading(make_service):
+    service = make_service()
+
+    async def scenario():
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            # 헤더만 보내고 본문은 보내지 않음 → 서버가 본문을 기다리면 시간 초과
+            writer.write(f'POST /score HTTP/1.1\r\nContent-Length: {MAX_BODY + 1}\r\n\r\n'.encode())
+            await writer.drain()
+            response = await asyncio.wait_for(reader.read(), timeout=5)
+            writer.close()
+            return response
+
+    head = asyncio.run(scenario()).split(b'\r\n\r\n')[0].decode()
+    assert head.startswith('HTTP/1.1 413')
+    assert 'Connection: close' in head
+
+def test_batched_requests_match_scoring_alone(make_service):
+    bodies = [session_body(rows) for rows in ([0, 1, 2], [3], [4, 5])]
+    alone = make_service()
+    expected = [score_all(alone, [body])[0] for body in bodies]
+    batched = make_service(window=0.2)
+    responses = score_all(batched, bodies)
+    assert batched.batcher.batches == 1
+    assert batched.batcher.batched_requests == len(bodies)
+    assert responses == expected
+    assert len({json.dumps(response['cutoff_version']) for _, response in responses}) == 1
+
+def test_bad_request_fails_alone_in_batch(make_service):
+    service = make_service(window=0.2)
+    bodies = [session_body([0, 1]), session_body([2], suggestions=0.5), session_body([3])]
+    (ok1, first), (bad, error), (ok2, last) = score_all(service, bodies)
+    assert service.batcher.batches == 1
+    assert (ok1, bad, ok2) == (200, 400, 200)
+    assert 'error' in error
+    assert [r['session_id'] for r in first['results'] + last['results']] == \
+        pd.read_csv(DUMMY_PATH)['session_id'].iloc[[0, 1, 3]].tolist()
+
+def test_feedback_shares_one_bucket_and_pool(make_service, monkeypatch):
+    service = make_service(FakeClient(), FeedbackCache(':memory:'), dict(concurrency=2, rate=0, max_retries=0))
+    acquired = []
+    monkeypatch.setattr(service.bucket, 'acquire', lambda: acquired.append(1))
+
+    def no_new(*args, **kwargs):
+        raise AssertionError('요청마다 새로 만들지 않아야 함')
+
+    monkeypatch.setattr(llm.feedback, 'TokenBucket', no_new)
+    monkeypatch.setattr(llm.feedback, 'ThreadPoolExecutor', no_new)
+
+    async def scenario():
+        return [await service.route('POST', '/feedback', session_body(rows)) for rows in ([0, 1], [2])]
+
+    for status, response in asyncio.run(scenario()):
+        assert status == 200
+        assert all(record['feedback'] and 'error' not in record for record in response['results'])
+    assert len(acquired) == 3
@@ -0,0 +1,91 @@
+"""이력 sketch 누적: 같은 배치를 다시 평가해도 중복 누적/재저장하지 않음, 동시 평가/중단 시 유실 없음, 원자적 저장"""
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from absolute_grading import grade_empathy_auto as empathy
+from absolute_grading import sketch as sketch_module
+from absolute_grading.feature_store import ID_COL, append_batch, load_feature_store
+from absolute_grading.session_io import read_sessions
+from absolute_grading.sketch import RowSketch, fold_batch, load_sketch, save_sketch
+from conftest import DUMMY_PATH
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    """empathy run()의 sketch/이력 저장소 경로를 임시 디렉터리로 (cut-off는 저장소 값을 읽기만 함)"""
+    monkeypatch.setattr(sketch_module, 'sketch_path', lambda name, cutoff_dir=None: str(tmp_path / f'sketch_{name}.json'))
+    monkeypatch.setattr(empathy, 'sketch_path', sketch_module.sketch_path)
+    monkeypatch.setattr(empathy, 'load_feature_store',
+                        lambda name, cols, bootstrap: load_feature_store(name, cols, bootstrap, base_dir=str(tmp_path / 'history')))
+    return tmp_path
+
+def new_batch(n=40, prefix='new'):
+    # 기준선 범위 안의 행에 저장소에 없는 session_id를 붙인 배치 (재산출 없이 기존 cut-off로 평가)
+    df = read_sessions(DUMMY_PATH, [ID_COL] + empathy.cols).head(n).copy()
+    df[ID_COL] = [f'{prefix}-{i}' for i in range(n)]
+    return df
+
+def baseline_rows():
+    return len(read_sessions(DUMMY_PATH, empathy.cols))
+
+def test_rerun_same_batch_folds_once(isolated):
+    batch = new_batch()
+    empathy.run(batch, log=lambda *_: None)
+    path = sketch_module.sketch_path('empathy')
+    n_after_first = load_sketch(path).n
+    assert n_after_first == baseline_rows() + len(batch)
+    mtime = os.stat(path).st_mtime_ns
+    empathy.run(batch, log=lambda *_: None)
+    assert load_sketch(path).n == n_after_first
+    assert os.stat(path).st_mtime_ns == mtime
+
+def test_concurrent_runs_keep_each_others_rows(isolated):
+    batches = [new_batch(prefix=f'thread{k}') for k in range(4)]
+    threads = [threading.Thread(target=empathy.run, args=(batch,), kwargs={'log': lambda *_: None}) for batch in batches]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert load_sketch(sketch_module.sketch_path('empathy')).n == baseline_rows() + sum(map(len, batches))
+
+def test_interrupted_sketch_save_does_not_lose_rows(isolated, monkeypatch):
+    batch = new_batch()
+    empathy.run(new_batch(prefix='warmup'), log=lambda *_: None)
+
+    def crash(*args):
+        raise OSError('중단')
+
+    monkeypatch.setattr(empathy, 'save_sketch', crash)
+    with pytest.raises(OSError):
+        empathy.run(batch, log=lambda *_: None)
+    # sketch 저장 전에 중단되면 저장소에도 확정되지 않으므로 다시 평가할 때 누적됨
+    monkeypatch.setattr(empathy, 'save_sketch', save_sketch)
+    empathy.run(batch, log=lambda *_: None)
+    assert load_sketch(sketch_module.sketch_path('empathy')).n == baseline_rows() + 2 * len(batch)
+
+def test_fold_only_rows_added_to_store(isolated):
+    batch = new_batch()
+    store = load_feature_store('empathy', empathy.cols, DUMMY_PATH, base_dir=str(isolated / 'history'))
+    baseline = RowSketch(empathy.cols)
+    rows = batch[empathy.cols].to_numpy(dtype=float)
+    keys = np.zeros(len(rows))
+    # 절반은 먼저 저장 → 나머지 절반만 새로 누적
+    append_batch(store, batch.head(20))
+    assert fold_batch(baseline, rows, keys, append_batch(store, batch))
+    assert baseline.n == 20
+    assert not fold_batch(baseline, rows, keys, append_batch(store, batch))
+    assert baseline.n == 20
+
+def test_batch_without_session_id_is_not_saved():
+    sketch = RowSketch(['a'])
+    assert not fold_batch(sketch, np.ones((3, 1)), np.ones(3), None)
+    assert sketch.n == 3
+
+def test_save_sketch_is_atomic(tmp_path):
+    path = str(tmp_path / 'sketch.json')
+    sketch = RowSketch(['a']).update(np.arange(5.0).reshape(-1, 1), np.arange(5.0))
+    save_sketch(sketch, path)
+    assert os.listdir(tmp_path) == ['sketch.json']
+    assert load_sketch(path).to_dict() == sketch.to_dict()